@@ -0,0 +1,158 @@
+# bench_render.py
+"""
+Headless rendering benchmark for visualize_map.py.
+
+Runs the campus and RLH floor scenes for a fixed number of frames on SDL's
+dummy video driver with scripted input (map drag, zoom, RLH hover, room
+clicks, a tour) and reports per-stage frame timings as p50/p95/p99. The
+results are written as a JSON artifact; with --baseline the run fails when
+a stage's p95 got slower than the baseline by more than --tolerance.
+
+    python bench_render.py --frames 300
+    python bench_render.py --frames 300 --dirty --baseline old.json
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUT = os.path.join(BASE_DIR, ".cache", "bench", "render.json")
+
+
+def campus_script(vm, pygame, i, frames):
+    """Campus frame i: drag the map, zoom while hovering RLH, then pixel mode."""
+    Event = pygame.event.Event
+    cx, cy = vm.screen.get_rect().center
+    third = max(frames // 3, 1)
+    events = []
+    if i == 0:
+        events.append(Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(cx, cy)))
+    if i < third:
+        # circle around the start point while dragging
+        pos = (cx + int(60 * math.sin(i * 0.1)), cy + int(30 * math.cos(i * 0.1)))
+        events.append(Event(pygame.MOUSEMOTION, pos=pos, buttons=(1, 0, 0)))
+    elif i == third:
+        events.append(Event(pygame.MOUSEBUTTONUP, button=1, pos=(cx, cy)))
+    else:
+        hx, hy = vm.map_to_screen(*vm.buildings["RLH"].center)
+        hover = (int(hx), int(hy))
+        events.append(Event(pygame.MOUSEMOTION, pos=hover, buttons=(0, 0, 0)))
+        if i < 2 * third and i % 8 == 0:
+            key = pygame.K_EQUALS if (i // 40) % 2 == 0 else pygame.K_MINUS
+            events.append(Event(pygame.KEYDOWN, key=key))
+        elif i == 2 * third:
+            events.append(Event(pygame.KEYDOWN, key=pygame.K_z))
+    return events
+
+
+def floor_script(vm, pygame, i, frames):
+    """Floor frame i: click a room every 40 frames, start a tour halfway."""
+    rooms = [data["pos"][0] for name, data in vm.rooms.items() if name != "passages"]
+    if i == frames // 2:
+        return [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_t)]
+    if i % 40 == 0:
+        pos = tuple(map(int, rooms[(i // 40) % len(rooms)]))
+        return [pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=pos)]
+    return []
+
+
+def run_scene(vm, pygame, profiler_cls, scene, script, frames, warmup):
+    vm.profiler = profiler_cls(enabled=True)
+    if scene == "rlh_floor":
+        vm.enter_rlh_floor()
+    for i in range(warmup + frames):
+        if i == warmup:
+            vm.profiler.reset()
+        with vm.profiler.stage("events"):
+            for e in script(vm, pygame, i - warmup, frames) if i >= warmup else ():
+                vm.handle_event(e)
+        with vm.profiler.stage("update"):
+            vm.update()
+        vm.render(0.5)
+        with vm.profiler.stage("flip"):
+            vm.dirty.present()
+        vm.profiler.end_frame()
+    return vm.profiler
+
+
+def compare(results, baseline, tolerance):
+    """List of 'scene/stage: p95 old -> new' lines that regressed."""
+    slower = []
+    for scene, stages in results["scenes"].items():
+        for name, st in stages.items():
+            old = baseline.get("scenes", {}).get(scene, {}).get(name)
+            # ignore sub-0.05 ms noise on very cheap stages
+            if old and st["p95"] > max(old["p95"] * tolerance, old["p95"] + 0.05):
+                slower.append(
+                    f"{scene}/{name}: p95 {old['p95']:.3f} -> {st['p95']:.3f} ms"
+                )
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    add = parser.add_argument
+    add("--frames", type=int, default=300, help="measured frames per scene")
+    add("--warmup", type=int, default=10, help="unmeasured frames per scene")
+    add("--dirty", action="store_true", help="use the dirty-rect renderer")
+    add("--out", default=DEFAULT_OUT, help="JSON artifact path")
+    add("--baseline", help="earlier JSON artifact to compare p95 against")
+    add("--tolerance", type=float, default=1.25, help="allowed p95 ratio")
+    args = parser.parse_args(argv)
+
+    # Must be set before pygame / the visualizer are imported
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.environ.pop("LLAMA_HEADLESS", None)
+    if args.dirty:
+        os.environ["LLAMA_DIRTY_RECTS"] = "1"
+    os.chdir(BASE_DIR)  # asset paths are relative to the repo root
+    sys.path.insert(0, BASE_DIR)
+
+    import pygame
+
+    import visualize_map as vm
+    from helper_functions.frame_profiler import FrameProfiler
+
+    results = {
+        "meta": {
+            "frames": args.frames,
+            "warmup": args.warmup,
+            "dirty_rects": vm.dirty.enabled,
+            "video_driver": pygame.display.get_driver(),
+            "window": list(vm.screen.get_size()),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "scenes": {},
+    }
+    for scene, script in (("campus", campus_script), ("rlh_floor", floor_script)):
+        profiler = run_scene(
+            vm, pygame, FrameProfiler, scene, script, args.frames, args.warmup
+        )
+        results["scenes"][scene] = profiler.summary()
+        print(profiler.report(f"[BENCH] {scene} ({args.frames} frames)"))
+    results["meta"]["checkpoints"] = vm.checkpoints.memory_report()
+    pygame.quit()
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"[BENCH] wrote {args.out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            slower = compare(results, json.load(f), args.tolerance)
+        for line in slower:
+            print("[BENCH] slower:", line)
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
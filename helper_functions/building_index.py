@@ -0,0 +1,126 @@
+# building_index.py
+import json
+import math
+import os
+from dataclasses import dataclass, field
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CAMPUS_FILE = os.path.join(BASE_DIR, "data", "campus.json")
+
+
+def point_in_polygon(x, y, polygon):
+    """Even-odd ray casting; points exactly on an edge may go either way."""
+    inside = False
+    x0, y0 = polygon[-1]
+    for x1, y1 in polygon:
+        if (y1 > y) != (y0 > y):
+            if x < x0 + (y - y0) * (x1 - x0) / (y1 - y0):
+                inside = not inside
+        x0, y0 = x1, y1
+    return inside
+
+
+def distance_to_outline(x, y, polygon):
+    """Distance from (x, y) to the nearest edge of the closed polygon."""
+    best = math.inf
+    x0, y0 = polygon[-1]
+    for x1, y1 in polygon:
+        dx, dy = x1 - x0, y1 - y0
+        length2 = dx * dx + dy * dy
+        t = 0.0 if length2 == 0 else ((x - x0) * dx + (y - y0) * dy) / length2
+        t = min(max(t, 0.0), 1.0)
+        best = min(best, math.hypot(x - (x0 + t * dx), y - (y0 + t * dy)))
+        x0, y0 = x1, y1
+    return best
+
+
+@dataclass
+class Building:
+    """A clickable campus building: map outline plus its floor plan images."""
+
+    name: str
+    outline: list  # [(x, y), ...] in map pixels
+    floors: dict = field(default_factory=dict)  # floor name -> image path
+    bbox: tuple = (0.0, 0.0, 0.0, 0.0)  # min x, min y, max x, max y
+    center: tuple = (0.0, 0.0)  # vertex centroid, used for labels and glow
+
+    def __post_init__(self):
+        self.outline = [tuple(p) for p in self.outline]
+        xs = [x for x, _ in self.outline]
+        ys = [y for _, y in self.outline]
+        self.bbox = (min(xs), min(ys), max(xs), max(ys))
+        self.center = (sum(xs) / len(xs), sum(ys) / len(ys))
+
+    def distance(self, x, y):
+        """0 inside the outline, otherwise the distance to its nearest edge."""
+        if point_in_polygon(x, y, self.outline):
+            return 0.0
+        return distance_to_outline(x, y, self.outline)
+
+
+class BuildingIndex:
+    """
+    Hit-testing for building outlines on the campus map. Every building is
+    registered in the uniform grid cells its bounding box (grown by
+    `margin`) overlaps, so a query only looks at the few buildings sharing
+    the query point's cell, and only runs the polygon test for those whose
+    bounding box is close enough.
+    """
+
+    def __init__(self, buildings, margin=80.0, cell_size=128.0):
+        self.buildings = {b.name: b for b in buildings}
+        self.margin = margin
+        self.cell_size = cell_size
+        self.cells = {}
+        for b in self.buildings.values():
+            cx0, cy0 = self._cell(b.bbox[0] - margin, b.bbox[1] - margin)
+            cx1, cy1 = self._cell(b.bbox[2] + margin, b.bbox[3] + margin)
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    self.cells.setdefault((cx, cy), []).append(b)
+
+    def _cell(self, x, y):
+        return int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))
+
+    def __len__(self):
+        return len(self.buildings)
+
+    def __getitem__(self, name):
+        return self.buildings[name]
+
+    def _candidates(self, x, y, margin):
+        for b in self.cells.get(self._cell(x, y), ()):
+            x0, y0, x1, y1 = b.bbox
+            if x0 - margin <= x <= x1 + margin and y0 - margin <= y <= y1 + margin:
+                yield b
+
+    def at(self, x, y):
+        """Building whose outline contains map point (x, y), or None."""
+        for b in self._candidates(x, y, 0.0):
+            if point_in_polygon(x, y, b.outline):
+                return b
+        return None
+
+    def nearest(self, x, y, max_distance=None):
+        """(building, distance) of the closest outline within `max_distance`
+        (default: the index margin), distance 0 inside; None if there is none."""
+        limit = self.margin if max_distance is None else min(max_distance, self.margin)
+        best = None
+        for b in self._candidates(x, y, limit):
+            d = b.distance(x, y)
+            if d <= limit and (best is None or d < best[1]):
+                best = (b, d)
+        return best
+
+
+def load_campus(path=CAMPUS_FILE, margin=80.0):
+    """BuildingIndex for the buildings listed in data/campus.json."""
+    if not os.path.isfile(path):
+        return BuildingIndex([], margin=margin)
+    with open(path) as f:
+        doc = json.load(f)
+    buildings = [
+        Building(name, spec["outline"], dict(spec.get("floors", {})))
+        for name, spec in doc.get("buildings", {}).items()
+    ]
+    return BuildingIndex(buildings, margin=margin)
@@ -0,0 +1,160 @@
+# checkpoint_store.py
+import os
+import queue
+import threading
+from collections import OrderedDict
+
+import pygame
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+
+def surface_bytes(surf):
+    w, h = surf.get_size()
+    return w * h * surf.get_bytesize()
+
+
+class CheckpointStore:
+    """
+    Checkpoint photos by node name (img/checkpoints/H1.jpg -> "H1").
+    Only the file names are read up front; a photo is decoded on first use
+    and kept as a pre-scaled popup in an LRU bounded by `max_bytes`.
+    `prefetch(names)` decodes upcoming checkpoints on a background thread and
+    `ready(name)` never blocks, so the walk never stalls on disk I/O.
+    Photos that fail to decode are reported once and then treated as absent.
+    """
+
+    def __init__(self, folder, popup_size=(300, 200), max_bytes=32 * 1024 * 1024):
+        self.folder = folder
+        self.popup_size = popup_size
+        self.max_bytes = max_bytes
+        self.paths = {}
+        if os.path.isdir(folder):
+            for fname in os.listdir(folder):
+                if fname.lower().endswith(IMAGE_EXTENSIONS):
+                    self.paths[fname.split(".")[0]] = os.path.join(folder, fname)
+        self.popups = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.decoded = 0
+        self.lock = threading.Lock()
+        self._queue = None
+        self._pending = set()
+        self.failed = set()
+
+    def __contains__(self, name):
+        return name in self.paths
+
+    def __len__(self):
+        return len(self.paths)
+
+    def _decode(self, name):
+        # None (and remembered in `failed`) if the photo cannot be read
+        try:
+            image = pygame.image.load(self.paths[name])
+            popup = pygame.transform.scale(image, self.popup_size)
+            if pygame.display.get_surface():
+                popup = popup.convert()  # display format: fast blits
+        except (pygame.error, OSError) as exc:
+            print(f"[CHECKPOINT] Could not load {name}: {exc}")
+            with self.lock:
+                self.failed.add(name)
+            return None
+        with self.lock:
+            self.decoded += 1
+        return popup
+
+    def _store(self, name, popup):
+        # caller holds the lock
+        if name in self.popups:
+            return self.popups[name]
+        self.popups[name] = popup
+        self.nbytes += surface_bytes(popup)
+        while self.nbytes > self.max_bytes and len(self.popups) > 1:
+            _, old = self.popups.popitem(last=False)
+            self.nbytes -= surface_bytes(old)
+        return popup
+
+    def _cached(self, name):
+        with self.lock:
+            popup = self.popups.get(name)
+            if popup is not None:
+                self.popups.move_to_end(name)
+                self.hits += 1
+            return popup
+
+    def popup(self, name):
+        """Pre-scaled popup surface for `name`, decoded now on a cache miss.
+        None if there is no (readable) photo."""
+        if name not in self.paths or name in self.failed:
+            return None
+        popup = self._cached(name)
+        if popup is not None:
+            return popup
+        with self.lock:
+            self.misses += 1
+        popup = self._decode(name)
+        if popup is None:
+            return None
+        with self.lock:
+            return self._store(name, popup)
+
+    def ready(self, name):
+        """Like `popup` but never blocks: on a miss the photo is queued for
+        background decoding and None is returned until it is cached."""
+        popup = self._cached(name)
+        if popup is None:
+            self.prefetch([name])
+        return popup
+
+    # -----------------------------
+    # Background prefetch
+    # -----------------------------
+    def prefetch(self, names):
+        """Queue checkpoints (e.g. the next nodes on the route) for decoding."""
+        for name in names:
+            with self.lock:
+                wanted = (
+                    name in self.paths
+                    and name not in self.popups
+                    and name not in self._pending
+                    and name not in self.failed
+                )
+                if wanted:
+                    self._pending.add(name)
+            if wanted:
+                if self._queue is None:
+                    self._queue = queue.Queue()
+                    threading.Thread(target=self._worker, daemon=True).start()
+                self._queue.put(name)
+
+    def _worker(self):
+        while True:
+            name = self._queue.get()
+            try:
+                popup = self._decode(name)
+                if popup is not None:
+                    with self.lock:
+                        self._store(name, popup)
+            finally:
+                with self.lock:
+                    self._pending.discard(name)
+                self._queue.task_done()
+
+    def wait(self):
+        """Block until every queued prefetch has finished."""
+        if self._queue is not None:
+            self._queue.join()
+
+    def memory_report(self):
+        with self.lock:
+            return {
+                "indexed": len(self.paths),
+                "cached": len(self.popups),
+                "bytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "decoded": self.decoded,
+            }
@@ -0,0 +1,161 @@
+# compiled_graph.py
+import hashlib
+import math
+from array import array
+
+import numpy as np
+
+
+def _buffer(typecode, values):
+    # NumPy input is copied as raw bytes instead of element by element
+    if isinstance(values, np.ndarray):
+        dtype = np.int32 if typecode == "i" else np.float64
+        return array(typecode, np.ascontiguousarray(values, dtype=dtype).tobytes())
+    return array(typecode, values)
+
+
+class CompiledGraph:
+    """
+    Integer-indexed graph in CSR form.
+    Node i has out-edges offsets[i] .. offsets[i+1]-1; edge e goes to
+    targets[e] with weight weights[e]. The reverse adjacency stores edge ids,
+    so both directions share the same weights buffer.
+    Buffers are `array` objects (fast scalar access from Python loops);
+    the *_np properties are zero-copy NumPy views for vectorized work.
+    """
+
+    def __init__(self, names, xy, offsets, targets, weights):
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.xy = _buffer("d", xy)  # interleaved x0, y0, x1, y1, ...
+        self.offsets = _buffer("i", offsets)
+        self.targets = _buffer("i", targets)
+        self.weights = _buffer("d", weights)
+        self.version = 0  # bumped on every weight change
+        self._build_reverse()
+
+    def _build_reverse(self):
+        n = self.num_nodes
+        sources = np.repeat(
+            np.arange(n, dtype=np.int32), np.diff(self.offsets_np)
+        )
+        order = np.argsort(self.targets_np, kind="stable").astype(np.int32)
+        counts = np.bincount(self.targets_np, minlength=n)
+        rev_offsets = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(counts, out=rev_offsets[1:])
+        self.rev_offsets = array("i", rev_offsets.tobytes())
+        self.rev_sources = array("i", sources[order].tobytes())
+        self.rev_edges = array("i", order.tobytes())
+
+    # -----------------------------
+    # Sizes and views
+    # -----------------------------
+    @property
+    def num_nodes(self):
+        return len(self.names)
+
+    @property
+    def num_edges(self):
+        return len(self.targets)
+
+    @property
+    def coords(self):
+        """Node coordinates as an (N, 2) float array (view)."""
+        return np.frombuffer(self.xy, dtype=np.float64).reshape(-1, 2)
+
+    @property
+    def offsets_np(self):
+        return np.frombuffer(self.offsets, dtype=np.int32)
+
+    @property
+    def targets_np(self):
+        return np.frombuffer(self.targets, dtype=np.int32)
+
+    @property
+    def weights_np(self):
+        return np.frombuffer(self.weights, dtype=np.float64)
+
+    def nbytes(self):
+        bufs = (self.xy, self.offsets, self.targets, self.weights)
+        bufs += (self.rev_offsets, self.rev_sources, self.rev_edges)
+        return sum(b.itemsize * len(b) for b in bufs)
+
+    def fingerprint(self):
+        """Content hash of structure and current weights (cache key for tables)."""
+        h = hashlib.sha256()
+        for buf in (self.xy, self.offsets, self.targets, self.weights):
+            h.update(buf.tobytes())
+        return h.hexdigest()[:16]
+
+    def is_symmetric(self):
+        """True if every edge u -> v has a reverse edge v -> u of equal weight."""
+        sources = np.repeat(
+            np.arange(self.num_nodes, dtype=np.int64), np.diff(self.offsets_np)
+        )
+        targets = self.targets_np.astype(np.int64)
+        fwd = np.lexsort((self.weights_np, targets, sources))
+        bwd = np.lexsort((self.weights_np, sources, targets))
+        return bool(
+            np.array_equal(sources[fwd], targets[bwd])
+            and np.array_equal(targets[fwd], sources[bwd])
+            and np.allclose(self.weights_np[fwd], self.weights_np[bwd])
+        )
+
+    # -----------------------------
+    # Lookups
+    # -----------------------------
+    def node_id(self, name):
+        return self.index[name]
+
+    def point(self, u):
+        return self.xy[2 * u], self.xy[2 * u + 1]
+
+    def euclid(self, u, v):
+        xy = self.xy
+        return math.hypot(xy[2 * u] - xy[2 * v], xy[2 * u + 1] - xy[2 * v + 1])
+
+    def edge_id(self, u, v):
+        """Id of the edge u -> v, or -1 if there is none."""
+        for e in range(self.offsets[u], self.offsets[u + 1]):
+            if self.targets[e] == v:
+                return e
+        return -1
+
+    def set_weight(self, u, v, weight):
+        """Change the weight of edge u -> v in place. Returns the old weight."""
+        e = self.edge_id(u, v)
+        if e < 0:
+            raise KeyError(f"no edge {self.names[u]} -> {self.names[v]}")
+        old = self.weights[e]
+        self.weights[e] = weight
+        self.version += 1
+        return old
+
+
+def compile_graph(nodes, edges):
+    """
+    Compile name-keyed dicts into a CompiledGraph.
+    `nodes` maps name -> (x, y); `edges` maps name -> list of neighbour names.
+    Nodes missing from `edges` simply have no out-edges. Edge weights are
+    the Euclidean distance between endpoints.
+    """
+    names = list(nodes)
+    index = {name: i for i, name in enumerate(names)}
+    xy = []
+    for name in names:
+        x, y = nodes[name]
+        xy.extend((float(x), float(y)))
+
+    offsets = [0]
+    targets = []
+    weights = []
+    for name in names:
+        x, y = nodes[name]
+        for nb in edges.get(name, ()):
+            if nb not in index:
+                raise ValueError(f"edge {name} -> {nb}: unknown node {nb!r}")
+            nx, ny = nodes[nb]
+            targets.append(index[nb])
+            weights.append(math.hypot(nx - x, ny - y))
+        offsets.append(len(targets))
+    return CompiledGraph(names, xy, offsets, targets, weights)
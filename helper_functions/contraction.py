@@ -0,0 +1,198 @@
+# contraction.py
+import heapq
+import time
+
+from helper_functions.pathfinding import INF, SearchStats
+
+
+class ContractionHierarchy:
+    """
+    Contraction Hierarchies over a CompiledGraph.
+    Nodes are contracted in edge-difference order (lazy updates); a shortcut
+    u -> w via v is added only if a bounded witness search finds no path of
+    equal or shorter length around v. Queries run a bidirectional Dijkstra
+    that only follows edges towards higher-ranked nodes, then unpack
+    shortcuts back into original edges.
+    """
+
+    def __init__(self, graph, witness_settle_limit=200):
+        self.graph = graph
+        self.version = graph.version
+        self.witness_settle_limit = witness_settle_limit
+        n = graph.num_nodes
+        self.rank = [0] * n
+        self.up = [[] for _ in range(n)]  # u -> higher w: (w, weight)
+        self.down = [[] for _ in range(n)]  # w <- higher u (reversed): (u, weight)
+        self.middle = {}  # (u, w) -> contracted node the shortcut skips
+        self.shortcut_count = 0
+        self.preprocess_ms = 0.0
+        self._build()
+
+    # -----------------------------
+    # Preprocessing
+    # -----------------------------
+    def _build(self):
+        t0 = time.perf_counter()
+        g = self.graph
+        n = g.num_nodes
+        out = [dict() for _ in range(n)]
+        inn = [dict() for _ in range(n)]
+        for u in range(n):
+            for e in range(g.offsets[u], g.offsets[u + 1]):
+                v, w = g.targets[e], g.weights[e]
+                if v == u or w == INF:
+                    continue  # self loops never help; blocked edges are gone
+                if w < out[u].get(v, INF):
+                    out[u][v] = w
+                    inn[v][u] = w
+
+        contracted = [False] * n
+        depth = [0] * n  # spreads contraction evenly across the graph
+
+        def priority(v):
+            shortcuts = self._shortcuts_for(v, out, inn)
+            return len(shortcuts) - len(out[v]) - len(inn[v]) + depth[v], shortcuts
+
+        pq = [(priority(v)[0], v) for v in range(n)]
+        heapq.heapify(pq)
+        next_rank = 0
+        while pq:
+            _, v = heapq.heappop(pq)
+            if contracted[v]:
+                continue
+            prio, shortcuts = priority(v)
+            if pq and prio > pq[0][0]:
+                heapq.heappush(pq, (prio, v))  # stale priority: try again later
+                continue
+
+            self.rank[v] = next_rank
+            next_rank += 1
+            contracted[v] = True
+            # Edges to still-uncontracted nodes point upwards and are final
+            for w, weight in out[v].items():
+                self.up[v].append((w, weight))
+                del inn[w][v]
+            for u, weight in inn[v].items():
+                self.down[v].append((u, weight))
+                del out[u][v]
+            for u, w, weight in shortcuts:
+                if weight < out[u].get(w, INF):
+                    out[u][w] = weight
+                    inn[w][u] = weight
+                    if (u, w) not in self.middle:  # not a cheaper replacement
+                        self.shortcut_count += 1
+                    self.middle[(u, w)] = v
+            for x in set(out[v]) | set(inn[v]):
+                depth[x] = max(depth[x], depth[v] + 1)
+            out[v].clear()
+            inn[v].clear()
+        self.preprocess_ms = (time.perf_counter() - t0) * 1000.0
+
+    def _shortcuts_for(self, v, out, inn):
+        # Shortcuts needed if v were contracted now: (u, w, weight)
+        shortcuts = []
+        if not inn[v] or not out[v]:
+            return shortcuts
+        max_out = max(out[v].values())
+        for u, w_in in inn[v].items():
+            limit = w_in + max_out
+            witness = self._witness_search(u, v, limit, out)
+            for w, w_out in out[v].items():
+                if w == u:
+                    continue
+                via = w_in + w_out
+                if witness.get(w, INF) > via:
+                    shortcuts.append((u, w, via))
+        return shortcuts
+
+    def _witness_search(self, source, skip, limit, out):
+        # Dijkstra from source that avoids `skip`, bounded by distance and size
+        dist = {source: 0.0}
+        pq = [(0.0, source)]
+        settled = 0
+        while pq and settled < self.witness_settle_limit:
+            d, x = heapq.heappop(pq)
+            if d > dist[x]:
+                continue
+            if d > limit:
+                break
+            settled += 1
+            for y, w in out[x].items():
+                if y == skip:
+                    continue
+                nd = d + w
+                if nd < dist.get(y, INF):
+                    dist[y] = nd
+                    heapq.heappush(pq, (nd, y))
+        return dist
+
+    # -----------------------------
+    # Queries
+    # -----------------------------
+    def query(self, start, goal):
+        """Returns (list of node ids or None, SearchStats) like astar_search."""
+        stats = SearchStats(mode="CH")
+        t0 = time.perf_counter()
+        dist = ({start: 0.0}, {goal: 0.0})
+        parent = ({}, {})
+        settled = (set(), set())
+        heaps = ([(0.0, start)], [(0.0, goal)])
+        adjacency = (self.up, self.down)
+        stats.pushes = 2
+        best, meet = INF, None
+        if start == goal:
+            best, meet = 0.0, start
+
+        side = 0
+        while heaps[0] or heaps[1]:
+            # Alternate directions; a direction whose smallest key is not
+            # below the best meeting distance cannot improve it any more.
+            if not heaps[side] or heaps[side][0][0] >= best:
+                side ^= 1
+                if not heaps[side] or heaps[side][0][0] >= best:
+                    break
+            d, u = heapq.heappop(heaps[side])
+            if u in settled[side]:
+                continue
+            settled[side].add(u)
+            stats.expansions += 1
+            other = dist[side ^ 1].get(u)
+            if other is not None and d + other < best:
+                best, meet = d + other, u
+            for v, w in adjacency[side][u]:
+                nd = d + w
+                if nd < dist[side].get(v, INF):
+                    dist[side][v] = nd
+                    parent[side][v] = u
+                    heapq.heappush(heaps[side], (nd, v))
+                    stats.pushes += 1
+            side ^= 1
+
+        path = None
+        if meet is not None:
+            fwd = [meet]
+            while fwd[-1] != start:
+                fwd.append(parent[0][fwd[-1]])
+            fwd.reverse()
+            bwd = [meet]
+            while bwd[-1] != goal:
+                bwd.append(parent[1][bwd[-1]])
+            path = self.unpack(fwd + bwd[1:])
+        stats.elapsed_ms = (time.perf_counter() - t0) * 1000.0
+        return path, stats
+
+    def unpack(self, path):
+        """Expand shortcut edges of a hierarchy path into original edges."""
+        if len(path) < 2:
+            return list(path)
+        result = [path[0]]
+        stack = list(zip(path, path[1:]))[::-1]  # next edge to emit on top
+        while stack:
+            a, b = stack.pop()
+            mid = self.middle.get((a, b))
+            if mid is None:
+                result.append(b)
+            else:
+                stack.append((mid, b))
+                stack.append((a, mid))
+        return result
@@ -0,0 +1,189 @@
+# dstar_lite.py
+import heapq
+import time
+
+from helper_functions.pathfinding import INF, SearchStats
+
+
+class DStarLite:
+    """
+    Incremental replanner (optimized D* Lite) on a CompiledGraph.
+    The search runs backwards from the goal and keeps g/rhs values between
+    calls, so after edge changes `replan()` only re-expands the nodes whose
+    distance to the goal actually changed. The start may move as the walker
+    advances (`move_start`), which only shifts the key modifier km.
+
+    Edge weights live in the graph; change them with `update_edge`, or call
+    `edge_changed` after changing them elsewhere.
+    """
+
+    def __init__(self, graph, start, goal, heuristic=None):
+        self.graph = graph
+        self.start = start
+        self.goal = goal
+        self.heuristic = heuristic or graph.euclid  # h(a, b) <= d(a, b)
+        self.km = 0.0
+        self.g = {}
+        self.rhs = {goal: 0.0}
+        self.open = {}  # node -> current key
+        self.heap = []
+        self.counter = 0
+        self.initialized = False
+        self.last_start = start
+        self.total_expansions = 0
+        self._push(goal, self._key(goal))
+
+    # -----------------------------
+    # Priority queue with lazy deletion
+    # -----------------------------
+    def _key(self, s):
+        m = min(self.g.get(s, INF), self.rhs.get(s, INF))
+        return (m + self.heuristic(self.start, s) + self.km, m)
+
+    def _push(self, s, key):
+        self.open[s] = key
+        self.counter += 1
+        heapq.heappush(self.heap, (key, self.counter, s))
+
+    def _top(self):
+        while self.heap:
+            key, _, s = self.heap[0]
+            if self.open.get(s) == key:
+                return key, s
+            heapq.heappop(self.heap)  # stale entry
+        return (INF, INF), None
+
+    # -----------------------------
+    # Core
+    # -----------------------------
+    def _succ_min(self, s):
+        g = self.graph
+        best = INF
+        for e in range(g.offsets[s], g.offsets[s + 1]):
+            val = g.weights[e] + self.g.get(g.targets[e], INF)
+            if val < best:
+                best = val
+        return best
+
+    def _update_vertex(self, s):
+        if s != self.goal:
+            self.rhs[s] = self._succ_min(s)
+        consistent = self.g.get(s, INF) == self.rhs.get(s, INF)
+        if not consistent:
+            self._push(s, self._key(s))
+        elif s in self.open:
+            del self.open[s]
+
+    def _compute(self, stats):
+        g = self.graph
+        while True:
+            k_old, u = self._top()
+            start_key = self._key(self.start)
+            g_start = self.g.get(self.start, INF)
+            if u is None or (
+                k_old >= start_key and self.rhs.get(self.start, INF) <= g_start
+            ):
+                break
+            k_new = self._key(u)
+            if k_old < k_new:
+                self._push(u, k_new)
+                continue
+            del self.open[u]
+            stats.expansions += 1
+            g_u, rhs_u = self.g.get(u, INF), self.rhs.get(u, INF)
+            if g_u > rhs_u:
+                self.g[u] = rhs_u
+                for e in range(g.rev_offsets[u], g.rev_offsets[u + 1]):
+                    s = g.rev_sources[e]
+                    if s != self.goal:
+                        via = g.weights[g.rev_edges[e]] + rhs_u
+                        if via < self.rhs.get(s, INF):
+                            self.rhs[s] = via
+                    self._refresh(s)
+            else:
+                self.g[u] = INF
+                self._update_vertex(u)
+                for e in range(g.rev_offsets[u], g.rev_offsets[u + 1]):
+                    s = g.rev_sources[e]
+                    if self.rhs.get(s, INF) == g.weights[g.rev_edges[e]] + g_u:
+                        self._update_vertex(s)
+        self.initialized = True
+
+    def _refresh(self, s):
+        # UpdateVertex without recomputing rhs (already lowered by the caller)
+        if self.g.get(s, INF) != self.rhs.get(s, INF):
+            self._push(s, self._key(s))
+        elif s in self.open:
+            del self.open[s]
+
+    def replan(self):
+        """Bring the search up to date; returns SearchStats for this call."""
+        stats = SearchStats(mode="D*Lite")
+        t0 = time.perf_counter()
+        pushes_before = self.counter
+        self._compute(stats)
+        stats.pushes = self.counter - pushes_before
+        stats.elapsed_ms = (time.perf_counter() - t0) * 1000.0
+        self.total_expansions += stats.expansions
+        return stats
+
+    # -----------------------------
+    # Changes
+    # -----------------------------
+    def move_start(self, start):
+        """The walker reached `start`; keeps existing keys valid via km."""
+        if start == self.start:
+            return
+        self.km += self.heuristic(self.last_start, start)
+        self.last_start = start
+        self.start = start
+
+    def edge_changed(self, u, v, old_weight):
+        """Tell the planner that edge u -> v changed from `old_weight`."""
+        if not self.initialized or u == self.goal:
+            return
+        new_weight = self.graph.weights[self.graph.edge_id(u, v)]
+        g_v = self.g.get(v, INF)
+        if new_weight < old_weight:
+            if new_weight + g_v < self.rhs.get(u, INF):
+                self.rhs[u] = new_weight + g_v
+            self._refresh(u)
+        elif self.rhs.get(u, INF) == old_weight + g_v:
+            self._update_vertex(u)
+
+    def update_edge(self, u, v, weight):
+        """Change edge u -> v in the graph and record it for the next replan."""
+        old = self.graph.set_weight(u, v, weight)
+        self.edge_changed(u, v, old)
+        return old
+
+    # -----------------------------
+    # Results
+    # -----------------------------
+    def distance(self):
+        # The start may be left locally overconsistent (g > rhs); rhs holds
+        # the correct one-step lookahead distance either way.
+        return self.rhs.get(self.start, INF)
+
+    def path(self):
+        """Current shortest path start -> goal as node ids, or None."""
+        if not self.initialized:
+            self.replan()
+        if self.distance() == INF:
+            return None
+        g = self.graph
+        path = [self.start]
+        node = self.start
+        seen = {node}
+        while node != self.goal:
+            best, nxt = INF, None
+            for e in range(g.offsets[node], g.offsets[node + 1]):
+                val = g.weights[e] + self.g.get(g.targets[e], INF)
+                if val < best:
+                    best, nxt = val, g.targets[e]
+            if nxt is None or nxt in seen:
+                return None  # only possible if replan() was not called
+            path.append(nxt)
+            seen.add(nxt)
+            node = nxt
+        return path
@@ -0,0 +1,82 @@
+# frame_profiler.py
+import time
+from contextlib import nullcontext
+
+import numpy as np
+
+PERCENTILES = (50, 95, 99)
+_HEADERS = [f"p{p} ms" for p in PERCENTILES] + ["frames"]
+
+
+class _Stage:
+    __slots__ = ("profiler", "name", "t0")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+
+    def __exit__(self, *exc):
+        frame = self.profiler.frame
+        frame[self.name] = frame.get(self.name, 0.0) + time.perf_counter() - self.t0
+
+
+class FrameProfiler:
+    """
+    Per-stage frame timings. Wrap each part of a frame in
+    `with profiler.stage("map"):` and call `end_frame()` once per frame;
+    a stage entered several times in one frame is summed. Disabled (the
+    default) `stage` returns a shared no-op context, so the calls can stay
+    in the render code.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.frame = {}
+        self.frames = []  # one {stage: seconds} dict per finished frame
+        self._noop = nullcontext()
+
+    def stage(self, name):
+        if not self.enabled:
+            return self._noop
+        return _Stage(self, name)
+
+    def end_frame(self):
+        if self.enabled:
+            self.frames.append(self.frame)
+            self.frame = {}
+
+    def reset(self):
+        self.frame = {}
+        self.frames = []
+
+    def summary(self):
+        """{stage: {"p50": ms, "p95": ms, "p99": ms, "mean": ms, "frames": n}}.
+        Frames where a stage did not run are left out of that stage's stats;
+        "frame" is the sum of all stages per frame."""
+        stages = {}
+        for frame in self.frames:
+            for name, seconds in frame.items():
+                stages.setdefault(name, []).append(seconds)
+        stages["frame"] = [sum(frame.values()) for frame in self.frames]
+        out = {}
+        for name, values in stages.items():
+            if not values:
+                continue
+            ms = np.asarray(values) * 1000.0
+            pct = np.percentile(ms, PERCENTILES)
+            stats = {f"p{p}": float(v) for p, v in zip(PERCENTILES, pct)}
+            stats["mean"] = float(ms.mean())
+            stats["frames"] = len(values)
+            out[name] = stats
+        return out
+
+    def report(self, title=""):
+        lines = [title] if title else []
+        lines.append(f"{'stage':<12}" + "".join(f"{h:>10}" for h in _HEADERS))
+        for name, st in self.summary().items():
+            cells = [f"{st[f'p{p}']:>10.3f}" for p in PERCENTILES]
+            lines.append(f"{name:<12}" + "".join(cells) + f"{st['frames']:>10}")
+        return "\n".join(lines)
@@ -0,0 +1,171 @@
+# gps_poller.py
+import json
+import threading
+import time
+from collections import namedtuple
+
+import requests
+
+from helper_functions.track_log import log_files, read_track
+
+# One GPS reading; `received` is time.monotonic() when it arrived
+Fix = namedtuple("Fix", "lat lon received")
+
+# The server sends a keep-alive comment every 10 s on an idle stream
+STREAM_READ_TIMEOUT = 30.0
+
+
+class GpsPoller:
+    """
+    Polls the GPS server's /get endpoint on a daemon thread through one
+    keep-alive requests.Session. Every `interval` seconds while the server
+    answers; after a failure the delay doubles up to `max_backoff`.
+    The newest fix is published by replacing `latest` (an immutable Fix,
+    or None before the first one), a single atomic reference swap, so the
+    render loop reads it without locks and never waits on the network.
+    With `stream_url` the thread subscribes to the server's SSE stream
+    instead and only falls back to polling if the server has no stream.
+    """
+
+    def __init__(
+        self, url, interval=0.2, timeout=1.0, max_backoff=5.0, stream_url=None
+    ):
+        self.url = url
+        self.stream_url = stream_url
+        self.interval = interval
+        self.timeout = timeout
+        self.max_backoff = max_backoff
+        self.latest = None
+        self.polls = 0
+        self.failures = 0  # consecutive failed polls
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(self.timeout + 1.0)
+            self._thread = None
+
+    def delay(self):
+        """Seconds until the next poll, given the current failure streak."""
+        if not self.failures:
+            return self.interval
+        return min(self.interval * 2**self.failures, self.max_backoff)
+
+    def _failed(self, url):
+        if self.failures == 0:
+            print(f"[GPS] {url} unreachable, backing off")
+        self.failures += 1
+
+    def _reached(self):
+        if self.failures:
+            print("[GPS] Server reachable again.")
+        self.failures = 0
+
+    def _publish(self, data):
+        lat, lon = data.get("lat"), data.get("lon")
+        if lat and lon:
+            self.latest = Fix(float(lat), float(lon), time.monotonic())
+
+    def poll(self, session):
+        """One request; returns True if the server answered."""
+        self.polls += 1
+        try:
+            data = session.get(self.url, timeout=self.timeout).json()
+        except (requests.RequestException, ValueError):
+            self._failed(self.url)
+            return False
+        self._reached()
+        self._publish(data)
+        return True
+
+    def listen(self, session):
+        """Follow the SSE stream until it ends or fails (one fix per event)."""
+        timeout = (self.timeout, STREAM_READ_TIMEOUT)
+        try:
+            with session.get(self.stream_url, stream=True, timeout=timeout) as res:
+                if res.status_code == 404:
+                    print("[GPS] Server has no stream endpoint, polling instead.")
+                    self.stream_url = None
+                    return
+                res.raise_for_status()
+                self._reached()
+                for line in res.iter_lines(decode_unicode=True):
+                    if self._stop.is_set():
+                        return
+                    if line and line.startswith("data:"):
+                        self._publish(json.loads(line[5:]))
+        except (requests.RequestException, ValueError):
+            self._failed(self.stream_url)
+
+    def _run(self):
+        with requests.Session() as session:
+            while not self._stop.is_set():
+                if self.stream_url:
+                    self.listen(session)
+                else:
+                    self.poll(session)
+                self._stop.wait(self.delay())
+
+
+class TrackReplay:
+    """
+    Stand-in for GpsPoller that replays a recorded track log (file or
+    directory) instead of talking to the server: a daemon thread walks the
+    memory-mapped records and publishes each as `latest` at its recorded
+    time offset divided by `speed`. `device` limits the replay to one phone.
+    """
+
+    def __init__(self, path, speed=1.0, device=None):
+        if speed <= 0:
+            raise ValueError(f"replay speed must be positive, got {speed}")
+        self.path = path
+        self.speed = speed
+        self.device = device
+        self.latest = None
+        self.replayed = 0
+        self.done = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(1.0)
+            self._thread = None
+
+    def _records(self):
+        for path in log_files(self.path):
+            try:
+                yield from read_track(path, self.device)
+            except (OSError, ValueError) as exc:
+                print(f"[REPLAY] Skipping {path}: {exc}")
+
+    def _run(self):
+        t0 = start = None
+        for t, _, lat, lon, _ in self._records():
+            if t0 is None:
+                t0, start = t, time.monotonic()
+            wait = start + (t - t0) / self.speed - time.monotonic()
+            if wait > 0 and self._stop.wait(wait):
+                return
+            if self._stop.is_set():
+                return
+            self.latest = Fix(lat, lon, time.monotonic())
+            self.replayed += 1
+        print(f"[REPLAY] Finished {self.path} ({self.replayed} fixes)")
+        self.done.set()
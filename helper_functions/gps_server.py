@@ -1,42 +1,226 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory
 from flask_cors import CORS
+import json
+import math
 import os
+import queue
+import sys
+import threading
+import time
 
 # Configure static folder to serve the web viewer
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 STATIC_DIR = os.path.join(BASE_DIR, "web")
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)  # when run as `python helper_functions/gps_server.py`
+
+from helper_functions.position_store import PositionStore  # noqa: E402
+from helper_functions.track_log import TrackLog  # noqa: E402
 
 app = Flask(__name__, static_folder=STATIC_DIR, static_url_path="/web")
 CORS(app)  # 👈 allow all devices/browsers to access Flask
 
-coords = {"lat": 0.0, "lon": 0.0}
+# Latest fix and recent track per device (the "device" field of a posted
+# fix, else the X-Device-Id header, else the sender's IP address)
+TRACK_LENGTH = 256
+positions = PositionStore(TRACK_LENGTH)
+NO_FIX = {"lat": 0.0, "lon": 0.0}
+MAX_BATCH = 1000  # fixes per /api/gps/batch request
+
+# Every accepted fix is also appended to a binary track log for replay
+# (visualize_map.py with LLAMA_REPLAY=<file or dir>); LLAMA_TRACK_DIR= disables
+TRACK_DIR = os.environ.get("LLAMA_TRACK_DIR", os.path.join(BASE_DIR, "logs", "tracks"))
+track_log = TrackLog(TRACK_DIR) if TRACK_DIR else None
+
+SSE_KEEPALIVE = 10  # seconds between comment lines on an idle stream
+
+
+class Broadcaster:
+    """
+    Fan-out of GPS updates to stream subscribers. Each subscriber owns a
+    small bounded queue; a slow viewer drops its oldest pending updates
+    instead of holding up the publisher or the other viewers.
+    """
+
+    def __init__(self, backlog=16):
+        self.backlog = backlog
+        self._lock = threading.Lock()
+        self._subscribers = set()
+
+    def subscribe(self):
+        q = queue.Queue(maxsize=self.backlog)
+        with self._lock:
+            self._subscribers.add(q)
+        return q
+
+    def unsubscribe(self, q):
+        with self._lock:
+            self._subscribers.discard(q)
+
+    def publish(self, message):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for q in subscribers:
+            while True:
+                try:
+                    q.put_nowait(message)
+                    break
+                except queue.Full:
+                    try:
+                        q.get_nowait()
+                    except queue.Empty:
+                        pass
+
+    def __len__(self):
+        return len(self._subscribers)
+
+
+broadcaster = Broadcaster()
+
+
+def current():
+    """Newest fix from any device (what the single-device endpoints return)."""
+    return positions.newest or NO_FIX
+
+
+def parse_fix(data):
+    """(t, lat, lon, accuracy) of a posted fix; ValueError if it is unusable."""
+    try:
+        lat, lon = float(data["lat"]), float(data["lon"])
+        t = time.time() if data.get("t") is None else float(data["t"])
+        accuracy = data.get("accuracy")
+        accuracy = None if accuracy is None else float(accuracy)
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ValueError(f"bad fix {data!r}: {exc}") from exc
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180 and math.isfinite(t)):
+        raise ValueError(f"bad fix {data!r}: out of range")
+    return t, lat, lon, accuracy
+
+
+def device_id(data):
+    return str(
+        data.get("device") or request.headers.get("X-Device-Id") or request.remote_addr
+    )
+
+
+def record_fix(data):
+    """Validate a posted fix, store it and push it to stream subscribers."""
+    t, lat, lon, accuracy = parse_fix(data)
+    fix = positions.update(device_id(data), lat, lon, t, accuracy)
+    if track_log:
+        track_log.append(fix["t"], fix["device"], lat, lon, accuracy)
+    if positions.latest(fix["device"]) == fix:  # a late fix is not pushed
+        broadcaster.publish(json.dumps(fix))  # serialized once for all viewers
+    return fix
+
+
+def _sse(data):
+    return f"data: {data}\n\n"
+
+
+def _ingest(label):
+    try:
+        fix = record_fix(request.get_json(force=True, silent=True))
+    except ValueError as exc:
+        return str(exc), 400
+    print(f"📍 Updated GPS{label}: {fix}")
+    return "OK"
 
 
 @app.route("/update", methods=["POST"])
 def update():  # backward-compatible endpoint
-    global coords
-    coords = request.get_json(force=True) or coords
-    print(f"📍 Updated GPS: {coords}")
-    return "OK"
+    return _ingest("")
 
 
 @app.route("/get")
 def get():
-    return jsonify(coords)
+    return jsonify(current())
 
 
 # New normalized API endpoints
 @app.post("/api/gps")
 def api_update_gps():
-    global coords
-    coords = request.get_json(force=True) or coords
-    print(f"📍 Updated GPS (api): {coords}")
-    return "OK"
+    return _ingest(" (api)")
 
 
 @app.get("/api/gps")
 def api_get_gps():
-    return jsonify(coords)
+    return jsonify(current())
+
+
+@app.post("/api/gps/batch")
+def api_gps_batch():
+    """
+    Many fixes in one request, as {"device": id, "fixes": [{"lat", "lon",
+    "t", "accuracy"}, ...]} or a bare list of fixes. Invalid fixes are
+    skipped and their indices returned; the rest are stored in one go, and
+    the device's latest fix is pushed to stream subscribers if it changed.
+    """
+    data = request.get_json(force=True, silent=True)
+    if isinstance(data, list):
+        data = {"fixes": data}
+    fixes = data.get("fixes") if isinstance(data, dict) else None
+    if not isinstance(fixes, list):
+        return jsonify({"error": "expected a list of fixes"}), 400
+    if len(fixes) > MAX_BATCH:
+        return jsonify({"error": f"at most {MAX_BATCH} fixes per batch"}), 413
+
+    records, rejected = [], []
+    for i, item in enumerate(fixes):
+        try:
+            records.append(parse_fix(item))
+        except ValueError:
+            rejected.append(i)
+    device = device_id(data)
+    newest = positions.extend(device, records)
+    if track_log:
+        track_log.extend((t, device, lat, lon, acc) for t, lat, lon, acc in records)
+    if newest:
+        broadcaster.publish(json.dumps(newest))
+    print(f"📍 Batch from {device}: {len(records)} fixes, {len(rejected)} rejected")
+    return jsonify({"accepted": len(records), "rejected": rejected})
+
+
+@app.get("/api/devices")
+def api_devices():
+    return jsonify(positions.all_latest())
+
+
+@app.get("/api/devices/<device>")
+def api_device(device):
+    fix = positions.latest(device)
+    if fix is None:
+        return jsonify({"error": f"unknown device {device}"}), 404
+    return jsonify(fix)
+
+
+@app.get("/api/devices/<device>/track")
+def api_device_track(device):
+    """Recent fixes of one device, oldest first (?limit=N for the last N)."""
+    fixes = positions.track(device, request.args.get("limit", type=int))
+    if fixes is None:
+        return jsonify({"error": f"unknown device {device}"}), 404
+    return jsonify({"device": device, "fixes": fixes})
+
+
+@app.get("/api/gps/stream")
+def api_gps_stream():
+    """Server-Sent Events: the current fix, then every new one as it arrives."""
+    q = broadcaster.subscribe()
+
+    def events():
+        try:
+            yield _sse(json.dumps(current()))
+            while True:
+                try:
+                    yield _sse(q.get(timeout=SSE_KEEPALIVE))
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+        finally:
+            broadcaster.unsubscribe(q)  # client went away
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return Response(events(), mimetype="text/event-stream", headers=headers)
 
 
 @app.get("/")
@@ -48,4 +232,8 @@ def root():
 
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=8000)
+    try:
+        app.run(host="0.0.0.0", port=8000, threaded=True)  # one thread per stream
+    finally:
+        if track_log:
+            track_log.close()
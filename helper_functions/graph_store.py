@@ -0,0 +1,129 @@
+# graph_store.py
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from helper_functions.compiled_graph import CompiledGraph, compile_graph
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, "data", "buildings")
+CACHE_DIR = os.path.join(BASE_DIR, ".cache", "graphs")
+
+
+@dataclass
+class BuildingGraph:
+    """One building floor: compiled routing graph plus its drawing metadata."""
+
+    name: str
+    floor: str
+    graph: CompiledGraph
+    rooms: dict = field(default_factory=dict)  # room name -> [(x, y), ...]
+    passages: list = field(default_factory=list)  # hallway dots [(x, y), ...]
+    source_hash: str = ""
+    from_cache: bool = False
+
+    def node_positions(self):
+        """name -> (x, y) dict, same shape as the old `graph_nodes` literal."""
+        return {name: self.graph.point(i) for i, name in enumerate(self.graph.names)}
+
+    def adjacency(self):
+        """name -> [neighbour names] dict, same shape as the old `graph_edges`."""
+        g = self.graph
+        return {
+            name: [g.names[g.targets[e]] for e in range(g.offsets[u], g.offsets[u + 1])]
+            for u, name in enumerate(g.names)
+        }
+
+
+def available_buildings(data_dir=DATA_DIR):
+    """Building keys that have a data file (no parsing involved)."""
+    if not os.path.isdir(data_dir):
+        return []
+    return sorted(f[:-5] for f in os.listdir(data_dir) if f.endswith(".json"))
+
+
+def _points(values):
+    return [tuple(p) for p in values]
+
+
+def _compile_source(raw):
+    doc = json.loads(raw)
+    graph = compile_graph(doc["nodes"], doc.get("edges", {}))
+    meta = {
+        "building": doc.get("building", ""),
+        "floor": doc.get("floor", ""),
+        "rooms": doc.get("rooms", {}),
+        "passages": doc.get("passages", []),
+    }
+    return graph, meta
+
+
+def _save_cache(path, graph, meta):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp.npz"
+    np.savez(
+        tmp,
+        names=np.array(graph.names),
+        xy=np.frombuffer(graph.xy, dtype=np.float64),
+        offsets=graph.offsets_np,
+        targets=graph.targets_np,
+        weights=graph.weights_np,
+        meta=np.array(json.dumps(meta)),
+    )
+    os.replace(tmp, path)  # atomic, so a crash never leaves half a cache file
+
+
+def _load_cache(path):
+    with np.load(path) as z:
+        graph = CompiledGraph(
+            z["names"].tolist(), z["xy"], z["offsets"], z["targets"], z["weights"]
+        )
+        meta = json.loads(str(z["meta"]))
+    return graph, meta
+
+
+def load_building(key, data_dir=DATA_DIR, cache_dir=CACHE_DIR):
+    """
+    Load data/buildings/<key>.json as a BuildingGraph.
+    The compiled graph is cached as <cache_dir>/<key>-<content hash>.npz, so
+    a restart with an unchanged file skips JSON parsing and compilation.
+    Editing the file changes the hash; stale cache files are removed.
+    """
+    key = key.lower()
+    with open(os.path.join(data_dir, key + ".json"), "rb") as fh:
+        raw = fh.read()
+    digest = hashlib.sha256(raw).hexdigest()[:16]
+    cache_path = os.path.join(cache_dir, f"{key}-{digest}.npz")
+
+    from_cache = False
+    if os.path.isfile(cache_path):
+        try:
+            graph, meta = _load_cache(cache_path)
+            from_cache = True
+        except (OSError, ValueError, KeyError):
+            pass  # corrupt cache: fall through and rebuild
+    if not from_cache:
+        graph, meta = _compile_source(raw)
+        try:
+            _save_cache(cache_path, graph, meta)
+            # Only this building's caches: "rlh" must not match "rlh-annex-..."
+            stale = re.compile(rf"{re.escape(key)}-[0-9a-f]{{16}}\.npz")
+            for fname in os.listdir(cache_dir):
+                if stale.fullmatch(fname) and fname != os.path.basename(cache_path):
+                    os.remove(os.path.join(cache_dir, fname))
+        except OSError as exc:
+            print(f"[GRAPH] Could not write cache {cache_path}: {exc}")
+
+    return BuildingGraph(
+        name=meta["building"] or key.upper(),
+        floor=meta["floor"],
+        graph=graph,
+        rooms={name: _points(pos) for name, pos in meta["rooms"].items()},
+        passages=_points(meta["passages"]),
+        source_hash=digest,
+        from_cache=from_cache,
+    )
@@ -0,0 +1,172 @@
+# landmarks.py
+import os
+import time
+
+import numpy as np
+
+from helper_functions.pathfinding import dijkstra
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(BASE_DIR, ".cache", "alt")
+
+
+class LandmarkTable:
+    """
+    Dense ALT tables for one graph.
+    dist_from[i, v] = d(L_i, v) and dist_to[i, v] = d(v, L_i), both
+    landmarks x nodes float arrays. On symmetric graphs they are the same
+    array. Lower bound for d(u, t):
+        max_i max(d(L_i, t) - d(L_i, u), d(u, L_i) - d(t, L_i))
+    """
+
+    def __init__(self, landmarks, dist_from, dist_to=None):
+        self.landmarks = np.asarray(landmarks, dtype=np.int32)
+        self.dist_from = np.asarray(dist_from, dtype=np.float64)
+        self.dist_to = self.dist_from if dist_to is None else np.asarray(dist_to)
+        self.build_ms = 0.0
+        self.from_cache = False
+
+    @property
+    def symmetric(self):
+        return self.dist_to is self.dist_from
+
+    def _goal_columns(self, goal):
+        # A landmark that cannot reach the goal says nothing about it: -inf
+        # drops it from the first term, and NaN (inf - inf) is ignored by fmax.
+        f_goal = self.dist_from[:, goal].copy()
+        f_goal[np.isinf(f_goal)] = -np.inf
+        return f_goal, self.dist_to[:, goal].copy()
+
+    def bounds(self, nodes, goal):
+        """Vectorized lower bounds on d(u, goal) for an array of node ids."""
+        nodes = np.asarray(nodes, dtype=np.int64)
+        if not len(self.landmarks):
+            return np.zeros(len(nodes))
+        f_goal, t_goal = self._goal_columns(goal)
+        with np.errstate(invalid="ignore"):
+            fwd = f_goal[:, None] - self.dist_from[:, nodes]
+            bwd = self.dist_to[:, nodes] - t_goal[:, None]
+            best = np.fmax(np.fmax.reduce(fwd, axis=0), np.fmax.reduce(bwd, axis=0))
+        return np.fmax(best, 0.0)
+
+    def bound(self, u, goal):
+        return float(self.bounds([u], goal)[0])
+
+    def potential(self, goal):
+        """h(u) for a fixed goal; the goal columns are sliced once per query."""
+        if not len(self.landmarks):
+            return lambda u: 0.0
+        f_goal, t_goal = self._goal_columns(goal)
+        dist_from, dist_to = self.dist_from, self.dist_to
+        fmax = np.fmax.reduce
+
+        def h(u):
+            with np.errstate(invalid="ignore"):
+                best = fmax(np.fmax(f_goal - dist_from[:, u], dist_to[:, u] - t_goal))
+            return float(best) if best > 0.0 else 0.0
+
+        return h
+
+    def source_potential(self, source):
+        """h(v) bounding d(source, v) from below, for reverse searches."""
+        if not len(self.landmarks):
+            return lambda v: 0.0
+        # d(s, v) >= d(L, v) - d(L, s)  and  d(s, v) >= d(s, L) - d(v, L)
+        f_src = self.dist_from[:, source].copy()
+        t_src = self.dist_to[:, source].copy()
+        t_src[np.isinf(t_src)] = -np.inf
+        dist_from, dist_to = self.dist_from, self.dist_to
+        fmax = np.fmax.reduce
+
+        def h(v):
+            with np.errstate(invalid="ignore"):
+                best = fmax(np.fmax(dist_from[:, v] - f_src, t_src - dist_to[:, v]))
+            return float(best) if best > 0.0 else 0.0
+
+        return h
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp.npz"
+        arrays = {"landmarks": self.landmarks, "dist_from": self.dist_from}
+        if not self.symmetric:
+            arrays["dist_to"] = self.dist_to
+        np.savez(tmp, **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as z:
+            dist_to = z["dist_to"] if "dist_to" in z.files else None
+            return cls(z["landmarks"], z["dist_from"], dist_to)
+
+
+def select_landmarks(graph, count, seed_node=None):
+    """
+    Farthest-point landmark selection: start from the node farthest from
+    `seed_node` (default: the node closest to the centroid), then repeatedly
+    add the node whose shortest-path distance to the chosen set is largest.
+    Nodes without edges are never picked; an unreachable component is
+    preferred over everything else so each component gets a landmark.
+    """
+    degree = np.diff(graph.offsets_np) + np.diff(np.asarray(graph.rev_offsets))
+    candidates = degree > 0
+    if count <= 0 or not candidates.any():
+        return []
+    if seed_node is None:
+        coords = graph.coords
+        d_centroid = np.linalg.norm(coords - coords[candidates].mean(axis=0), axis=1)
+        d_centroid[~candidates] = np.inf
+        seed_node = int(np.argmin(d_centroid))
+
+    closest = np.array(dijkstra(graph, seed_node))  # distance to chosen set
+    landmarks = []
+    for _ in range(min(count, int(candidates.sum()))):
+        score = np.where(candidates, closest, -1.0)
+        score[landmarks] = -1.0
+        pick = int(np.argmax(score))
+        if score[pick] < 0:
+            break
+        landmarks.append(pick)
+        np.minimum(closest, dijkstra(graph, pick), out=closest)
+    return landmarks
+
+
+def build_landmark_table(graph, landmarks):
+    symmetric = graph.is_symmetric()
+    dist_from = np.array([dijkstra(graph, L) for L in landmarks]).reshape(
+        len(landmarks), graph.num_nodes
+    )
+    dist_to = None
+    if not symmetric:
+        dist_to = np.array([dijkstra(graph, L, reverse=True) for L in landmarks])
+        dist_to = dist_to.reshape(len(landmarks), graph.num_nodes)
+    return LandmarkTable(landmarks, dist_from, dist_to)
+
+
+def load_or_build_landmarks(graph, count=4, landmarks=None, cache_dir=CACHE_DIR):
+    """
+    ALT tables for `graph`, reused from <cache_dir>/<fingerprint>-<key>.npz
+    when the graph (including its current weights) is unchanged.
+    `landmarks` fixes the landmark node ids; otherwise `count` are selected.
+    """
+    t0 = time.perf_counter()
+    key = f"k{count}" if landmarks is None else "L" + "-".join(map(str, landmarks))
+    path = os.path.join(cache_dir, f"{graph.fingerprint()}-{key}.npz")
+    table = None
+    if os.path.isfile(path):
+        try:
+            table = LandmarkTable.load(path)
+            table.from_cache = True
+        except (OSError, ValueError, KeyError):
+            table = None
+    if table is None:
+        if landmarks is None:
+            landmarks = select_landmarks(graph, count)
+        table = build_landmark_table(graph, landmarks)
+        try:
+            table.save(path)
+        except OSError as exc:
+            print(f"[ALT] Could not write cache {path}: {exc}")
+    table.build_ms = (time.perf_counter() - t0) * 1000.0
+    return table
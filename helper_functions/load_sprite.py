@@ -1,12 +1,16 @@
 # load_sprite.py
+import hashlib
+import os
+
 import pygame
 from PIL import Image
 
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(BASE_DIR, ".cache", "sprites")
 
-def load_gif_frames(file_path, cell_size):
-    """
-    Loads a GIF and returns a list of Pygame surfaces scaled to cell_size.
-    """
+
+def _decode_gif(file_path):
+    # Every GIF frame as an RGBA pygame surface at its native size
     gif = Image.open(file_path)
     frames = []
 
@@ -15,10 +19,87 @@ def load_gif_frames(file_path, cell_size):
             frame = gif.copy()
             frame = frame.convert("RGBA")
             frame = pygame.image.fromstring(frame.tobytes(), frame.size, frame.mode)
-            frame = pygame.transform.scale(frame, (cell_size, cell_size))
             frames.append(frame)
             gif.seek(gif.tell() + 1)
     except EOFError:
         pass
 
     return frames
+
+
+def load_gif_frames(file_path, cell_size):
+    """
+    Loads a GIF and returns a list of Pygame surfaces scaled to cell_size.
+    """
+    return [
+        pygame.transform.scale(frame, (cell_size, cell_size))
+        for frame in _decode_gif(file_path)
+    ]
+
+
+class SpriteSheet:
+    """
+    Animated GIF sprite served at several square sizes (e.g. one per zoom level).
+    Each size is one horizontal atlas of all frames, saved as a PNG under
+    .cache/sprites/ keyed by the GIF's content hash and the size, so the GIF
+    is only decoded when a size is not cached yet. Atlases are converted to
+    the display format (convert_alpha) once a display exists; frames are
+    subsurfaces of their atlas.
+    """
+
+    def __init__(self, file_path, sizes=(50,), cache_dir=CACHE_DIR):
+        self.file_path = file_path
+        self.cache_dir = cache_dir
+        with open(file_path, "rb") as f:
+            self.digest = hashlib.sha256(f.read()).hexdigest()[:16]
+        self.sizes = sorted(sizes)
+        self.atlases = {}
+        self.from_cache = {}  # size -> loaded from the disk cache?
+        self._frames = {}
+        self._decoded = None
+        for size in self.sizes:
+            self._load(size)
+
+    def _cache_path(self, size):
+        return os.path.join(self.cache_dir, f"{self.digest}-{size}.png")
+
+    def _build(self, size):
+        if self._decoded is None:
+            self._decoded = _decode_gif(self.file_path)
+        atlas = pygame.Surface((size * len(self._decoded), size), pygame.SRCALPHA)
+        for i, frame in enumerate(self._decoded):
+            atlas.blit(pygame.transform.scale(frame, (size, size)), (i * size, 0))
+        return atlas
+
+    def _load(self, size):
+        path = self._cache_path(size)
+        self.from_cache[size] = os.path.exists(path)
+        if self.from_cache[size]:
+            atlas = pygame.image.load(path)
+        else:
+            atlas = self._build(size)
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp = path + ".tmp.png"
+                pygame.image.save(atlas, tmp)
+                os.replace(tmp, path)  # atomic, like the graph cache
+            except (OSError, pygame.error) as exc:
+                print(f"[SPRITE] Could not write cache {path}: {exc}")
+        if pygame.display.get_surface():
+            atlas = atlas.convert_alpha()
+        self.atlases[size] = atlas
+        self._frames[size] = [
+            atlas.subsurface((i * size, 0, size, size))
+            for i in range(atlas.get_width() // size)
+        ]
+        if size not in self.sizes:
+            self.sizes = sorted(self.sizes + [size])
+
+    def frames(self, size):
+        """Frame surfaces at `size` x `size` (built and cached on first use)."""
+        if size not in self._frames:
+            self._load(size)
+        return self._frames[size]
+
+    def nearest_size(self, size):
+        return min(self.sizes, key=lambda s: abs(s - size))
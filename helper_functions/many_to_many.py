@@ -0,0 +1,180 @@
+# many_to_many.py
+import heapq
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from helper_functions.pathfinding import INF
+
+
+class DijkstraWorkspace:
+    """
+    Reusable single-source search state for one graph.
+    The distance list is allocated once; after each run only the entries
+    that were touched are reset, so k sources cost k searches, not k
+    allocations of size N.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.dist = [INF] * graph.num_nodes
+        self.touched = []
+
+    def run(self, source, targets):
+        """Distances from source to each node in `targets` (list of ids).
+        Stops as soon as every target is settled."""
+        g = self.graph
+        offsets, edge_targets, weights = g.offsets, g.targets, g.weights
+        dist, touched = self.dist, self.touched
+        for v in touched:
+            dist[v] = INF
+        touched.clear()
+
+        remaining = set(targets)
+        dist[source] = 0.0
+        touched.append(source)
+        pq = [(0.0, source)]
+        while pq and remaining:
+            d, u = heapq.heappop(pq)
+            if d != dist[u]:
+                continue
+            remaining.discard(u)
+            for e in range(offsets[u], offsets[u + 1]):
+                v = edge_targets[e]
+                nd = d + weights[e]
+                if nd < dist[v]:
+                    if dist[v] == INF:
+                        touched.append(v)
+                    dist[v] = nd
+                    heapq.heappush(pq, (nd, v))
+        return [dist[t] for t in targets]
+
+
+# Per-process workspace for the pool (set by _init_worker)
+_worker_workspace = None
+
+
+def _init_worker(graph):
+    global _worker_workspace
+    _worker_workspace = DijkstraWorkspace(graph)
+
+
+def _worker_rows(sources, targets):
+    return [_worker_workspace.run(s, targets) for s in sources]
+
+
+def distance_matrix(graph, sources, targets=None, processes=None):
+    """
+    Dense (len(sources), len(targets)) float matrix of shortest path
+    distances (inf if unreachable). `targets` defaults to `sources`.
+    With processes > 1 the sources are split across a process pool; each
+    worker keeps its own workspace.
+    """
+    sources = list(sources)
+    targets = sources if targets is None else list(targets)
+    matrix = np.full((len(sources), len(targets)), INF)
+    if not sources or not targets:
+        return matrix
+
+    if processes and processes > 1 and len(sources) > 1:
+        size = -(-len(sources) // processes)
+        chunks = [sources[i : i + size] for i in range(0, len(sources), size)]
+        with ProcessPoolExecutor(
+            max_workers=len(chunks), initializer=_init_worker, initargs=(graph,)
+        ) as pool:
+            futures = [pool.submit(_worker_rows, chunk, targets) for chunk in chunks]
+            rows = [row for f in futures for row in f.result()]
+    else:
+        workspace = DijkstraWorkspace(graph)
+        rows = [workspace.run(s, targets) for s in sources]
+    matrix[:] = rows
+    return matrix
+
+
+# -----------------------------
+# Multi-stop ordering
+# -----------------------------
+def tour_cost(matrix, order, return_to_start=False):
+    cost = sum(matrix[a, b] for a, b in zip(order, order[1:]))
+    if return_to_start and len(order) > 1:
+        cost += matrix[order[-1], order[0]]
+    return float(cost)
+
+
+def _held_karp(matrix, start, stops, return_to_start):
+    # Exact DP over subsets: best[(mask, last)] = (cost, previous stop)
+    k = len(stops)
+    best = {(1 << i, i): (matrix[start, stops[i]], -1) for i in range(k)}
+    for size in range(2, k + 1):
+        for subset in itertools.combinations(range(k), size):
+            mask = sum(1 << i for i in subset)
+            for last in subset:
+                prev_mask = mask & ~(1 << last)
+                best[(mask, last)] = min(
+                    (best[(prev_mask, p)][0] + matrix[stops[p], stops[last]], p)
+                    for p in subset
+                    if p != last
+                )
+    full = (1 << k) - 1
+    last = min(
+        range(k),
+        key=lambda i: best[(full, i)][0]
+        + (matrix[stops[i], start] if return_to_start else 0.0),
+    )
+    order, mask = [], full
+    while last != -1:
+        order.append(stops[last])
+        mask, last = mask & ~(1 << last), best[(mask, last)][1]
+    return [start] + order[::-1]
+
+
+def _nearest_neighbour_2opt(matrix, start, stops, return_to_start):
+    order = [start]
+    left = set(stops)
+    while left:
+        nxt = min(left, key=lambda j: matrix[order[-1], j])
+        order.append(nxt)
+        left.remove(nxt)
+
+    # 2-opt: reverse order[i..j] while that shortens the tour (start stays
+    # first). Segment costs are accumulated in both directions as j grows,
+    # so asymmetric matrices are handled and each pass is O(k^2).
+    n = len(order)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, n - 1):
+            fwd_seg = rev_seg = 0.0
+            for j in range(i + 1, n):
+                fwd_seg += matrix[order[j - 1], order[j]]
+                rev_seg += matrix[order[j], order[j - 1]]
+                nxt = order[j + 1] if j + 1 < n else (start if return_to_start else None)
+                before = matrix[order[i - 1], order[i]] + fwd_seg
+                after = matrix[order[i - 1], order[j]] + rev_seg
+                if nxt is not None:
+                    before += matrix[order[j], nxt]
+                    after += matrix[order[i], nxt]
+                if after + 1e-9 < before:
+                    order[i : j + 1] = order[i : j + 1][::-1]
+                    improved = True
+                    break
+            if improved:
+                break
+    return order
+
+
+def order_stops(matrix, start=0, stops=None, return_to_start=False, exact_limit=9):
+    """
+    Visiting order over matrix indices, beginning at `start`.
+    Exact (Held-Karp) for up to `exact_limit` stops, otherwise nearest
+    neighbour followed by 2-opt improvement.
+    """
+    if stops is None:
+        stops = [i for i in range(len(matrix)) if i != start]
+    stops = [s for s in stops if s != start]
+    if not stops:
+        return [start]
+    if len(stops) <= exact_limit:
+        return _held_karp(matrix, start, stops, return_to_start)
+    return _nearest_neighbour_2opt(matrix, start, stops, return_to_start)
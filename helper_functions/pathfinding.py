@@ -0,0 +1,184 @@
+# pathfinding.py
+import heapq
+import time
+from dataclasses import dataclass
+
+INF = float("inf")
+
+
+@dataclass
+class SearchStats:
+    """Counters for a single search query (shown in the HUD and used by tests)."""
+
+    expansions: int = 0
+    pushes: int = 0
+    elapsed_ms: float = 0.0
+    mode: str = ""
+    cached: bool = False  # served from the route cache
+
+
+def reconstruct_path(came_from, start, goal):
+    # Walk parent pointers back from the goal
+    path = [goal]
+    node = goal
+    while node != start:
+        node = came_from[node]
+        path.append(node)
+    path.reverse()
+    return path
+
+
+def astar_search(graph, start, goal, heuristic):
+    """
+    A* on a CompiledGraph with a binary heap (lazy deletion) and a closed set.
+    `start`/`goal` are node ids and `heuristic(u)` estimates the remaining
+    distance from u to `goal`. The heuristic must be consistent (Euclid and
+    ALT both are), so a node is never re-expanded once closed.
+    Returns (list of node ids or None, SearchStats).
+    """
+    stats = SearchStats()
+    t0 = time.perf_counter()
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+
+    g = {start: 0.0}
+    came_from = {}
+    closed = set()
+    counter = 0  # tie-breaker so equal f values pop in insertion order
+    open_heap = [(heuristic(start), counter, start)]
+    stats.pushes = 1
+
+    path = None
+    while open_heap:
+        _, _, current = heapq.heappop(open_heap)
+        if current in closed:
+            continue  # stale entry left behind by a decrease-key
+        closed.add(current)
+        stats.expansions += 1
+
+        if current == goal:
+            path = reconstruct_path(came_from, start, goal)
+            break
+
+        g_cur = g[current]
+        for e in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[e]
+            if neighbor in closed:
+                continue
+            tentative_g = g_cur + weights[e]
+            if tentative_g < g.get(neighbor, INF):
+                came_from[neighbor] = current
+                g[neighbor] = tentative_g
+                counter += 1
+                heapq.heappush(
+                    open_heap,
+                    (tentative_g + heuristic(neighbor), counter, neighbor),
+                )
+                stats.pushes += 1
+
+    stats.elapsed_ms = (time.perf_counter() - t0) * 1000.0
+    return path, stats
+
+
+def dijkstra(graph, source, reverse=False):
+    """
+    Single-source shortest path distances from `source` (node id).
+    With reverse=True, follows edges backwards (distances *to* source).
+    Returns a list indexed by node id; unreachable nodes are inf.
+    """
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    if reverse:
+        offsets, targets = graph.rev_offsets, graph.rev_sources
+        edge_ids = graph.rev_edges
+    dist = [INF] * graph.num_nodes
+    dist[source] = 0.0
+    pq = [(0.0, source)]
+    while pq:
+        d, u = heapq.heappop(pq)
+        if d != dist[u]:
+            continue
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            nd = d + weights[edge_ids[e] if reverse else e]
+            if nd < dist[v]:
+                dist[v] = nd
+                heapq.heappush(pq, (nd, v))
+    return dist
+
+
+def bidirectional_search(graph, start, goal, to_goal=None, from_start=None):
+    """
+    Bidirectional A* on a CompiledGraph; plain bidirectional Dijkstra when no
+    potentials are given. `to_goal(v)` bounds d(v, goal) and `from_start(v)`
+    bounds d(start, v); both must be consistent.
+    Uses the average potential p(v) = (to_goal(v) - from_start(v)) / 2 for
+    the forward side and -p(v) for the backward side, so both searches see
+    the same non-negative reduced costs and can stop as soon as
+    top_forward + top_backward >= best path length found so far.
+    Returns (list of node ids or None, SearchStats).
+    """
+    stats = SearchStats()
+    t0 = time.perf_counter()
+    use_potential = to_goal is not None and from_start is not None
+
+    # Index 0 = forward from start, 1 = backward from goal
+    adjacency = (
+        (graph.offsets, graph.targets, None),
+        (graph.rev_offsets, graph.rev_sources, graph.rev_edges),
+    )
+    sign = (1.0, -1.0)
+    weights = graph.weights
+    g = ({start: 0.0}, {goal: 0.0})
+    parent = ({}, {})
+    closed = (set(), set())
+    p_cache = {}
+
+    def p(v):
+        val = p_cache.get(v)
+        if val is None:
+            val = (to_goal(v) - from_start(v)) / 2.0 if use_potential else 0.0
+            p_cache[v] = val
+        return val
+
+    heaps = ([(p(start), 0, start)], [(-p(goal), 0, goal)])
+    stats.pushes = 2
+    counter = 0
+    best, meet = INF, None
+    if start == goal:
+        best, meet = 0.0, start
+
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        _, _, u = heapq.heappop(heaps[side])
+        if u in closed[side]:
+            continue
+        closed[side].add(u)
+        stats.expansions += 1
+
+        offsets, targets, edge_ids = adjacency[side]
+        g_side, g_other = g[side], g[side ^ 1]
+        g_u = g_side[u]
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            if v in closed[side]:
+                continue
+            nd = g_u + weights[e if edge_ids is None else edge_ids[e]]
+            if nd < g_side.get(v, INF):
+                g_side[v] = nd
+                parent[side][v] = u
+                counter += 1
+                heapq.heappush(heaps[side], (nd + sign[side] * p(v), counter, v))
+                stats.pushes += 1
+                if v in g_other and nd + g_other[v] < best:
+                    best, meet = nd + g_other[v], v
+
+    path = None
+    if meet is not None:
+        fwd = reconstruct_path(parent[0], start, meet)
+        bwd = [meet]
+        while bwd[-1] != goal:
+            bwd.append(parent[1][bwd[-1]])
+        path = fwd + bwd[1:]
+    stats.elapsed_ms = (time.perf_counter() - t0) * 1000.0
+    return path, stats
@@ -0,0 +1,173 @@
+# position_store.py
+import threading
+import time
+from array import array
+
+FIELDS = ("t", "lat", "lon", "accuracy")  # one ring-buffer record
+NO_ACCURACY = -1.0  # stored when the sender did not report accuracy
+
+
+def _fix(device, record):
+    t, lat, lon, accuracy = record
+    return {
+        "device": device,
+        "t": t,
+        "lat": lat,
+        "lon": lon,
+        "accuracy": None if accuracy == NO_ACCURACY else accuracy,
+    }
+
+
+class DeviceTrack:
+    """
+    Last `capacity` fixes of one device in a preallocated array of doubles
+    (FIELDS per record), used as a ring buffer: memory stays fixed no matter
+    how long the device keeps sending. Records are kept in timestamp order;
+    a late fix is slotted in behind the newer ones already stored, and a
+    resent one (same timestamp as a stored fix) is ignored.
+    """
+
+    __slots__ = ("device", "capacity", "data", "head", "count", "lock")
+
+    def __init__(self, device, capacity):
+        self.device = device
+        self.capacity = capacity
+        self.data = array("d", bytes(8 * len(FIELDS) * capacity))
+        self.head = 0  # slot the next fix goes into
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def _slot(self, k):
+        # Offset of the k-th oldest record in `data`
+        return (self.head - self.count + k) % self.capacity * len(FIELDS)
+
+    def _insert(self, record):
+        # Caller holds the lock. True if the record became the newest one.
+        n = len(FIELDS)
+        k = self.count
+        while k > 0 and self.data[self._slot(k - 1)] > record[0]:
+            k -= 1
+        if k > 0 and self.data[self._slot(k - 1)] == record[0]:
+            return False  # already stored, e.g. a retried batch
+        if self.count == self.capacity:
+            if k == 0:
+                return False  # older than everything kept
+            self.count -= 1  # drop the oldest
+            k -= 1
+        for j in range(self.count, k, -1):  # shift newer records up one slot
+            dst, src = self._slot(j), self._slot(j - 1)
+            self.data[dst : dst + n] = self.data[src : src + n]
+        i = self._slot(k)
+        self.data[i : i + n] = array("d", record)
+        self.head = (self.head + 1) % self.capacity
+        self.count += 1
+        return k == self.count - 1
+
+    def push(self, t, lat, lon, accuracy):
+        return self.extend([(t, lat, lon, accuracy)])
+
+    def extend(self, records):
+        """Insert (t, lat, lon, accuracy) records under a single lock.
+        Returns True if the device's latest fix changed."""
+        latest = False
+        with self.lock:
+            for record in records:
+                latest |= self._insert(record)
+        return latest
+
+    def latest(self):
+        n = len(FIELDS)
+        with self.lock:
+            if not self.count:
+                return None
+            i = (self.head - 1) % self.capacity * n
+            return _fix(self.device, self.data[i : i + n])
+
+    def track(self, limit=None):
+        """Up to `limit` most recent fixes, oldest first."""
+        n = len(FIELDS)
+        with self.lock:
+            count = self.count if limit is None else max(min(limit, self.count), 0)
+            start = (self.head - count) % self.capacity
+            if start + count <= self.capacity:
+                records = self.data[start * n : (start + count) * n]
+            else:
+                records = self.data[start * n :] + self.data[: self.head * n]
+        return [
+            _fix(self.device, records[i : i + n]) for i in range(0, len(records), n)
+        ]
+
+
+class PositionStore:
+    """
+    Latest fix and recent track per device id, safe to update from many
+    request threads at once. Each device has its own lock, so devices never
+    wait on each other; the store-wide lock is only taken to add a device.
+    """
+
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self._devices = {}
+        self._lock = threading.Lock()
+        self._newest_lock = threading.Lock()
+        self.newest = None  # fix with the latest timestamp from any device
+
+    def _track(self, device):
+        track = self._devices.get(device)
+        if track is None:
+            with self._lock:
+                track = self._devices.setdefault(
+                    device, DeviceTrack(device, self.capacity)
+                )
+        return track
+
+    def _advance_newest(self, fix):
+        with self._newest_lock:
+            if self.newest is None or fix["t"] >= self.newest["t"]:
+                self.newest = fix
+
+    def update(self, device, lat, lon, t=None, accuracy=None):
+        """Record a fix and return it as a dict. A fix older than what is
+        already stored goes into the track but does not become the latest."""
+        t = time.time() if t is None else float(t)
+        accuracy = NO_ACCURACY if accuracy is None else float(accuracy)
+        fix = _fix(device, (t, float(lat), float(lon), accuracy))
+        if self._track(device).push(t, float(lat), float(lon), accuracy):
+            self._advance_newest(fix)
+        return fix
+
+    def extend(self, device, records):
+        """
+        Record many (t, lat, lon, accuracy) fixes of one device at once.
+        Batches may arrive late or out of order: each fix is merged into the
+        track by timestamp. Returns the device's latest fix if this batch
+        advanced it, else None (including for an empty batch).
+        """
+        records = sorted(
+            (t, lat, lon, NO_ACCURACY if accuracy is None else accuracy)
+            for t, lat, lon, accuracy in records
+        )
+        if not records or not self._track(device).extend(records):
+            return None
+        fix = self.latest(device)
+        self._advance_newest(fix)
+        return fix
+
+    def latest(self, device):
+        track = self._devices.get(device)
+        return track.latest() if track else None
+
+    def all_latest(self):
+        """{device: latest fix} for every known device."""
+        devices = list(self._devices.items())
+        return {device: track.latest() for device, track in devices}
+
+    def track(self, device, limit=None):
+        track = self._devices.get(device)
+        return track.track(limit) if track else None
+
+    def devices(self):
+        return sorted(self._devices)
+
+    def __len__(self):
+        return len(self._devices)
@@ -0,0 +1,240 @@
+# render_cache.py
+import math
+import os
+from collections import OrderedDict
+
+import pygame
+
+
+class FloorView:
+    """
+    Fit-to-screen floor plan (cover: fills the window, keeps aspect ratio).
+    The resampled surface and the floor -> screen transform are built once
+    per (image, window size) and reused until either changes, so drawing the
+    floor is a single blit per frame.
+    """
+
+    def __init__(self):
+        self.images = {}  # path -> loaded floor image
+        self.image = None
+        self.size = None
+        self.surface = None
+        self.scale = 1.0
+        self.offset = (0, 0)
+        self.rebuilds = 0
+
+    def load(self, path):
+        """Floor image for `path`, loaded from disk only the first time."""
+        img = self.images.get(path)
+        if img is None:
+            img = pygame.image.load(path)
+            self.images[path] = img
+        return img
+
+    def fit(self, image, size):
+        """Fitted surface for `image` in a window of `size`; rebuilt on change."""
+        if image is not self.image or tuple(size) != self.size:
+            self._rebuild(image, tuple(size))
+        return self.surface
+
+    def _rebuild(self, image, size):
+        win_w, win_h = size
+        orig_w, orig_h = image.get_size()
+        self.scale = max(win_w / orig_w, win_h / orig_h)
+        target = (int(orig_w * self.scale), int(orig_h * self.scale))
+        if image.get_bitsize() in (24, 32):
+            self.surface = pygame.transform.smoothscale(image, target)
+        else:
+            self.surface = pygame.transform.scale(image, target)
+        self.offset = (
+            (win_w - self.surface.get_width()) // 2,
+            (win_h - self.surface.get_height()) // 2,
+        )
+        self.image, self.size = image, size
+        self.rebuilds += 1
+
+    def to_screen(self, x, y):
+        return int(x * self.scale + self.offset[0]), int(y * self.scale + self.offset[1])
+
+
+class StampCache:
+    """
+    Small pre-rendered SRCALPHA sprites (glow dots, radar rings) keyed by
+    their shape and colour. Effects are blitted only over their own bounding
+    box instead of through a window-sized alpha surface, so their cost scales
+    with the area on screen, not with the number of markers.
+    Bounded LRU; a pulsing glow only ever needs a few dozen distinct stamps.
+    """
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self.stamps = OrderedDict()
+
+    def _get(self, key, build):
+        stamp = self.stamps.get(key)
+        if stamp is None:
+            stamp = build()
+            self.stamps[key] = stamp
+            while len(self.stamps) > self.maxsize:
+                self.stamps.popitem(last=False)
+        else:
+            self.stamps.move_to_end(key)
+        return stamp
+
+    def circle(self, color, radius, width=0):
+        def build():
+            size = 2 * radius + 2
+            stamp = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.circle(stamp, color, (radius, radius), radius, width)
+            return stamp
+
+        return self._get(("circle", tuple(color), radius, width), build)
+
+    def blit_circle(self, screen, color, center, radius, width=0):
+        """Same pixels as drawing the circle on a full-screen alpha layer."""
+        stamp = self.circle(color, radius, width)
+        return screen.blit(stamp, (center[0] - radius, center[1] - radius))
+
+    def panel(self, size, color, border_radius=0):
+        """Filled (rounded) rectangle, e.g. a translucent HUD background."""
+
+        def build():
+            stamp = pygame.Surface(size, pygame.SRCALPHA)
+            pygame.draw.rect(stamp, color, stamp.get_rect(), border_radius=border_radius)
+            return stamp
+
+        return self._get(("panel", tuple(size), tuple(color), border_radius), build)
+
+    def __len__(self):
+        return len(self.stamps)
+
+
+def blit_alpha_polygon(screen, color, points, width=0):
+    """Alpha-blended polygon drawn through a layer the size of its bounding box."""
+    xs = [int(math.floor(x)) for x, _ in points]
+    ys = [int(math.floor(y)) for _, y in points]
+    left, top = min(xs) - 1, min(ys) - 1
+    layer = pygame.Surface(
+        (max(xs) - left + 3, max(ys) - top + 3), pygame.SRCALPHA
+    )
+    pygame.draw.polygon(layer, color, [(x - left, y - top) for x, y in points], width)
+    return screen.blit(layer, (left, top))
+
+
+def apply_tint(screen, color, flags=pygame.BLEND_RGBA_ADD):
+    # fill() with a blend flag applies the tint in place, no overlay surface
+    screen.fill(color, special_flags=flags)
+
+
+class TextCache:
+    """
+    Font registry plus a bounded LRU of rendered text surfaces keyed by
+    (text, font, colour, outline). Fonts are created once per (name, size);
+    `name` is None for pygame's default font, a path to a font file, or a
+    system font name (looked up with SysFont, which scans the system fonts).
+    Labels and HUD lines are therefore only re-rendered when their text changes.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, name, size):
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            if name is None or os.path.isfile(name):
+                font = pygame.font.Font(name, size)
+            else:
+                font = pygame.font.SysFont(name, size)
+            self.fonts[key] = font
+        return font
+
+    def render(self, text, name, size, color, outline=None):
+        """
+        Antialiased text surface. With `outline` (a colour) the text is
+        stamped over two copies offset by (-1, -1) and (+1, +1); the result
+        is 2px larger and its text origin is at (1, 1).
+        """
+        key = (text, name, size, tuple(color), outline and tuple(outline))
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surf
+        self.misses += 1
+        font = self.font(name, size)
+        surf = font.render(text, True, color)
+        if outline:
+            shadow = font.render(text, True, outline)
+            w, h = surf.get_size()
+            framed = pygame.Surface((w + 2, h + 2), pygame.SRCALPHA)
+            framed.blit(shadow, (0, 0))
+            framed.blit(shadow, (2, 2))
+            framed.blit(surf, (1, 1))
+            surf = framed
+        self.surfaces[key] = surf
+        while len(self.surfaces) > self.maxsize:
+            self.surfaces.popitem(last=False)
+        return surf
+
+    def __len__(self):
+        return len(self.surfaces)
+
+
+class DirtyRects:
+    """
+    Optional dirty-rectangle presenter. Each frame the caller passes a key
+    describing the static layer (scene, pan, zoom, window size, drawn route...).
+    When the key changes, `begin` returns True: the caller redraws the static
+    layer and calls `capture`, and the frame is presented with a full flip.
+    Otherwise only last frame's moving elements are restored from the captured
+    background, and `present` pushes just the rects recorded with `add` (this
+    frame's and last frame's) via pygame.display.update.
+    Disabled, `begin` always returns True and `present` always flips.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.key = None
+        self.background = None
+        self.rects = []
+        self.previous = []
+        self.full = True
+        self.full_redraws = 0
+
+    def begin(self, screen, key):
+        self.rects = []
+        self.full = (
+            not self.enabled
+            or key != self.key
+            or self.background is None
+            or self.background.get_size() != screen.get_size()
+        )
+        if self.full:
+            self.key = key
+            self.full_redraws += 1
+            return True
+        for rect in self.previous:
+            screen.blit(self.background, rect, rect)
+        return False
+
+    def capture(self, screen):
+        if self.enabled:
+            self.background = screen.copy()
+
+    def add(self, rect):
+        """Record a rect drawn this frame (the Rect returned by blit/draw)."""
+        if self.enabled and rect:
+            self.rects.append(pygame.Rect(rect))
+        return rect
+
+    def present(self):
+        if self.full:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.previous + self.rects)
+        self.previous = self.rects
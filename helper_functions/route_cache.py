@@ -0,0 +1,53 @@
+# route_cache.py
+from collections import OrderedDict
+
+
+class RouteCache:
+    """
+    Bounded LRU cache for route queries.
+    Keys are (start, goal, mode, graph_version). Passing a newer graph
+    version to `get`/`put` drops every entry computed for an older one, so
+    closing a hallway or changing a weight can never serve a stale route.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+
+    def _check_version(self, version):
+        if version != self.version:
+            self.entries.clear()
+            self.version = version
+
+    def get(self, start, goal, mode, version):
+        """Cached value or None (counts a hit or a miss)."""
+        self._check_version(version)
+        key = (start, goal, mode)
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, start, goal, mode, version, value):
+        self._check_version(version)
+        key = (start, goal, mode)
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
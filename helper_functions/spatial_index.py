@@ -0,0 +1,98 @@
+# spatial_index.py
+import math
+
+
+def _ring_cells(qx, qy, ring):
+    # Cells at Chebyshev distance exactly `ring` from (qx, qy)
+    if ring == 0:
+        yield qx, qy
+        return
+    for cx in range(qx - ring, qx + ring + 1):
+        yield cx, qy - ring
+        yield cx, qy + ring
+    for cy in range(qy - ring + 1, qy + ring):
+        yield qx - ring, cy
+        yield qx + ring, cy
+
+
+class GridIndex:
+    """
+    Uniform grid over 2D points for nearest-point and radius queries.
+    `items` is an iterable of (key, (x, y)); a key may appear several times
+    (e.g. a room with more than one marker). Queries only visit the cells
+    around the query point, so they stay fast with thousands of points.
+    """
+
+    def __init__(self, items, cell_size=None):
+        self.keys = []
+        self.points = []
+        for key, (x, y) in items:
+            self.keys.append(key)
+            self.points.append((float(x), float(y)))
+        self.cell_size = cell_size or self._auto_cell_size()
+        self.cells = {}
+        for i, (x, y) in enumerate(self.points):
+            self.cells.setdefault(self._cell(x, y), []).append(i)
+        if self.cells:
+            cxs = [c[0] for c in self.cells]
+            cys = [c[1] for c in self.cells]
+            self._bounds = (min(cxs), min(cys), max(cxs), max(cys))
+
+    def _auto_cell_size(self):
+        # Aim for about two points per occupied cell
+        if len(self.points) < 2:
+            return 64.0
+        xs = [p[0] for p in self.points]
+        ys = [p[1] for p in self.points]
+        area = max(max(xs) - min(xs), 1.0) * max(max(ys) - min(ys), 1.0)
+        return max(math.sqrt(2.0 * area / len(self.points)), 1.0)
+
+    def _cell(self, x, y):
+        return int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))
+
+    def __len__(self):
+        return len(self.points)
+
+    def within(self, x, y, radius):
+        """[(distance, key), ...] for every point within `radius`, nearest first."""
+        cx0, cy0 = self._cell(x - radius, y - radius)
+        cx1, cy1 = self._cell(x + radius, y + radius)
+        hits = []
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                for i in self.cells.get((cx, cy), ()):
+                    px, py = self.points[i]
+                    d = math.hypot(px - x, py - y)
+                    if d <= radius:
+                        hits.append((d, self.keys[i]))
+        hits.sort(key=lambda h: h[0])
+        return hits
+
+    def nearest(self, x, y, max_radius=math.inf):
+        """(key, distance) of the closest point, or None if none is within
+        `max_radius`. Searches rings of cells outwards from the query cell."""
+        if not self.cells:
+            return None
+        qx, qy = self._cell(x, y)
+        min_cx, min_cy, max_cx, max_cy = self._bounds
+        # Rings beyond this cannot contain any point
+        max_ring = max(
+            abs(qx - min_cx), abs(qx - max_cx), abs(qy - min_cy), abs(qy - max_cy)
+        )
+        best_d, best_i = math.inf, -1
+        # Rings closer than the occupied bounding box are empty: skip them
+        ring = max(min_cx - qx, qx - max_cx, min_cy - qy, qy - max_cy, 0)
+        while ring <= max_ring:
+            # Closest a point in this ring can be to the query point
+            if (ring - 1) * self.cell_size > min(best_d, max_radius):
+                break
+            for cell in _ring_cells(qx, qy, ring):
+                for i in self.cells.get(cell, ()):
+                    px, py = self.points[i]
+                    d = math.hypot(px - x, py - y)
+                    if d < best_d:
+                        best_d, best_i = d, i
+            ring += 1
+        if best_i < 0 or best_d > max_radius:
+            return None
+        return self.keys[best_i], best_d
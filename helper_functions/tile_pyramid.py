@@ -0,0 +1,164 @@
+# tile_pyramid.py
+import hashlib
+import json
+import math
+import os
+from collections import OrderedDict
+
+import pygame
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(BASE_DIR, ".cache", "tiles")
+
+VARIANTS = ("map", "pixel")
+
+
+def _pixelate(image, factor):
+    # Same look as the old per-frame pixel mode: shrink, then blow back up
+    w, h = image.get_size()
+    small = pygame.transform.scale(image, (max(w // factor, 1), max(h // factor, 1)))
+    return pygame.transform.scale(small, (w, h))
+
+
+def _half(image, variant):
+    w, h = image.get_size()
+    size = (max((w + 1) // 2, 1), max((h + 1) // 2, 1))
+    if variant == "pixel" or image.get_bitsize() not in (24, 32):
+        return pygame.transform.scale(image, size)  # keep hard pixel edges
+    return pygame.transform.smoothscale(image, size)
+
+
+class TilePyramid:
+    """
+    Map image cut into `tile_size` tiles at power-of-two zoom levels
+    (level 0 = full resolution, each next level half the size), for the
+    normal map and a pre-pixelated variant. Tiles are written to
+    .cache/tiles/<hash>/ once, keyed by the image contents, and loaded from
+    there lazily; `draw` blits only the tiles that intersect the screen,
+    taken from the level closest to the requested zoom. Loaded and rescaled
+    tiles are kept in a bounded LRU.
+    """
+
+    def __init__(
+        self, path, tile_size=256, cache_dir=CACHE_DIR, pixelate=6, max_tiles=256
+    ):
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read())
+        digest.update(f"{tile_size}:{pixelate}".encode())
+        self.key = digest.hexdigest()[:16]
+        self.root = os.path.join(cache_dir, self.key)
+        self.tile_size = tile_size
+        self.max_tiles = max_tiles
+        self.tiles = OrderedDict()
+        self.loads = 0  # tiles read from disk
+
+        manifest = os.path.join(self.root, "pyramid.json")
+        self.from_cache = os.path.exists(manifest)
+        if not self.from_cache:
+            self._build(path, pixelate, manifest)
+        with open(manifest) as f:
+            meta = json.load(f)
+        self.levels = [tuple(size) for size in meta["levels"]]
+        self.size = self.levels[0]
+
+    # -----------------------------
+    # Preprocessing
+    # -----------------------------
+    def _tile_path(self, variant, level, tx, ty):
+        return os.path.join(self.root, variant, str(level), f"{tx}_{ty}.png")
+
+    def _build(self, path, pixelate, manifest):
+        image = pygame.image.load(path)
+        levels = []
+        for variant in VARIANTS:
+            img = _pixelate(image, pixelate) if variant == "pixel" else image
+            level = 0
+            while True:
+                w, h = img.get_size()
+                if variant == VARIANTS[0]:
+                    levels.append((w, h))
+                os.makedirs(os.path.join(self.root, variant, str(level)), exist_ok=True)
+                t = self.tile_size
+                for ty in range(-(-h // t)):
+                    for tx in range(-(-w // t)):
+                        rect = pygame.Rect(tx * t, ty * t, t, t).clip(0, 0, w, h)
+                        out = self._tile_path(variant, level, tx, ty)
+                        pygame.image.save(img.subsurface(rect), out)
+                if w <= t and h <= t:
+                    break
+                img = _half(img, variant)
+                level += 1
+        tmp = manifest + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"tile_size": self.tile_size, "levels": levels}, f)
+        os.replace(tmp, manifest)  # written last: a partial build is redone
+
+    # -----------------------------
+    # Rendering
+    # -----------------------------
+    def level_for(self, zoom):
+        """Smallest level that still has at least `zoom` pixels per map pixel."""
+        if zoom >= 1.0:
+            return 0
+        return min(int(math.floor(math.log2(1.0 / zoom))), len(self.levels) - 1)
+
+    def _cached(self, key, build):
+        surf = self.tiles.get(key)
+        if surf is None:
+            surf = build()
+            self.tiles[key] = surf
+            while len(self.tiles) > self.max_tiles:
+                self.tiles.popitem(last=False)
+        else:
+            self.tiles.move_to_end(key)
+        return surf
+
+    def _raw_tile(self, variant, level, tx, ty):
+        def load():
+            surf = pygame.image.load(self._tile_path(variant, level, tx, ty))
+            self.loads += 1
+            return surf.convert() if pygame.display.get_surface() else surf
+
+        return self._cached((variant, level, tx, ty, None), load)
+
+    def tile(self, variant, level, tx, ty, size):
+        """Tile surface scaled to `size` (cached until evicted)."""
+        raw = self._raw_tile(variant, level, tx, ty)
+        if raw.get_size() == size:
+            return raw
+
+        def rescale():
+            if variant == "pixel" or raw.get_bitsize() not in (24, 32):
+                return pygame.transform.scale(raw, size)
+            return pygame.transform.smoothscale(raw, size)
+
+        return self._cached((variant, level, tx, ty, size), rescale)
+
+    def draw(self, screen, zoom, offset, variant="map"):
+        """
+        Blit the visible part of the map with map pixel (x, y) at screen
+        (x * zoom + offset[0], y * zoom + offset[1]). Returns the tile count.
+        """
+        level = self.level_for(zoom)
+        lw, lh = self.levels[level]
+        sx, sy = zoom * self.size[0] / lw, zoom * self.size[1] / lh
+        ox, oy = offset
+        sw, sh = screen.get_size()
+        t = self.tile_size
+        tx0 = max(int((0 - ox) // (t * sx)), 0)
+        ty0 = max(int((0 - oy) // (t * sy)), 0)
+        tx1 = min(int((sw - ox) // (t * sx)), -(-lw // t) - 1)
+        ty1 = min(int((sh - oy) // (t * sy)), -(-lh // t) - 1)
+        drawn = 0
+        for ty in range(ty0, ty1 + 1):
+            y0 = round(oy + ty * t * sy)
+            y1 = round(oy + min((ty + 1) * t, lh) * sy)
+            for tx in range(tx0, tx1 + 1):
+                x0 = round(ox + tx * t * sx)
+                x1 = round(ox + min((tx + 1) * t, lw) * sx)
+                if x1 <= x0 or y1 <= y0:
+                    continue
+                tile = self.tile(variant, level, tx, ty, (x1 - x0, y1 - y0))
+                screen.blit(tile, (x0, y0))
+                drawn += 1
+        return drawn
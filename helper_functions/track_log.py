@@ -0,0 +1,153 @@
+# track_log.py
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+
+# File header: magic + record size, so a reader can reject foreign files
+HEADER = struct.Struct("<6sH")
+MAGIC = b"LLTRK1"
+# One fix: timestamp (s), device id (utf-8, NUL-padded), lat, lon, accuracy (m)
+RECORD = struct.Struct("<d24sddf")
+DEVICE_BYTES = 24
+
+
+def log_files(path):
+    """The .bin files of a log directory in order (rotated names sort by time),
+    or [path] for a single file."""
+    if os.path.isdir(path):
+        names = sorted(f for f in os.listdir(path) if f.endswith(".bin"))
+        return [os.path.join(path, f) for f in names]
+    return [path]
+
+
+class TrackLog:
+    """
+    Append-only log of GPS fixes as fixed-size binary records. Every append
+    is flushed to the OS; the file is fsync'ed at most every `fsync_interval`
+    seconds, and a new file is started once the current one reaches
+    `max_bytes`. Files are named <prefix>-<date>-<time>-<n>.bin.
+    Device ids longer than 24 bytes are truncated.
+    """
+
+    def __init__(
+        self, directory, prefix="track", max_bytes=64 * 1024 * 1024, fsync_interval=1.0
+    ):
+        self.directory = directory
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.fsync_interval = fsync_interval
+        self.lock = threading.Lock()
+        self.file = None
+        self.path = None
+        self.size = 0
+        self.records = 0
+        self.last_sync = 0.0
+        self._seq = 0
+
+    def _open(self):
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        while True:
+            self._seq += 1
+            name = f"{self.prefix}-{stamp}-{self._seq:03d}.bin"
+            path = os.path.join(self.directory, name)
+            if not os.path.exists(path):
+                break
+        self.file = open(path, "xb")
+        self.file.write(HEADER.pack(MAGIC, RECORD.size))
+        self.path = path
+        self.size = HEADER.size
+
+    def _sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.last_sync = time.monotonic()
+
+    def append(self, t, device, lat, lon, accuracy=None):
+        self.extend([(t, device, lat, lon, accuracy)])
+
+    def extend(self, fixes):
+        """Append (t, device, lat, lon, accuracy) tuples; accuracy may be None."""
+        with self.lock:
+            for t, device, lat, lon, accuracy in fixes:
+                if self.file is None or self.size + RECORD.size > self.max_bytes:
+                    self._rotate()
+                device = str(device).encode()[:DEVICE_BYTES]
+                acc = math.nan if accuracy is None else accuracy
+                self.file.write(RECORD.pack(t, device, lat, lon, acc))
+                self.size += RECORD.size
+                self.records += 1
+            if self.file is None:
+                return
+            if time.monotonic() - self.last_sync >= self.fsync_interval:
+                self._sync()
+            else:
+                self.file.flush()
+
+    def _rotate(self):
+        if self.file is not None:
+            self._sync()
+            self.file.close()
+        self._open()
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self._sync()
+                self.file.close()
+                self.file = None
+
+
+class TrackReader:
+    """
+    Memory-mapped view of one log file: `len(reader)` records, each read as
+    (t, device, lat, lon, accuracy) on access. A torn last record (from a
+    crash mid-write) is ignored.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        if size < HEADER.size:
+            raise ValueError(f"{path}: not a track log")
+        magic, record_size = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or record_size != RECORD.size:
+            raise ValueError(f"{path}: not a track log")
+        self.count = (size - HEADER.size) // RECORD.size
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        t, device, lat, lon, acc = RECORD.unpack_from(
+            self.mm, HEADER.size + i * RECORD.size
+        )
+        device = device.rstrip(b"\0").decode(errors="replace")
+        return t, device, lat, lon, None if math.isnan(acc) else acc
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
+
+    def close(self):
+        if isinstance(self.mm, mmap.mmap):
+            self.mm.close()
+
+
+def read_track(path, device=None):
+    """Every record in a log file or directory, optionally of one device."""
+    for name in log_files(path):
+        reader = TrackReader(name)
+        try:
+            for record in reader:
+                if device is None or record[1] == device:
+                    yield record
+        finally:
+            reader.close()
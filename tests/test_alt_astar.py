@@ -40,17 +40,65 @@ def test_alt_admissibility():
         assert h <= true_d[u] + 1e-6
 
 
+def test_alt_heuristic_consistent():
+    import visualize_map as vm
+
+    vm.USE_ALT = True
+    g = vm.rlh_graph
+    goal = g.node_id("Room 135")
+    h = vm.goal_heuristic(goal)
+    # h(u) <= w(u, v) + h(v) on every edge, and never below Euclid
+    for u in range(len(g.names)):
+        assert h(u) >= g.euclid(u, goal) - 1e-9
+        for e in range(g.offsets[u], g.offsets[u + 1]):
+            assert h(u) <= g.weights[e] + h(g.targets[e]) + 1e-6
+
+
 def test_alt_expansions_not_worse():
     import visualize_map as vm
 
     start, goal = "H1", "Room 135"
 
     vm.USE_ALT = False
-    _ = vm.a_star(start, goal)
-    expansions_euclid = vm.last_astar_expansions
+    _, stats_euclid = vm.a_star(start, goal, with_stats=True)
+    expansions_euclid = stats_euclid.expansions
 
     vm.USE_ALT = True
-    _ = vm.a_star(start, goal)
-    expansions_alt = vm.last_astar_expansions
+    _, stats_alt = vm.a_star(start, goal, with_stats=True)
+    expansions_alt = stats_alt.expansions
 
     assert expansions_alt <= expansions_euclid
+
+
+def test_astar_stats_and_unreachable():
+    import visualize_map as vm
+
+    path, stats = vm.a_star("H1", "CNL Hall", with_stats=True)
+    assert path[-1] == "CNL Hall"
+    assert stats.pushes >= stats.expansions >= len(path)
+    assert stats.elapsed_ms >= 0.0
+
+    # "exits" markers are not connected to the hallway graph
+    assert vm.a_star("H1", "exits") is None
+
+
+def test_ch_matches_astar_paths():
+    import visualize_map as vm
+
+    vm.USE_ALT = False
+    for goal in vm.graph_edges:
+        expected = vm.a_star("H1", goal)
+        path, stats = vm.ch_route("H1", goal, with_stats=True)
+        assert path == expected
+        assert stats.mode == "CH"
+    _, stats = vm.ch_route("H1", "Room 134", with_stats=True)
+    assert stats.expansions >= 1
+    assert vm.ch_route("H1", "exits") is None
+    assert vm.get_ch().preprocess_ms > 0.0
+
+
+def test_mode_cycle():
+    import visualize_map as vm
+
+    vm.USE_ALT, vm.USE_CH = False, False
+    assert [vm.cycle_route_mode() for _ in range(3)] == ["ALT", "CH", "Euclid"]
@@ -0,0 +1,61 @@
+import os
+import math
+import random
+
+
+def setup_module(module=None):
+    os.environ["LLAMA_HEADLESS"] = "1"
+
+
+def _length(vm, path):
+    return sum(math.dist(vm.graph_nodes[u], vm.graph_nodes[v]) for u, v in zip(path, path[1:]))
+
+
+def test_bidirectional_optimal_against_dijkstra():
+    import visualize_map as vm
+
+    for use_alt in (False, True):
+        vm.USE_ALT = use_alt
+        for start in vm.graph_nodes:
+            true_d = vm.dijkstra_from(start)
+            for goal in vm.graph_nodes:
+                path, stats = vm.bidirectional_route(start, goal, with_stats=True)
+                assert stats.mode == ("Bi-ALT" if use_alt else "Bi-Euclid")
+                if true_d[goal] == float("inf"):
+                    assert path is None
+                    continue
+                assert path[0] == start and path[-1] == goal
+                assert abs(_length(vm, path) - true_d[goal]) < 1e-6
+    vm.USE_ALT = False
+
+
+def test_bidirectional_toggle_in_find_route():
+    import visualize_map as vm
+
+    vm.USE_ALT, vm.USE_CH, vm.USE_BIDIRECTIONAL = False, False, True
+    try:
+        path, stats = vm.find_route("H1", "CNL Hall", with_stats=True)
+        assert stats.mode == "Bi-Euclid" and vm.route_mode() == "Bi-Euclid"
+        assert path == vm.a_star("H1", "CNL Hall")
+    finally:
+        vm.USE_BIDIRECTIONAL = False
+
+
+def test_plain_bidirectional_dijkstra_on_directed_graph():
+    from helper_functions.compiled_graph import compile_graph
+    from helper_functions.pathfinding import bidirectional_search, dijkstra
+
+    rnd = random.Random(11)
+    n = 150
+    nodes = {i: (rnd.uniform(0, 300), rnd.uniform(0, 300)) for i in range(n)}
+    edges = {i: rnd.sample(range(n), 2) for i in range(n)}
+    g = compile_graph(nodes, edges)
+    for s in range(0, n, 13):
+        true_d = dijkstra(g, s)
+        for t in range(0, n, 3):
+            path, _ = bidirectional_search(g, s, t)
+            if true_d[t] == float("inf"):
+                assert path is None
+                continue
+            length = sum(g.weights[g.edge_id(a, b)] for a, b in zip(path, path[1:]))
+            assert abs(length - true_d[t]) < 1e-6
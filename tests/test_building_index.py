@@ -0,0 +1,71 @@
+import math
+import os
+import random
+
+from helper_functions.building_index import (
+    Building,
+    BuildingIndex,
+    distance_to_outline,
+    load_campus,
+    point_in_polygon,
+)
+
+
+def setup_module(module=None):
+    os.environ["LLAMA_HEADLESS"] = "1"
+
+
+def _star(cx, cy, r, rnd):
+    # Non-convex outline around (cx, cy)
+    n = rnd.randint(5, 9)
+    return [
+        (
+            cx + r * (0.5 + 0.5 * (i % 2)) * math.cos(2 * math.pi * i / n),
+            cy + r * (0.5 + 0.5 * (i % 2)) * math.sin(2 * math.pi * i / n),
+        )
+        for i in range(n)
+    ]
+
+
+def test_point_in_polygon_and_distance():
+    square = [(0, 0), (10, 0), (10, 10), (0, 10)]
+    assert point_in_polygon(5, 5, square)
+    assert not point_in_polygon(15, 5, square)
+    notch = [(0, 0), (10, 0), (10, 10), (5, 5), (0, 10)]
+    assert not point_in_polygon(5, 8, notch)
+    assert distance_to_outline(13, 14, square) == 5.0
+    assert Building("sq", square).distance(5, 5) == 0.0
+
+
+def test_index_matches_brute_force():
+    rnd = random.Random(3)
+    buildings = [
+        Building(f"B{i}", _star(rnd.uniform(0, 2000), rnd.uniform(0, 1500), 40, rnd))
+        for i in range(300)
+    ]
+    index = BuildingIndex(buildings, margin=30)
+    for _ in range(500):
+        x, y = rnd.uniform(-50, 2050), rnd.uniform(-50, 1550)
+        inside = [b for b in buildings if point_in_polygon(x, y, b.outline)]
+        hit = index.at(x, y)
+        assert (hit in inside) if inside else hit is None
+        near = [(b.distance(x, y), b.name) for b in buildings]
+        near = [h for h in near if h[0] <= 30]
+        got = index.nearest(x, y)
+        if near:
+            assert abs(got[1] - min(near)[0]) < 1e-9
+        else:
+            assert got is None
+
+
+def test_campus_and_visualizer_hover():
+    campus = load_campus()
+    rlh = campus["RLH"]
+    assert campus.at(*rlh.center) is rlh
+    assert campus.nearest(235, 188)[0] is rlh
+    assert campus.nearest(1000, 1000) is None
+
+    import visualize_map as vm
+
+    hit = vm.hovered_building(*vm.map_to_screen(*rlh.center))
+    assert hit and hit[0].name == "RLH"
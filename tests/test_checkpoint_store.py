@@ -0,0 +1,88 @@
+import os
+import threading
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from helper_functions.checkpoint_store import CheckpointStore
+
+
+def _photos(folder, names):
+    folder.mkdir()
+    for name in names:
+        surf = pygame.Surface((64, 48))
+        surf.fill((200, 100, 50))
+        pygame.image.save(surf, str(folder / f"{name}.png"))
+    (folder / "notes.txt").write_text("not an image")
+
+
+def test_lazy_decode_and_prescaled_popup(tmp_path):
+    _photos(tmp_path / "cp", ["H1", "H2"])
+    store = CheckpointStore(str(tmp_path / "cp"), popup_size=(30, 20))
+    assert len(store) == 2 and "H1" in store and "notes" not in store
+    assert store.memory_report()["decoded"] == 0  # nothing loaded yet
+
+    popup = store.popup("H1")
+    assert popup.get_size() == (30, 20)
+    assert store.popup("H1") is popup
+    assert store.popup("missing") is None
+    report = store.memory_report()
+    assert (report["hits"], report["misses"], report["decoded"]) == (1, 1, 1)
+    assert report["bytes"] == 30 * 20 * popup.get_bytesize()
+
+
+def test_lru_bounded_by_bytes(tmp_path):
+    _photos(tmp_path / "cp", ["A", "B", "C"])
+    one = 30 * 20 * 4
+    store = CheckpointStore(
+        str(tmp_path / "cp"), popup_size=(30, 20), max_bytes=2 * one
+    )
+    store.popup("A")
+    store.popup("B")
+    store.popup("A")  # A is now most recent
+    store.popup("C")  # evicts B
+    assert list(store.popups) == ["A", "C"]
+    assert store.memory_report()["bytes"] <= store.max_bytes
+
+
+def test_prefetch_in_background(tmp_path):
+    _photos(tmp_path / "cp", ["H1", "H2", "H3"])
+    store = CheckpointStore(str(tmp_path / "cp"), popup_size=(30, 20))
+    store.prefetch(["H1", "H2", "nope", "H2"])
+    store.wait()
+    assert set(store.popups) == {"H1", "H2"}
+    assert store.memory_report()["decoded"] == 2
+
+    store.popup("H2")
+    assert store.memory_report()["misses"] == 0
+
+
+def test_ready_never_decodes_on_the_caller(tmp_path):
+    _photos(tmp_path / "cp", ["H1"])
+    store = CheckpointStore(str(tmp_path / "cp"), popup_size=(30, 20))
+    threads = []
+    decode = store._decode
+
+    def spy(name):
+        threads.append(threading.current_thread())
+        return decode(name)
+
+    store._decode = spy
+    assert store.ready("H1") is None  # queued, not decoded here
+    store.wait()
+    assert store.ready("H1").get_size() == (30, 20)
+    assert threads and threading.main_thread() not in threads
+
+
+def test_unreadable_photo_reported_once(tmp_path, capsys):
+    folder = tmp_path / "cp"
+    folder.mkdir()
+    (folder / "H1.jpg").write_bytes(b"not a jpeg")
+    store = CheckpointStore(str(folder))
+    assert store.popup("H1") is None
+    assert store.popup("H1") is None
+    store.prefetch(["H1"])
+    store.wait()
+    assert "H1" in store.failed
+    assert capsys.readouterr().out.count("Could not load H1") == 1
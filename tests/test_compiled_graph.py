@@ -0,0 +1,40 @@
+import os
+import math
+
+
+def setup_module(module=None):
+    os.environ["LLAMA_HEADLESS"] = "1"
+
+
+def test_csr_matches_dict_graph():
+    import visualize_map as vm
+
+    g = vm.rlh_graph
+    assert g.num_nodes == len(vm.graph_nodes)
+    assert g.coords.shape == (g.num_nodes, 2)
+    for name, nbs in vm.graph_edges.items():
+        u = g.node_id(name)
+        out = [g.names[g.targets[e]] for e in range(g.offsets[u], g.offsets[u + 1])]
+        assert out == nbs
+        for e in range(g.offsets[u], g.offsets[u + 1]):
+            v = g.targets[e]
+            expected = math.dist(vm.graph_nodes[name], vm.graph_nodes[g.names[v]])
+            assert abs(g.weights[e] - expected) < 1e-9
+
+
+def test_reverse_adjacency_shares_weights():
+    from helper_functions.compiled_graph import compile_graph
+    from helper_functions.pathfinding import dijkstra
+
+    nodes = {"a": (0, 0), "b": (3, 4), "c": (6, 8)}
+    edges = {"a": ["b"], "b": ["c"]}  # one-way chain
+    g = compile_graph(nodes, edges)
+    a, c = g.node_id("a"), g.node_id("c")
+
+    assert dijkstra(g, a)[c] == 10.0
+    assert dijkstra(g, c)[a] == float("inf")
+    assert dijkstra(g, c, reverse=True)[a] == 10.0
+
+    old = g.set_weight(a, g.node_id("b"), 1.0)
+    assert old == 5.0 and g.version == 1
+    assert dijkstra(g, c, reverse=True)[a] == 6.0
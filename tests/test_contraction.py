@@ -0,0 +1,37 @@
+import random
+
+from helper_functions.compiled_graph import compile_graph
+from helper_functions.contraction import ContractionHierarchy
+from helper_functions.pathfinding import dijkstra
+
+
+def test_ch_distances_match_dijkstra_on_directed_graph():
+    rnd = random.Random(3)
+    n = 120
+    nodes = {i: (rnd.uniform(0, 500), rnd.uniform(0, 500)) for i in range(n)}
+    edges = {i: rnd.sample(range(n), 3) for i in range(n)}
+    g = compile_graph(nodes, edges)
+    ch = ContractionHierarchy(g)
+    assert sorted(ch.rank) == list(range(n))
+    assert ch.shortcut_count == len(ch.middle)  # replacements are not new
+
+    for s in range(0, n, 11):
+        true_d = dijkstra(g, s)
+        for t in range(n):
+            path, _ = ch.query(s, t)
+            if true_d[t] == float("inf"):
+                assert path is None
+                continue
+            assert path[0] == s and path[-1] == t
+            length = sum(g.weights[g.edge_id(a, b)] for a, b in zip(path, path[1:]))
+            assert abs(length - true_d[t]) < 1e-6
+
+
+def test_replaced_shortcuts_counted_once():
+    rnd = random.Random(3)
+    n = 120
+    nodes = {i: (rnd.uniform(0, 500), rnd.uniform(0, 500)) for i in range(n)}
+    edges = {i: rnd.sample(range(n), 3) for i in range(n)}
+    # A one-node witness search adds shortcuts that cheaper ones later replace
+    ch = ContractionHierarchy(compile_graph(nodes, edges), witness_settle_limit=1)
+    assert ch.shortcut_count == len(ch.middle)
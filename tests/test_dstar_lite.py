@@ -0,0 +1,122 @@
+import os
+import random
+
+from helper_functions.compiled_graph import compile_graph
+from helper_functions.dstar_lite import DStarLite
+from helper_functions.pathfinding import dijkstra
+
+
+def setup_module(module=None):
+    os.environ["LLAMA_HEADLESS"] = "1"
+
+
+def test_replanning_matches_dijkstra_after_changes():
+    rnd = random.Random(4)
+    n = 200
+    nodes = {i: (rnd.uniform(0, 400), rnd.uniform(0, 400)) for i in range(n)}
+    edges = {i: [] for i in range(n)}
+    for i in range(n):
+        for j in rnd.sample(range(n), 3):
+            if j != i and j not in edges[i]:
+                edges[i].append(j)
+                edges[j].append(i)
+    g = compile_graph(nodes, edges)
+    start, goal = 0, n - 1
+    planner = DStarLite(g, start, goal)
+    first = planner.replan()
+    assert abs(planner.distance() - dijkstra(g, start)[goal]) < 1e-6
+
+    for _ in range(15):
+        path = planner.path()
+        if path and len(path) > 2:
+            planner.move_start(path[1])  # walker advanced one node
+            u, v = path[1], path[2]  # block the next edge on the route
+            planner.update_edge(u, v, float("inf"))
+        else:  # reroute around something random instead
+            e = rnd.randrange(g.num_edges)
+            u = next(x for x in range(n) if g.offsets[x] <= e < g.offsets[x + 1])
+            planner.update_edge(u, g.targets[e], g.weights[e] * rnd.uniform(0.5, 2.0))
+        stats = planner.replan()
+        true_d = dijkstra(g, planner.start)[goal]
+        assert abs(planner.distance() - true_d) < 1e-6 or planner.distance() == true_d
+        assert stats.expansions <= n
+
+    # Making an edge that no shortest path uses more expensive costs nothing
+    for u in range(n):
+        e = g.offsets[u]
+        if e < g.offsets[u + 1]:
+            v = g.targets[e]
+            if planner.rhs.get(u, float("inf")) < g.weights[e] + planner.g.get(v, float("inf")):
+                planner.update_edge(u, v, g.weights[e] * 3)
+                assert planner.replan().expansions == 0
+                break
+    assert first.expansions > 0
+
+
+def test_bingo_path_replanned_in_place():
+    import visualize_map as vm
+
+    path = vm.a_star("H1", "Room 134")
+    vm.bingo_path = vm.last_path = path
+    vm.bingo_index, vm.bingo_moving = 0, True
+    vm.active_planner = DStarLite(
+        vm.rlh_graph, vm.rlh_graph.node_id("H1"), vm.rlh_graph.node_id("Room 134")
+    )
+    try:
+        vm.active_planner.replan()
+        # The hallway graph is a tree, so closing the way ahead means Bingo
+        # stops at the next node; reopening repairs the walk again
+        vm.close_hallway("VR5", "VR6")
+        assert vm.bingo_path is path  # updated in place
+        assert path == ["H1", "H_R1"]
+        vm.reopen_hallway("VR5", "VR6")
+        assert vm.bingo_path is path
+        assert path == vm.a_star("H1", "Room 134")
+    finally:
+        vm.active_planner, vm.bingo_moving = None, False
+        vm.reopen_hallway("VR5", "VR6")
+
+
+def test_turning_back_keeps_path_free_of_repeats():
+    import visualize_map as vm
+
+    path = vm.a_star("H1", "Room 134")
+    vm.bingo_path = vm.last_path = path
+    vm.place_bingo(vm.graph_nodes["H1"])
+    vm.bingo_index, vm.bingo_moving = 0, True
+    vm.active_planner = DStarLite(
+        vm.rlh_graph, vm.rlh_graph.node_id("H1"), vm.rlh_graph.node_id("Room 134")
+    )
+    try:
+        vm.active_planner.replan()
+        # Close the segment Bingo is on: it turns back towards H1
+        vm.close_hallway("H1", "H_R1")
+        assert path == ["H_R1", "H1"]
+        # Another closure must not flip it round again
+        vm.close_hallway("VR5", "VR6")
+        assert path == ["H_R1", "H1"]
+        assert all(a != b for a, b in zip(path, path[1:]))
+    finally:
+        vm.active_planner, vm.bingo_moving = None, False
+        vm.reopen_hallway("H1", "H_R1")
+        vm.reopen_hallway("VR5", "VR6")
+        vm.place_bingo(vm.graph_nodes["H1"])
+
+
+def test_planner_built_only_when_a_hallway_changes():
+    import visualize_map as vm
+
+    path = vm.a_star("H1", "Room 134")
+    vm.bingo_path = vm.last_path = path
+    vm.bingo_index, vm.bingo_moving = 0, True
+    vm.active_planner, vm.planner_goal = None, "Room 134"
+    try:
+        assert vm.active_planner is None  # a plain route lookup searches once
+        vm.close_hallway("VR5", "VR6")
+        assert vm.active_planner is not None
+        assert path == ["H1", "H_R1"]
+        vm.reopen_hallway("VR5", "VR6")
+        assert path == vm.a_star("H1", "Room 134")
+    finally:
+        vm.active_planner, vm.planner_goal, vm.bingo_moving = None, None, False
+        vm.reopen_hallway("VR5", "VR6")
@@ -0,0 +1,37 @@
+import os
+
+
+def setup_module(module=None):
+    os.environ["LLAMA_HEADLESS"] = "1"
+
+
+def _walk(vm, frame_time, seconds):
+    """Run the simulation for `seconds` of wall time in frames of `frame_time`."""
+    vm.scene = "rlh_floor"
+    vm.time_wave = vm.frame_idx = 0
+    vm.bingo_path = vm.a_star("H1", "Room 134")
+    vm.bingo_index, vm.bingo_moving = 0, True
+    vm.place_bingo(vm.graph_nodes["H1"])
+    lag, left = 0.0, seconds
+    while left > 1e-12:
+        step = min(frame_time, left)
+        lag = vm.advance(lag, step)
+        left -= step
+    return vm.time_wave, vm.frame_idx, vm.bingo_index, tuple(vm.bingo_pos)
+
+
+def test_simulation_independent_of_render_rate():
+    import visualize_map as vm
+
+    saved = vm.scene, vm.bingo_path, vm.bingo_index, vm.bingo_moving, vm.bingo_pos
+    try:
+        # 3 s plus half a tick, so float rounding cannot change the tick count
+        seconds = 3.0 + vm.SIM_DT / 2
+        slow = _walk(vm, 1 / 30, seconds)
+        fast = _walk(vm, 1 / 144, seconds)
+        assert slow == fast
+        assert slow[1] == round(3.0 / vm.SIM_DT)  # one tick per SIM_DT
+        assert slow[2] > 0  # Bingo actually moved along the path
+    finally:
+        vm.scene, vm.bingo_path, vm.bingo_index, vm.bingo_moving, pos = saved
+        vm.place_bingo(pos)
@@ -0,0 +1,49 @@
+import json
+import os
+import subprocess
+import sys
+
+from helper_functions.frame_profiler import FrameProfiler
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_profiler_percentiles_and_disabled_noop():
+    prof = FrameProfiler(enabled=True)
+    for i in range(100):
+        prof.frame = {"map": (i + 1) / 1000.0}  # 1..100 ms
+        if i % 2:
+            prof.frame["hud"] = 0.002
+        prof.end_frame()
+    summary = prof.summary()
+    assert abs(summary["map"]["p50"] - 50.5) < 1e-6
+    assert summary["map"]["p99"] > summary["map"]["p95"] > 90
+    assert summary["hud"]["frames"] == 50
+    assert summary["frame"]["frames"] == 100
+    assert "p95 ms" in prof.report()
+
+    off = FrameProfiler()
+    with off.stage("map"):
+        pass
+    off.end_frame()
+    assert off.frames == [] and off.summary() == {}
+
+
+def test_bench_render_writes_artifact(tmp_path):
+    out = tmp_path / "render.json"
+    env = {k: v for k, v in os.environ.items() if k != "LLAMA_HEADLESS"}
+    proc = subprocess.run(
+        [sys.executable, "bench_render.py", "--frames", "12", "--warmup", "2"]
+        + ["--out", str(out)],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=300,
+    )
+    assert proc.returncode == 0, proc.stderr
+    results = json.loads(out.read_text())
+    assert set(results["scenes"]) == {"campus", "rlh_floor"}
+    for stages in results["scenes"].values():
+        assert {"map", "radar", "hud", "flip", "frame"} <= set(stages)
+        assert stages["frame"]["frames"] == 12
@@ -0,0 +1,64 @@
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import requests
+
+from helper_functions.gps_poller import GpsPoller
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        body = json.dumps({"lat": 53.17, "lon": 8.65}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_poller_publishes_latest_fix():
+    server = HTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/get"
+    poller = GpsPoller(url, interval=0.01).start()
+    try:
+        deadline = time.monotonic() + 5
+        while poller.latest is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert poller.latest[:2] == (53.17, 8.65)
+    finally:
+        poller.stop()
+        server.shutdown()
+        server.server_close()
+
+
+def test_backoff_when_unreachable():
+    poller = GpsPoller(
+        f"http://127.0.0.1:{_free_port()}/get", interval=0.1, max_backoff=0.5
+    )
+    with requests.Session() as session:
+        for expected in (0.2, 0.4, 0.5, 0.5):
+            assert not poller.poll(session)
+            assert poller.delay() == expected
+    assert poller.latest is None
+
+    # The loop stops promptly even in the middle of a back-off wait
+    poller.start()
+    time.sleep(0.05)
+    t0 = time.monotonic()
+    poller.stop()
+    assert time.monotonic() - t0 < 1.5
@@ -0,0 +1,119 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+import requests
+from werkzeug.serving import make_server
+
+# Keep the server's track log out of the repo
+os.environ["LLAMA_TRACK_DIR"] = tempfile.mkdtemp(prefix="tracks-")
+
+from helper_functions import gps_server  # noqa: E402
+from helper_functions.track_log import read_track  # noqa: E402
+from helper_functions.gps_poller import GpsPoller  # noqa: E402
+
+
+def test_broadcaster_fans_out_and_drops_oldest():
+    hub = gps_server.Broadcaster(backlog=2)
+    a, b = hub.subscribe(), hub.subscribe()
+    for i in range(3):
+        hub.publish(str(i))
+    assert [a.get_nowait(), a.get_nowait()] == ["1", "2"]
+    assert b.qsize() == 2
+    hub.unsubscribe(a)
+    hub.publish("3")
+    assert a.empty() and len(hub) == 1
+
+
+def test_stream_pushes_updates_to_subscribers():
+    server = make_server("127.0.0.1", 0, gps_server.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    viewers = [
+        GpsPoller(base + "/get", stream_url=base + "/api/gps/stream").start()
+        for _ in range(3)
+    ]
+    try:
+        deadline = time.monotonic() + 5
+        while len(gps_server.broadcaster) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        requests.post(base + "/api/gps", json={"lat": 53.2, "lon": 8.7}, timeout=2)
+        while time.monotonic() < deadline and not all(v.latest for v in viewers):
+            time.sleep(0.01)
+        assert all(v.latest[:2] == (53.2, 8.7) for v in viewers)
+        assert all(v.polls == 0 for v in viewers)  # nothing was polled
+    finally:
+        for v in viewers:
+            v._stop.set()
+        server.shutdown()
+
+
+def test_devices_are_tracked_separately():
+    client = gps_server.app.test_client()
+    for i in range(3):
+        client.post("/api/gps", json={"lat": 53.1, "lon": 8.6 + i, "device": "a"})
+    client.post("/update", json={"lat": 53.2, "lon": 8.7}, headers={"X-Device-Id": "b"})
+    assert client.post("/api/gps", json={"lat": "north"}).status_code == 400
+    assert client.post("/api/gps", json={"lat": 200, "lon": 0}).status_code == 400
+
+    devices = client.get("/api/devices").get_json()
+    assert devices["a"]["lon"] == 8.6 + 2 and devices["b"]["lat"] == 53.2
+    assert client.get("/api/gps").get_json()["device"] == "b"  # newest overall
+    track = client.get("/api/devices/a/track?limit=2").get_json()["fixes"]
+    assert [f["lon"] for f in track] == [8.6 + 1, 8.6 + 2]
+    assert client.get("/api/devices/nobody").status_code == 404
+
+
+def test_batch_ingestion():
+    client = gps_server.app.test_client()
+    base = float(int(time.time()) + 10)  # newer than the other tests' fixes
+    fixes = [{"lat": 53.0, "lon": 8.0 + i / 100, "t": base + i} for i in range(30)]
+    fixes[5] = {"lat": "?", "lon": 8.0}
+    fixes.reverse()  # out of order, e.g. a retried batch
+    res = client.post("/api/gps/batch", json={"device": "walker", "fixes": fixes})
+    assert res.get_json() == {"accepted": 29, "rejected": [24]}
+
+    track = client.get("/api/devices/walker/track").get_json()["fixes"]
+    assert [f["t"] for f in track] == sorted(f["t"] for f in track)
+    assert track[-1]["t"] == base + 29
+    assert client.get("/api/gps").get_json()["device"] == "walker"
+
+    gps_server.track_log.close()
+    logged = list(read_track(gps_server.TRACK_DIR, device="walker"))
+    assert len(logged) == 29 and logged[0][0] == base + 29  # as received
+
+    assert client.post("/api/gps/batch", json={"fixes": 3}).status_code == 400
+    too_many = [{"lat": 1, "lon": 1}] * (gps_server.MAX_BATCH + 1)
+    assert client.post("/api/gps/batch", json=too_many).status_code == 413
+
+
+def test_late_batch_does_not_rewind_position():
+    client = gps_server.app.test_client()
+    newer = [{"lat": 53.0, "lon": 8.0, "t": 2000.0 + i} for i in range(3)]
+    older = [{"lat": 52.0, "lon": 7.0, "t": 1500.0 + i} for i in range(3)]
+    client.post("/api/gps/batch", json={"device": "late", "fixes": newer})
+    subscriber = gps_server.broadcaster.subscribe()
+    try:
+        res = client.post("/api/gps/batch", json={"device": "late", "fixes": older})
+        assert res.get_json()["accepted"] == 3
+        assert subscriber.empty()  # nothing pushed: the position did not move
+    finally:
+        gps_server.broadcaster.unsubscribe(subscriber)
+
+    assert client.get("/api/devices/late").get_json()["t"] == 2002.0
+    assert client.get("/api/gps").get_json()["t"] >= 2002.0
+    track = client.get("/api/devices/late/track").get_json()["fixes"]
+    assert [f["t"] for f in track] == [1500.0, 1501.0, 1502.0, 2000.0, 2001.0, 2002.0]
+
+
+def test_resent_batch_is_stored_once():
+    client = gps_server.app.test_client()
+    fixes = [{"lat": 53.0, "lon": 8.0, "t": 3000.0 + i} for i in range(3)]
+    # A beacon the server did accept, then the same fixes again by fetch
+    body = json.dumps({"device": "resend", "fixes": fixes})
+    client.post("/api/gps/batch", data=body, content_type="text/plain")
+    client.post("/api/gps/batch", json={"device": "resend", "fixes": fixes})
+    track = client.get("/api/devices/resend/track").get_json()["fixes"]
+    assert [f["t"] for f in track] == [3000.0, 3001.0, 3002.0]
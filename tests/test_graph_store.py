@@ -0,0 +1,49 @@
+import json
+import os
+import shutil
+
+from helper_functions.graph_store import DATA_DIR, available_buildings, load_building
+
+
+def test_rlh_data_file_loads():
+    assert "rlh" in available_buildings()
+
+
+def test_cache_roundtrip_and_invalidation(tmp_path):
+    data_dir = tmp_path / "buildings"
+    cache_dir = tmp_path / "cache"
+    data_dir.mkdir()
+    shutil.copy(os.path.join(DATA_DIR, "rlh.json"), data_dir / "rlh.json")
+
+    first = load_building("RLH", str(data_dir), str(cache_dir))
+    second = load_building("rlh", str(data_dir), str(cache_dir))
+    assert not first.from_cache and second.from_cache
+    assert first.source_hash == second.source_hash
+    assert second.graph.names == first.graph.names
+    assert list(second.graph.weights) == list(first.graph.weights)
+    assert second.rooms == first.rooms and second.passages == first.passages
+    assert second.rooms["CNL Hall"] == [(642, 151)]
+
+    # Editing the source changes the hash and replaces the stale cache file
+    doc = json.loads((data_dir / "rlh.json").read_text())
+    doc["edges"]["VL1"] = []
+    (data_dir / "rlh.json").write_text(json.dumps(doc))
+    third = load_building("rlh", str(data_dir), str(cache_dir))
+    assert not third.from_cache and third.source_hash != first.source_hash
+    assert third.adjacency()["VL1"] == []
+    assert os.listdir(cache_dir) == [f"rlh-{third.source_hash}.npz"]
+
+
+def test_rebuild_keeps_other_buildings_caches(tmp_path):
+    data_dir = tmp_path / "buildings"
+    cache_dir = tmp_path / "cache"
+    data_dir.mkdir()
+    cache_dir.mkdir()
+    shutil.copy(os.path.join(DATA_DIR, "rlh.json"), data_dir / "rlh.json")
+    other = cache_dir / "rlh-annex-0123456789abcdef.npz"
+    other.write_bytes(b"")
+
+    rlh = load_building("rlh", str(data_dir), str(cache_dir))
+    assert sorted(os.listdir(cache_dir)) == sorted(
+        [other.name, f"rlh-{rlh.source_hash}.npz"]
+    )
@@ -0,0 +1,51 @@
+import random
+
+from helper_functions.compiled_graph import compile_graph
+from helper_functions.landmarks import load_or_build_landmarks, select_landmarks
+from helper_functions.pathfinding import dijkstra
+
+
+def _random_directed_graph(n=60, seed=7):
+    rnd = random.Random(seed)
+    nodes = {i: (rnd.uniform(0, 100), rnd.uniform(0, 100)) for i in range(n)}
+    edges = {i: [] for i in range(n)}
+    for i in range(n):
+        edges[i].append((i + 1) % n)  # ring keeps it strongly connected
+        for j in rnd.sample(range(n), 2):
+            if j != i and j not in edges[i]:
+                edges[i].append(j)
+    nodes[n] = (500, 500)  # isolated node
+    return compile_graph(nodes, edges)
+
+
+def test_bounds_admissible_on_directed_graph(tmp_path):
+    g = _random_directed_graph()
+    assert not g.is_symmetric()
+    table = load_or_build_landmarks(g, count=5, cache_dir=str(tmp_path))
+    assert table.dist_from.shape == (5, g.num_nodes)
+    assert not table.symmetric
+
+    for goal in (0, 17, 42):
+        true_d = dijkstra(g, goal, reverse=True)  # d(u, goal) for every u
+        h = table.potential(goal)
+        vec = table.bounds(range(g.num_nodes), goal)
+        for u in range(g.num_nodes):
+            assert h(u) == vec[u]
+            assert vec[u] <= true_d[u] + 1e-6
+
+
+def test_selection_and_persistence(tmp_path):
+    g = _random_directed_graph()
+    picked = select_landmarks(g, 4)
+    assert len(set(picked)) == 4
+    assert g.num_nodes - 1 not in picked  # never the isolated node
+
+    first = load_or_build_landmarks(g, count=4, cache_dir=str(tmp_path))
+    second = load_or_build_landmarks(g, count=4, cache_dir=str(tmp_path))
+    assert not first.from_cache and second.from_cache
+    assert (first.dist_to == second.dist_to).all()
+
+    # A weight change alters the fingerprint, so the table is rebuilt
+    g.set_weight(0, 1, g.weights[g.edge_id(0, 1)] * 2)
+    third = load_or_build_landmarks(g, count=4, cache_dir=str(tmp_path))
+    assert not third.from_cache
@@ -0,0 +1,48 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from PIL import Image
+
+from helper_functions.load_sprite import SpriteSheet, load_gif_frames
+
+
+def _gif(path):
+    frames = [Image.new("RGBA", (20, 20), color) for color in ("red", "blue", "green")]
+    for i, frame in enumerate(frames):
+        frame.putpixel((i, i), (255, 255, 255, 255))
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=50, loop=0)
+
+
+def test_sprite_sheet_sizes_and_disk_cache(tmp_path):
+    gif = tmp_path / "llama.gif"
+    _gif(gif)
+    cache = tmp_path / "sprites"
+
+    sheet = SpriteSheet(str(gif), sizes=(10, 40), cache_dir=str(cache))
+    assert not any(sheet.from_cache.values())
+    assert len(os.listdir(cache)) == 2
+    frames = sheet.frames(40)
+    assert len(frames) == 3 and frames[0].get_size() == (40, 40)
+    assert sheet.nearest_size(33) == 40 and sheet.nearest_size(12) == 10
+
+    # Same pixels as the plain loader
+    plain = load_gif_frames(str(gif), 40)
+    for a, b in zip(frames, plain):
+        assert pygame.image.tostring(a, "RGBA") == pygame.image.tostring(b, "RGBA")
+
+    again = SpriteSheet(str(gif), sizes=(10, 40), cache_dir=str(cache))
+    assert all(again.from_cache.values())
+    assert again._decoded is None  # nothing was decoded
+    assert len(again.frames(20)) == 3 and 20 in again.sizes
+
+
+def test_unwritable_cache_keeps_in_memory_atlas(tmp_path):
+    gif = tmp_path / "llama.gif"
+    _gif(gif)
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("")  # makedirs under a file fails with OSError
+
+    sheet = SpriteSheet(str(gif), sizes=(10,), cache_dir=str(blocker / "sprites"))
+    assert len(sheet.frames(10)) == 3 and not sheet.from_cache[10]
@@ -0,0 +1,54 @@
+import os
+import itertools
+
+import numpy as np
+
+from helper_functions.many_to_many import order_stops, tour_cost
+
+
+def setup_module(module=None):
+    os.environ["LLAMA_HEADLESS"] = "1"
+
+
+ROOMS = ["H1", "CNL Hall", "Room 134", "Room 135", "exits"]
+
+
+def test_matrix_matches_dijkstra_from():
+    import visualize_map as vm
+
+    matrix = vm.room_distance_matrix(ROOMS)
+    assert matrix.shape == (len(ROOMS), len(ROOMS))
+    for i, a in enumerate(ROOMS):
+        true_d = vm.dijkstra_from(a)
+        for j, b in enumerate(ROOMS):
+            assert matrix[i, j] == true_d[b] or abs(matrix[i, j] - true_d[b]) < 1e-9
+
+    pooled = vm.room_distance_matrix(ROOMS, processes=2)
+    assert np.array_equal(pooled, matrix)
+
+
+def test_order_stops_exact_and_heuristic():
+    rng = np.random.default_rng(5)
+    pts = rng.uniform(0, 100, size=(8, 2))
+    matrix = np.linalg.norm(pts[:, None] - pts[None], axis=2)
+
+    brute = min(
+        tour_cost(matrix, [0, *perm]) for perm in itertools.permutations(range(1, 8))
+    )
+    exact = order_stops(matrix, 0)
+    assert sorted(exact) == list(range(8)) and exact[0] == 0
+    assert abs(tour_cost(matrix, exact) - brute) < 1e-9
+
+    approx = order_stops(matrix, 0, exact_limit=0)
+    assert sorted(approx) == list(range(8)) and approx[0] == 0
+    assert tour_cost(matrix, approx) <= brute * 1.5
+
+
+def test_plan_tour_visits_all_rooms():
+    import visualize_map as vm
+
+    order, path = vm.plan_tour("H1", ["Room 134", "CNL Hall", "Room 135"])
+    assert order[0] == "H1" and set(order) == {"H1", "Room 134", "CNL Hall", "Room 135"}
+    assert path[0] == "H1" and path[-1] == order[-1]
+    for room in order:
+        assert room in path
@@ -0,0 +1,51 @@
+import threading
+
+from helper_functions.position_store import PositionStore
+
+
+def test_ring_buffer_keeps_last_fixes_in_order():
+    store = PositionStore(capacity=4)
+    for i in range(10):
+        store.update("phone", 53.0 + i, 8.0, t=float(i))
+    track = store.track("phone")
+    assert [f["t"] for f in track] == [6.0, 7.0, 8.0, 9.0]
+    assert [f["t"] for f in store.track("phone", limit=2)] == [8.0, 9.0]
+    assert store.track("phone", limit=0) == []
+    latest = store.latest("phone")
+    assert latest["lat"] == 62.0 and latest["accuracy"] is None
+    assert store.latest("other") is None and store.track("other") is None
+
+
+def test_concurrent_devices_do_not_clobber():
+    store = PositionStore(capacity=8)
+
+    def send(device):
+        for i in range(200):
+            store.update(device, 50.0 + device, 8.0 + i / 1000, t=float(i), accuracy=5)
+
+    threads = [threading.Thread(target=send, args=(d,)) for d in range(40)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    assert len(store) == 40
+    for device, fix in store.all_latest().items():
+        assert fix["lat"] == 50.0 + device and fix["t"] == 199.0
+        assert [f["t"] for f in store.track(device)] == list(range(192, 200))
+
+
+def test_late_fix_does_not_become_latest():
+    store = PositionStore(capacity=4)
+    for t in (10.0, 20.0, 30.0):
+        store.update("phone", 53.0, 8.0 + t / 100, t=t)
+    store.update("phone", 1.0, 1.0, t=15.0)  # delayed
+    assert store.latest("phone")["t"] == 30.0
+    assert store.newest["t"] == 30.0
+    assert [f["t"] for f in store.track("phone")] == [10.0, 15.0, 20.0, 30.0]
+    store.update("phone", 1.0, 1.0, t=5.0)  # older than all kept: dropped
+    assert [f["t"] for f in store.track("phone")] == [10.0, 15.0, 20.0, 30.0]
+    store.update("phone", 53.0, 8.5, t=40.0)
+    assert [f["t"] for f in store.track("phone")] == [15.0, 20.0, 30.0, 40.0]
+
+    store.update("other", 50.0, 7.0, t=25.0)  # newest of its device, not overall
+    assert store.newest["device"] == "phone"
@@ -0,0 +1,128 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from helper_functions.render_cache import (
+    DirtyRects,
+    FloorView,
+    StampCache,
+    TextCache,
+    apply_tint,
+    blit_alpha_polygon,
+)
+
+
+def test_floor_view_rebuilds_only_on_change():
+    view = FloorView()
+    img = pygame.Surface((200, 100), depth=32)
+    first = view.fit(img, (400, 400))
+    assert view.fit(img, (400, 400)) is first
+    assert view.rebuilds == 1
+    assert view.scale == 4.0 and first.get_size() == (800, 400)
+    assert view.offset == (-200, 0)
+    assert view.to_screen(50, 25) == (0, 100)
+
+    view.fit(img, (800, 200))  # resize
+    assert view.rebuilds == 2 and view.scale == 4.0 and view.offset == (0, -100)
+    view.fit(pygame.Surface((200, 100), depth=32), (800, 200))  # new image
+    assert view.rebuilds == 3
+
+
+def _background():
+    surf = pygame.Surface((120, 90), depth=32)
+    surf.fill((30, 60, 90))
+    pygame.draw.line(surf, (200, 10, 10), (0, 0), (119, 89), 5)
+    return surf
+
+
+def _full_layer(draw):
+    # The old way: draw on a window-sized alpha layer and blit it all
+    screen = _background()
+    layer = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+    draw(layer)
+    screen.blit(layer, (0, 0))
+    return screen
+
+
+def test_stamps_match_full_screen_layers():
+    stamps = StampCache(maxsize=2)
+    for color, center, radius, width in [
+        ((255, 80, 80, 120), (40, 30), 17, 0),
+        ((0, 255, 200, 90), (100, 80), 45, 2),  # clipped at the edge
+        ((0, 255, 200, 90), (-5, 10), 12, 2),
+    ]:
+        want = _full_layer(
+            lambda s: pygame.draw.circle(s, color, center, radius, width)
+        )
+        got = _background()
+        stamps.blit_circle(got, color, center, radius, width)
+        assert pygame.image.tostring(got, "RGB") == pygame.image.tostring(want, "RGB")
+    assert len(stamps) == 2
+    assert stamps.circle((0, 255, 200, 90), 12, 2) is stamps.circle((0, 255, 200, 90), 12, 2)
+
+    poly = [(10.5, 12.2), (80.7, 20.1), (60.3, 70.9), (15.0, 60.4)]
+    want = _full_layer(lambda s: pygame.draw.polygon(s, (0, 200, 255, 70), poly))
+    got = _background()
+    blit_alpha_polygon(got, (0, 200, 255, 70), poly)
+    assert pygame.image.tostring(got, "RGB") == pygame.image.tostring(want, "RGB")
+
+    want = _background()
+    overlay = pygame.Surface(want.get_size(), pygame.SRCALPHA)
+    overlay.fill((40, 80, 30, 60))
+    want.blit(overlay, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
+    got = _background()
+    apply_tint(got, (40, 80, 30, 60))
+    assert pygame.image.tostring(got, "RGB") == pygame.image.tostring(want, "RGB")
+
+
+def test_text_cache_reuses_fonts_and_surfaces():
+    pygame.font.init()
+    cache = TextCache(maxsize=2)
+    a = cache.render("Room 134", None, 26, (255, 255, 255))
+    assert cache.render("Room 134", None, 26, (255, 255, 255)) is a
+    assert cache.hits == 1 and cache.misses == 1
+    assert len(cache.fonts) == 1
+
+    outlined = cache.render("Room 134", None, 26, (255, 255, 255), outline=(0, 0, 0))
+    assert outlined is not a
+    assert outlined.get_size() == (a.get_width() + 2, a.get_height() + 2)
+    assert len(cache.fonts) == 1
+
+    cache.render("CNL Hall", None, 26, (255, 255, 255))  # evicts the oldest
+    assert len(cache) == 2
+    assert cache.render("Room 134", None, 26, (255, 255, 255)) is not a
+
+
+def test_dirty_rects_restore_and_full_redraws():
+    screen = pygame.display.set_mode((64, 48))
+    dirty = DirtyRects(enabled=True)
+    sprite = pygame.Surface((8, 8))
+    sprite.fill((255, 0, 0))
+
+    def frame(key, pos):
+        if dirty.begin(screen, key):
+            screen.fill((0, 0, 80))
+            dirty.capture(screen)
+        dirty.add(screen.blit(sprite, pos))
+        updated = list(dirty.previous) + list(dirty.rects)
+        dirty.present()
+        return updated
+
+    frame("campus", (0, 0))
+    assert dirty.full and dirty.full_redraws == 1
+    updated = frame("campus", (20, 10))
+    assert not dirty.full
+    assert updated == [pygame.Rect(0, 0, 8, 8), pygame.Rect(20, 10, 8, 8)]
+    # The old sprite position was restored from the background
+    assert screen.get_at((2, 2))[:3] == (0, 0, 80)
+    assert screen.get_at((22, 12))[:3] == (255, 0, 0)
+
+    frame("campus-panned", (20, 10))
+    assert dirty.full and dirty.full_redraws == 2
+
+    off = DirtyRects()
+    assert off.begin(screen, "campus") and off.begin(screen, "campus")
+    off.add(pygame.Rect(0, 0, 4, 4))
+    assert off.rects == []
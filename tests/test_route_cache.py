@@ -0,0 +1,42 @@
+import os
+
+from helper_functions.route_cache import RouteCache
+
+
+def setup_module(module=None):
+    os.environ["LLAMA_HEADLESS"] = "1"
+
+
+def test_lru_eviction_and_counters():
+    cache = RouteCache(maxsize=2)
+    cache.put("a", "b", "Euclid", 0, "ab")
+    cache.put("a", "c", "Euclid", 0, "ac")
+    assert cache.get("a", "b", "Euclid", 0) == "ab"  # a->b is now most recent
+    cache.put("a", "d", "Euclid", 0, "ad")
+    assert cache.get("a", "c", "Euclid", 0) is None  # evicted
+    assert cache.get("a", "b", "ALT", 0) is None  # mode is part of the key
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert len(cache) == 2
+
+    assert cache.get("a", "b", "Euclid", 1) is None  # newer graph version
+    assert len(cache) == 0
+
+
+def test_find_route_cache_invalidated_by_hallway_closure():
+    import visualize_map as vm
+
+    vm.USE_ALT, vm.USE_CH = False, False
+    vm.route_cache.clear()
+    first, stats = vm.find_route("H1", "Room 134", with_stats=True)
+    again, stats_again = vm.find_route("H1", "Room 134", with_stats=True)
+    assert again == first and not stats.cached and stats_again.cached
+
+    vm.close_hallway("H_R1", "H_R2")
+    try:
+        assert vm.find_route("H1", "Room 134") is None
+        vm.USE_CH = True
+        assert vm.find_route("H1", "Room 134") is None
+    finally:
+        vm.USE_CH = False
+        vm.reopen_hallway("H_R1", "H_R2")
+    assert vm.find_route("H1", "Room 134") == first
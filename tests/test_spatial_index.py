@@ -0,0 +1,33 @@
+import os
+import math
+import random
+
+from helper_functions.spatial_index import GridIndex
+
+
+def setup_module(module=None):
+    os.environ["LLAMA_HEADLESS"] = "1"
+
+
+def test_grid_queries_match_brute_force():
+    rnd = random.Random(2)
+    pts = [(i, (rnd.uniform(0, 1000), rnd.uniform(0, 800))) for i in range(3000)]
+    index = GridIndex(pts)
+    for _ in range(200):
+        x, y = rnd.uniform(-200, 1200), rnd.uniform(-200, 1000)
+        dists = sorted((math.hypot(px - x, py - y), k) for k, (px, py) in pts)
+        key, d = index.nearest(x, y)
+        assert abs(d - dists[0][0]) < 1e-9
+        assert [k for _, k in index.within(x, y, 25)] == [k for dd, k in dists if dd <= 25]
+    assert index.nearest(5000, 5000, max_radius=10) is None
+    assert GridIndex([]).nearest(0, 0) is None
+
+
+def test_room_hits_and_route_start_snapping():
+    import visualize_map as vm
+
+    assert vm.room_index.nearest(680, 613, vm.ROOM_CLICK_RADIUS)[0] == "Room 134"
+    assert vm.room_index.nearest(300, 300, vm.ROOM_CLICK_RADIUS) is None
+    assert vm.nearest_route_node(430, 350) == "H1"
+    # The unconnected exit marker is never chosen as a start
+    assert vm.nearest_route_node(127, 282) != "exits"
@@ -0,0 +1,45 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from helper_functions.tile_pyramid import TilePyramid
+
+
+def _checker(path, size=(150, 90)):
+    img = pygame.Surface(size, depth=32)
+    for x in range(0, size[0], 10):
+        for y in range(0, size[1], 10):
+            shade = 255 if (x + y) // 10 % 2 else 0
+            img.fill((shade, x, y), (x, y, 10, 10))
+    pygame.image.save(img, str(path))
+    return img
+
+
+def test_pyramid_levels_cache_and_native_blit(tmp_path):
+    src = tmp_path / "map.png"
+    img = _checker(src)
+    cache = tmp_path / "tiles"
+    first = TilePyramid(str(src), tile_size=64, cache_dir=str(cache))
+    assert not first.from_cache
+    assert first.levels == [(150, 90), (75, 45), (38, 23)]
+    assert first.level_for(1.0) == 0 and first.level_for(0.5) == 1
+    assert first.level_for(0.3) == 1 and first.level_for(0.01) == 2
+
+    second = TilePyramid(str(src), tile_size=64, cache_dir=str(cache))
+    assert second.from_cache and second.key == first.key
+
+    # Zoom 1 reproduces the source exactly and only loads visible tiles
+    screen = pygame.Surface((100, 60), depth=32)
+    drawn = second.draw(screen, 1.0, (-20, -10))
+    assert drawn == 4 and second.loads == 4
+    expected = pygame.Surface((100, 60), depth=32)
+    expected.blit(img, (-20, -10))
+    assert pygame.image.tostring(screen, "RGB") == pygame.image.tostring(expected, "RGB")
+
+    # Zoomed out views are covered without gaps by the smaller level
+    screen.fill((1, 2, 3))
+    second.draw(screen, 0.5, (0, 0), variant="pixel")
+    assert screen.get_at((74, 44))[:3] != (1, 2, 3)
+    assert screen.get_at((76, 46))[:3] == (1, 2, 3)
@@ -0,0 +1,70 @@
+import time
+
+import pytest
+
+from helper_functions.gps_poller import TrackReplay
+from helper_functions.track_log import (
+    HEADER,
+    RECORD,
+    TrackLog,
+    TrackReader,
+    log_files,
+    read_track,
+)
+
+
+def test_append_rotate_and_read(tmp_path):
+    log = TrackLog(str(tmp_path), max_bytes=HEADER.size + 10 * RECORD.size)
+    log.append(1.0, "phone-a", 53.1, 8.6, 4.5)
+    log.extend((2.0 + i, "phone-b", 53.2, 8.7, None) for i in range(24))
+    log.close()
+
+    files = log_files(str(tmp_path))
+    assert len(files) == 3  # 10 + 10 + 5 records
+    assert [len(TrackReader(f)) for f in files] == [10, 10, 5]
+    records = list(read_track(str(tmp_path)))
+    assert len(records) == 25 == log.records
+    assert records[0][0] == 1.0 and records[0][1:] == ("phone-a", 53.1, 8.6, 4.5)
+    assert records[-1] == (25.0, "phone-b", 53.2, 8.7, None)
+    assert len(list(read_track(str(tmp_path), device="phone-a"))) == 1
+
+
+def test_torn_record_is_ignored(tmp_path):
+    log = TrackLog(str(tmp_path))
+    log.extend([(1.0, "x", 1.0, 2.0, None), (2.0, "x", 3.0, 4.0, None)])
+    log.close()
+    with open(log.path, "ab") as f:
+        f.write(b"\1" * (RECORD.size // 2))  # crash in the middle of a write
+    reader = TrackReader(log.path)
+    assert len(reader) == 2 and reader[1][2:4] == (3.0, 4.0)
+    reader.close()
+
+
+def test_replay_feeds_fixes_at_speed(tmp_path):
+    log = TrackLog(str(tmp_path))
+    log.extend((100.0 + i, "walker", 53.0 + i / 1000, 8.0, None) for i in range(5))
+    log.extend([(101.0, "other", 1.0, 1.0, None)])
+    log.close()
+
+    replay = TrackReplay(str(tmp_path), speed=50.0, device="walker").start()
+    t0 = time.monotonic()
+    assert replay.done.wait(5)
+    assert time.monotonic() - t0 >= 4 / 50.0  # 4 s of track at 50x
+    assert replay.replayed == 5 and replay.latest[:2] == (53.004, 8.0)
+
+
+def test_replay_skips_foreign_files_and_rejects_bad_speed(tmp_path, capsys):
+    (tmp_path / "a-notes.bin").write_bytes(b"not a log")
+    (tmp_path / "b-empty.bin").write_bytes(b"")
+    log = TrackLog(str(tmp_path))
+    log.extend((100.0 + i, "walker", 53.0, 8.0 + i, None) for i in range(3))
+    log.close()
+
+    replay = TrackReplay(str(tmp_path), speed=100.0).start()
+    assert replay.done.wait(5)
+    assert replay.replayed == 3
+    out = capsys.readouterr().out
+    assert "[REPLAY] Skipping" in out and "a-notes.bin" in out
+
+    with pytest.raises(ValueError):
+        TrackReplay(str(tmp_path), speed=0)
@@ -1,5 +1,27 @@
-import pygame, math, requests, heapq, os
-from helper_functions.load_sprite import load_gif_frames
+import pygame, math, os
+from dataclasses import replace
+from helper_functions.load_sprite import SpriteSheet
+from helper_functions.building_index import load_campus
+from helper_functions.checkpoint_store import CheckpointStore
+from helper_functions.contraction import ContractionHierarchy
+from helper_functions.frame_profiler import FrameProfiler
+from helper_functions.gps_poller import GpsPoller, TrackReplay
+from helper_functions.dstar_lite import DStarLite
+from helper_functions.graph_store import load_building
+from helper_functions.landmarks import load_or_build_landmarks
+from helper_functions.many_to_many import distance_matrix, order_stops
+from helper_functions.pathfinding import astar_search, bidirectional_search, dijkstra
+from helper_functions.render_cache import (
+    DirtyRects,
+    FloorView,
+    StampCache,
+    TextCache,
+    apply_tint,
+    blit_alpha_polygon,
+)
+from helper_functions.route_cache import RouteCache
+from helper_functions.spatial_index import GridIndex
+from helper_functions.tile_pyramid import TilePyramid
 
 # -----------------------------
 # Init
@@ -9,40 +31,53 @@ BASE_LAT = 53.1670
 BASE_LON = 8.65222
 SCREEN_TITLE = "Intelligent Route Planner (Llama)"
 GPS_SERVER_URL = "http://127.0.0.1:8000/get"
+# Pushed fixes (SSE); LLAMA_GPS_POLL=1 polls GPS_SERVER_URL instead
+GPS_STREAM_URL = "http://127.0.0.1:8000/api/gps/stream"
+GPS_USE_STREAM = os.environ.get("LLAMA_GPS_POLL") != "1"
+# Background GPS polling: seconds between requests, max delay when unreachable
+GPS_POLL_INTERVAL = float(os.environ.get("LLAMA_GPS_INTERVAL", "0.2"))
+GPS_MAX_BACKOFF = 5.0
+# Replay a recorded track log instead of live GPS (LLAMA_REPLAY=<file or dir>),
+# at LLAMA_REPLAY_SPEED times real time, optionally only LLAMA_REPLAY_DEVICE
+GPS_REPLAY = os.environ.get("LLAMA_REPLAY")
+GPS_REPLAY_SPEED = float(os.environ.get("LLAMA_REPLAY_SPEED", "1.0"))
+GPS_REPLAY_DEVICE = os.environ.get("LLAMA_REPLAY_DEVICE")
 HEADLESS = os.environ.get("LLAMA_HEADLESS") == "1"
+LLAMA_SIZES = (25, 38, 50, 75, 100, 150)
+# Push only changed regions to the display (full redraw on pan/zoom/scene change)
+DIRTY_RECTS = os.environ.get("LLAMA_DIRTY_RECTS") == "1"
 scene = "campus"
 
-checkpoint_images = {}
-
-
-def load_checkpoint_images():
-    import os
-
-    folder = "img/checkpoints"
-    if not os.path.isdir(folder):
-        return
-    for fname in os.listdir(folder):
-        if fname.lower().endswith((".png", ".jpg", ".jpeg")):
-            key = fname.split(".")[0]  # H1.jpg -> H1
-            checkpoint_images[key] = pygame.image.load(os.path.join(folder, fname))
+# Checkpoint photos: indexed by name, decoded and pre-scaled on first use
+checkpoints = CheckpointStore("img/checkpoints", popup_size=(300, 200))
+CHECKPOINT_PREFETCH = 3  # upcoming route nodes decoded in the background
 
 
 if not HEADLESS:
     pygame.init()
-    load_checkpoint_images()
 
     clock = pygame.time.Clock()
     map_img = pygame.image.load("img/map.JPG")
     W, H = map_img.get_width(), map_img.get_height()
     screen = pygame.display.set_mode((W - 30, H - 20))
+    # Zoom levels + pixelated variant, tiled and cached on disk
+    map_tiles = TilePyramid("img/map.JPG")
+    print(
+        f"[TILES] {len(map_tiles.levels)} levels",
+        "(cached)" if map_tiles.from_cache else "(built)",
+    )
     pygame.display.set_caption(SCREEN_TITLE)
-    frames = load_gif_frames("img/llama (2).gif", 50)
+    # Llama atlas at a few sizes so zooming the campus never rescales per frame
+    llama = SpriteSheet("img/llama (2).gif", sizes=LLAMA_SIZES)
+    frames = llama.frames(50)
+    print(f"[CHECKPOINTS] {len(checkpoints)} photos indexed (loaded on demand)")
 
     screen_w, screen_h = screen.get_size()
     center_x = screen_w // 2
     center_y = screen_h // 2
 
 checkpoint_popup = None
+checkpoint_pending = None  # reached checkpoint whose photo is still decoding
 checkpoint_timer = 0
 checkpoint_duration = 60  # frames (2.5 seconds at 24fps)
 
@@ -50,161 +85,80 @@ checkpoint_duration = 60  # frames (2.5 seconds at 24fps)
 # Constants
 # -----------------------------
 
-# RLH outline polygon (from path editor)
-RLH_POLYGON = [
-    (198, 138),
-    (196, 161),
-    (190, 179),
-    (190, 202),
-    (208, 207),
-    (210, 190),
-    (224, 193),
-    (229, 181),
-    (253, 185),
-    (251, 209),
-    (270, 215),
-    (279, 150),
-    (260, 147),
-    (256, 168),
-    (215, 163),
-    (216, 141),
-    (200, 138),
-]
-
 # -----------------------------
 # Buildings (Clickable)
 # -----------------------------
-buildings = {
-    "RLH": {"pos": (235, 188), "radius": 60, "image": "img/rlh_groundfloor1.jpeg"}
-}
-
-passages = [
-    (436, 356),
-    (575, 352),
-    (642, 354),
-    (642, 473),
-    (643, 563),
-    (643, 616),
-    (643, 315),
-    (644, 215),
-    (643, 177),
-    (76, 349),
-    (65, 116),
-    (68, 260),
-    (66, 415),
-    (69, 523),
-    (65, 640),
-    (175, 353),
-    (253, 353),
-    (386, 353),
-]
-
-rooms = {
-    "CNL Hall": {"pos": [(642, 151)]},
-    "Room 134": {"pos": [(680, 615)]},
-    "Room 135": {"pos": [(671, 563)]},
-    "passages": {"pos": passages},
-    "exits": {"pos": [(127, 282)]},
-    "exits1": {"pos": [(127, 282)]},
-    "exits2": {"pos": [(120, 527)]},
-    "exits3": {"pos": [(588, 522)]},
-    "exits4": {"pos": [(695, 353)]},
-    "exits5": {"pos": [(684, 101)]},
-    "exits6": {"pos": [(599, 98)]},
-    "exits7": {"pos": [(66, 92)]},
-    "exits8": {"pos": [(358, 381)]},
-}
+# Outlines (traced with the path editor) and floor plans live in
+# data/campus.json; hover and click go through a grid-indexed hit test.
+BUILDING_HOVER_RANGE = 80  # map pixels around an outline that count as hover
+building_index = load_campus(margin=BUILDING_HOVER_RANGE)
+buildings = building_index.buildings
 
 # -----------------------------
 # RLH Graph for A* Pathfinding
 # -----------------------------
+# Nodes, hallway edges, rooms and passage dots live in data/buildings/rlh.json.
+# The compiled graph is cached on disk (keyed by file hash), so restarts
+# skip parsing. All searches run on the integer-indexed `rlh_graph`; the
+# name-keyed dicts below are kept for drawing and the name-based API.
+rlh = load_building("rlh")
+rlh_graph = rlh.graph
+passages = rlh.passages
 
-graph_nodes = {
-    # ---- horizontal hallway (left → right, y ≈ 350) ----
-    "H_L1": (76, 349),
-    "H_L2": (175, 353),
-    "H_L3": (253, 353),
-    "H1": (436, 356),  # 👈 central node near Bingo (start)
-    "H_R1": (575, 352),
-    "H_R2": (642, 354),  # also used as intersection with right vertical
-    # ---- left vertical hallway (top → bottom, x ≈ 65) ----
-    "VL1": (65, 116),
-    "VL2": (68, 260),
-    "VL3": (66, 415),
-    "VL4": (69, 523),
-    "VL5": (65, 640),
-    # ---- right vertical hallway (top → bottom, x ≈ 643) ----
-    "VR1": (643, 177),
-    "VR2": (644, 215),
-    "VR3": (643, 315),
-    "VR4": (642, 473),
-    "VR5": (643, 563),
-    "VR6": (643, 616),
-    # ---- rooms (destinations) ----
-    "CNL Hall": rooms["CNL Hall"]["pos"][0],
-    "Room 134": rooms["Room 134"]["pos"][0],
-    "Room 135": rooms["Room 135"]["pos"][0],
-    "exits": rooms["exits"]["pos"][0],
-    "exits1": rooms["exits1"]["pos"][0],
-    "exits2": rooms["exits2"]["pos"][0],
-    "exits3": rooms["exits3"]["pos"][0],
-    "exits4": rooms["exits4"]["pos"][0],
-    "exits5": rooms["exits5"]["pos"][0],
-    "exits6": rooms["exits6"]["pos"][0],
-    "exits7": rooms["exits7"]["pos"][0],
-    "exits8": rooms["exits8"]["pos"][0],
-}
+rooms = {name: {"pos": pos} for name, pos in rlh.rooms.items()}
+rooms["passages"] = {"pos": passages}
 
-# Edges (bidirectional, weighted by Euclidean distance)
-# Edges (bidirectional). All movement is along hallways.
-graph_edges = {
-    # horizontal hallway
-    "H_L1": ["H_L2", "VL3"],  # left intersection (approx)
-    "H_L2": ["H_L1", "H_L3"],
-    "H_L3": ["H_L2", "H1"],
-    "H1": ["H_L3", "H_R1"],  # 👈 Bingo's hallway node
-    "H_R1": ["H1", "H_R2"],
-    "H_R2": ["H_R1", "VR3", "VR4"],  # intersection with right vertical
-    # left vertical hallway
-    "VL1": ["VL2"],
-    "VL2": ["VL1", "VL3"],
-    "VL3": ["VL2", "VL4", "H_L1"],  # connect to horizontal
-    "VL4": ["VL3", "VL5"],
-    "VL5": ["VL4"],
-    # right vertical hallway
-    "VR1": ["VR2", "CNL Hall"],  # top, near CNL
-    "VR2": ["VR1", "VR3"],
-    "VR3": ["VR2", "H_R2"],  # middle intersection
-    "VR4": ["H_R2", "VR5"],
-    "VR5": ["VR4", "VR6", "Room 135"],
-    "VR6": ["VR5", "Room 134"],
-    # rooms back to hallway
-    "CNL Hall": ["VR1"],
-    "Room 134": ["VR6"],
-    "Room 135": ["VR5"],
-}
+graph_nodes = rlh.node_positions()
+graph_edges = rlh.adjacency()
 
 selected_room = None
 
 # -----------------------------
 # Advanced Heuristic (ALT: A* with Landmarks)
 # -----------------------------
-# Toggle at runtime with the 'H' key (Euclid vs ALT)
+# Cycle at runtime with the 'H' key (Euclid -> ALT -> CH)
 USE_ALT = False
-ALT_LANDMARKS = [
-    "H_L1",  # far left
-    "H_R2",  # right intersection
-    "VL5",  # bottom-left vertical
-    "VR6",  # bottom-right vertical
-]
-
-# Precomputed single-source shortest path distances from each landmark
-alt_dists = {}
-
-# Last run stats for display
-last_astar_expansions = 0
+ALT_LANDMARK_COUNT = 4
+# Optional hand-picked landmark node names, e.g. ["H_L1", "H_R2", "VL5", "VR6"].
+# None picks ALT_LANDMARK_COUNT landmarks automatically (farthest-point).
+ALT_LANDMARKS = None
+
+# Landmarks x nodes distance table (LandmarkTable), persisted under .cache/alt
+alt_table = None
+
+# Heuristic used by the most recent A* run (for display)
 last_heuristic_mode = "Euclid"
 
+# Contraction Hierarchies: third query mode, preprocessed on first use and
+# rebuilt whenever rlh_graph weights change
+USE_CH = False
+ch_index = None
+
+# Bidirectional search (toggle with 'D'); uses the Euclid or ALT setting above
+USE_BIDIRECTIONAL = False
+
+# Spatial indices for click hit-testing and snapping positions to the graph
+ROOM_CLICK_RADIUS = 10
+room_index = GridIndex(
+    (name, pos) for name, data in rooms.items() if name != "passages" for pos in data["pos"]
+)
+# Only nodes with hallway edges can start a route
+route_node_index = GridIndex(
+    (name, graph_nodes[name]) for name, nbs in graph_edges.items() if nbs
+)
+
+# Incremental replanner (D* Lite) for Bingo's current single-room walk, and
+# hallways closed at runtime with the X key (reopened with O). The planner is
+# only built once a hallway changes during a walk to `planner_goal`, so plain
+# (often cached) route lookups never pay for a second search.
+active_planner = None
+planner_goal = None
+closed_hallways = []
+
+# Memoized routes keyed by (start, goal, mode, graph version)
+ROUTE_CACHE_SIZE = 256
+route_cache = RouteCache(ROUTE_CACHE_SIZE)
+
 
 def euclid(a, b):
     return math.dist(a, b)
@@ -212,91 +166,245 @@ def euclid(a, b):
 
 def dijkstra_from(source):
     # Single-source shortest paths on the RLH graph with Euclidean edge weights
-    dist = {node: float("inf") for node in graph_nodes}
-    dist[source] = 0.0
-    pq = [(0.0, source)]
-    while pq:
-        d, u = heapq.heappop(pq)
-        if d != dist[u]:
-            continue
-        for v in graph_edges[u]:
-            w = math.dist(graph_nodes[u], graph_nodes[v])
-            nd = d + w
-            if nd < dist[v]:
-                dist[v] = nd
-                heapq.heappush(pq, (nd, v))
-    return dist
+    dist = dijkstra(rlh_graph, rlh_graph.node_id(source))
+    return dict(zip(rlh_graph.names, dist))
 
 
 def build_alt():
     """Precompute distances from landmarks for ALT heuristic.
-    Safe to call multiple times (rebuilds table)."""
-    global alt_dists
-    alt_dists = {}
-    for L in ALT_LANDMARKS:
-        if L in graph_nodes:
-            alt_dists[L] = dijkstra_from(L)
+    Safe to call multiple times (reloads or rebuilds the table)."""
+    global alt_table
+    ids = None
+    if ALT_LANDMARKS is not None:
+        ids = [rlh_graph.node_id(L) for L in ALT_LANDMARKS if L in rlh_graph.index]
+    alt_table = load_or_build_landmarks(rlh_graph, ALT_LANDMARK_COUNT, ids)
 
 
-def heuristic(u_node, goal_node):
-    """Heuristic between nodes u and goal.
-    If USE_ALT, uses ALT lower bound: max_L |d(L,goal)-d(L,u)|.
-    Falls back to Euclidean if ALT data missing."""
+def goal_heuristic(goal):
+    """h(u) on node ids for a fixed goal id (see `heuristic`)."""
     global last_heuristic_mode
-    if USE_ALT and alt_dists:
-        best = 0.0
-        for L, dmap in alt_dists.items():
-            dv = dmap.get(goal_node, float("inf"))
-            du = dmap.get(u_node, float("inf"))
-            if dv != float("inf") and du != float("inf"):
-                val = abs(dv - du)
-                if val > best:
-                    best = val
-        if best > 0:
-            last_heuristic_mode = "ALT"
-            return best
-    last_heuristic_mode = "Euclid"
-    return euclid(graph_nodes[u_node], graph_nodes[goal_node])
+    if USE_ALT and alt_table is not None and len(alt_table.landmarks):
+        alt_h = alt_table.potential(goal)
+        last_heuristic_mode = "ALT"
 
+        # The max of two consistent heuristics stays consistent
+        return lambda u: max(alt_h(u), rlh_graph.euclid(u, goal))
+    last_heuristic_mode = "Euclid"
+    return lambda u: rlh_graph.euclid(u, goal)
 
-def a_star(start, goal):
-    global last_astar_expansions
-    open_set = {start}
-    came_from = {}
-
-    g = {node: float("inf") for node in graph_nodes}
-    f = {node: float("inf") for node in graph_nodes}
 
-    g[start] = 0.0
-    f[start] = heuristic(start, goal)
+def heuristic(u_node, goal_node):
+    """Heuristic between nodes u and goal.
+    If USE_ALT, the larger of the ALT lower bound max_L |d(L,goal)-d(L,u)|
+    and the Euclidean distance; Euclidean alone if ALT data is missing."""
+    goal_id = rlh_graph.node_id(goal_node)
+    return goal_heuristic(goal_id)(rlh_graph.node_id(u_node))
+
+
+def a_star(start, goal, with_stats=False):
+    """Shortest path from start to goal (list of node names, or None).
+    With with_stats=True returns (path, SearchStats) instead."""
+    goal_id = rlh_graph.node_id(goal)
+    path, stats = astar_search(
+        rlh_graph,
+        rlh_graph.node_id(start),
+        goal_id,
+        heuristic=goal_heuristic(goal_id),
+    )
+    stats.mode = last_heuristic_mode
+    if path is not None:
+        path = [rlh_graph.names[u] for u in path]
+    if with_stats:
+        return path, stats
+    return path
+
+
+def get_ch():
+    """ContractionHierarchy for rlh_graph (built lazily, rebuilt on edits)."""
+    global ch_index
+    if ch_index is None or ch_index.version != rlh_graph.version:
+        ch_index = ContractionHierarchy(rlh_graph)
+        print(
+            f"[CH] preprocessed in {ch_index.preprocess_ms:.1f} ms,",
+            f"{ch_index.shortcut_count} shortcuts",
+        )
+    return ch_index
+
+
+def ch_route(start, goal, with_stats=False):
+    """Same contract as a_star, answered by a Contraction Hierarchies query."""
+    path, stats = get_ch().query(rlh_graph.node_id(start), rlh_graph.node_id(goal))
+    if path is not None:
+        path = [rlh_graph.names[u] for u in path]
+    if with_stats:
+        return path, stats
+    return path
+
+
+def bidirectional_route(start, goal, with_stats=False):
+    """Same contract as a_star, answered by bidirectional A* with consistent
+    Euclid or ALT potentials (max'ed with Euclid) on both sides."""
+    s, t = rlh_graph.node_id(start), rlh_graph.node_id(goal)
+    alt_to = alt_from = None
+    if USE_ALT and alt_table is not None and len(alt_table.landmarks):
+        alt_to, alt_from = alt_table.potential(t), alt_table.source_potential(s)
+
+    def to_goal(v):
+        h = rlh_graph.euclid(v, t)
+        return max(h, alt_to(v)) if alt_to else h
+
+    def from_start(v):
+        h = rlh_graph.euclid(s, v)
+        return max(h, alt_from(v)) if alt_from else h
+
+    path, stats = bidirectional_search(rlh_graph, s, t, to_goal, from_start)
+    stats.mode = "Bi-ALT" if alt_to else "Bi-Euclid"
+    if path is not None:
+        path = [rlh_graph.names[u] for u in path]
+    if with_stats:
+        return path, stats
+    return path
+
+
+def route_mode():
+    if USE_CH:
+        return "CH"
+    mode = "ALT" if USE_ALT else "Euclid"
+    return f"Bi-{mode}" if USE_BIDIRECTIONAL else mode
+
+
+def cycle_route_mode():
+    """Euclid -> ALT -> CH -> Euclid (bound to the 'H' key)."""
+    global USE_ALT, USE_CH
+    was_euclid, was_alt = not (USE_ALT or USE_CH), USE_ALT and not USE_CH
+    USE_ALT, USE_CH = was_euclid, was_alt
+    return route_mode()
+
+
+def find_route(start, goal, with_stats=False):
+    """Route in the currently selected mode (A* or bidirectional A* with
+    Euclid/ALT, or CH).
+    Results are memoized in route_cache until the graph is edited."""
+    mode = route_mode()
+    cached = route_cache.get(start, goal, mode, rlh_graph.version)
+    if cached is not None:
+        path, stats = cached
+        stats = replace(stats, cached=True)
+    elif USE_CH:
+        path, stats = ch_route(start, goal, with_stats=True)
+    elif USE_BIDIRECTIONAL:
+        path, stats = bidirectional_route(start, goal, with_stats=True)
+    else:
+        path, stats = a_star(start, goal, with_stats=True)
+    if cached is None:
+        # Store an immutable copy; callers get a fresh list they may modify
+        path = tuple(path) if path is not None else None
+        route_cache.put(start, goal, mode, rlh_graph.version, (path, stats))
+    path = list(path) if path is not None else None
+    if with_stats:
+        return path, stats
+    return path
+
+
+def nearest_route_node(x, y):
+    """Name of the routable graph node closest to (x, y)."""
+    return route_node_index.nearest(x, y)[0]
+
+
+def room_distance_matrix(names, processes=None):
+    """Dense matrix of shortest distances between the given nodes (by name).
+    One search per source with shared state; processes > 1 uses a pool."""
+    ids = [rlh_graph.node_id(name) for name in names]
+    return distance_matrix(rlh_graph, ids, processes=processes)
+
+
+def plan_tour(start, stops, return_to_start=False):
+    """Visit `stops` from `start` in a short order (exact for small sets).
+    Returns (ordered stop names incl. start, full node path or None)."""
+    names = list(dict.fromkeys([start] + list(stops)))
+    matrix = room_distance_matrix(names)
+    order = [names[i] for i in order_stops(matrix, 0, return_to_start=return_to_start)]
+    legs = order + [start] if return_to_start else order
+    path = [start]
+    for a, b in zip(legs, legs[1:]):
+        leg = find_route(a, b)
+        if leg is None:
+            return order, None
+        path.extend(leg[1:])
+    return order, path
+
+
+def set_edge_weight(u_node, v_node, weight, both_ways=True):
+    """Change a hallway edge weight (inf closes it). Bumps rlh_graph.version,
+    which invalidates cached routes and the CH index."""
+    u, v = rlh_graph.node_id(u_node), rlh_graph.node_id(v_node)
+    pairs = [(u, v), (v, u)] if both_ways else [(u, v)]
+    ensure_planner()  # seed on the graph as it was before this change
+    decreased = False
+    for a, b in pairs:
+        if rlh_graph.edge_id(a, b) >= 0:
+            old = rlh_graph.set_weight(a, b, weight)
+            decreased |= weight < old
+            if active_planner is not None:
+                active_planner.edge_changed(a, b, old)
+    if decreased and alt_table is not None:
+        build_alt()  # ALT bounds stay admissible only while weights grow
+    replan_bingo()
+
+
+def ensure_planner():
+    """D* Lite for Bingo's current walk, seeded with its initial search the
+    first time a hallway changes mid-walk. None for tours or when idle."""
+    global active_planner
+    if active_planner is None and bingo_moving and planner_goal is not None:
+        active_planner = DStarLite(
+            rlh_graph,
+            rlh_graph.node_id(bingo_path[bingo_index]),
+            rlh_graph.node_id(planner_goal),
+        )
+        active_planner.replan()
+    return active_planner
+
+
+def replan_bingo():
+    """Repair Bingo's current walk in place after hallway changes.
+    Only the part of the D* Lite search affected by the change is redone."""
+    global bingo_turned_back
+    if active_planner is None or not bingo_moving:
+        return None
+    a, b = bingo_path[bingo_index], bingo_path[bingo_index + 1]
+    e = rlh_graph.edge_id(rlh_graph.node_id(a), rlh_graph.node_id(b))
+    # Keep walking to the next node if we still can, otherwise turn back.
+    # After turning back Bingo walks the closed edge in reverse, to where it
+    # came from, so that segment stays walkable until the next node.
+    ahead_open = bingo_turned_back or (e >= 0 and rlh_graph.weights[e] != float("inf"))
+    if not ahead_open:
+        # Now walking b -> a: no duplicate node, and the next replan sees b, a
+        bingo_path[bingo_index] = b
+        a, b = b, a
+        bingo_turned_back = True
+    active_planner.move_start(rlh_graph.node_id(b))
+    stats = active_planner.replan()
+    new_path = active_planner.path()
+    print(
+        "[REPLAN] expansions=",
+        stats.expansions,
+        f"time={stats.elapsed_ms:.3f}ms",
+    )
+    if new_path is None:
+        print("[REPLAN] Destination unreachable; stopping.")
+        bingo_path[bingo_index + 1 :] = [b]
+    else:
+        bingo_path[bingo_index + 1 :] = [rlh_graph.names[u] for u in new_path]
+    return stats
 
-    last_astar_expansions = 0
-    while open_set:
-        current = min(open_set, key=lambda x: f[x])
-        last_astar_expansions += 1
 
-        if current == goal:
-            # reconstruct path
-            path = [current]
-            while current in came_from:
-                current = came_from[current]
-                path.append(current)
-            path.reverse()
-            return path
+def close_hallway(u_node, v_node):
+    set_edge_weight(u_node, v_node, float("inf"))
 
-        open_set.remove(current)
 
-        for neighbor in graph_edges[current]:
-            tentative_g = g[current] + math.dist(
-                graph_nodes[current], graph_nodes[neighbor]
-            )
-            if tentative_g < g[neighbor]:
-                came_from[neighbor] = current
-                g[neighbor] = tentative_g
-                f[neighbor] = tentative_g + heuristic(neighbor, goal)
-                open_set.add(neighbor)
-
-    return None
+def reopen_hallway(u_node, v_node):
+    set_edge_weight(u_node, v_node, math.dist(graph_nodes[u_node], graph_nodes[v_node]))
 
 
 # Precompute ALT tables once after functions are defined
@@ -307,20 +415,36 @@ build_alt()
 # Cursor Helper
 # -----------------------------
 def set_cursor(state):
-    if state == "hand":
-        pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_HAND)
-    elif state == "grab":
-        pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_SIZEALL)
-    else:
-        pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_ARROW)
+    try:
+        if state == "hand":
+            pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_HAND)
+        elif state == "grab":
+            pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_SIZEALL)
+        else:
+            pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_ARROW)
+    except pygame.error:
+        pass  # no system cursors (e.g. SDL's dummy video driver)
+
+
+# Fitted floor surface + floor -> screen transform (rebuilt on resize only)
+floor_view = FloorView()
+# Pre-rendered glow/radar sprites; the glow pulse is quantized to this many phases
+stamps = StampCache()
+GLOW_PHASES = 16
+# Fonts are created once; rendered labels/HUD lines are reused until they change
+text_cache = TextCache()
+PIXEL_FONT = "PressStart2P"
+dirty = DirtyRects(DIRTY_RECTS)
+# Per-stage frame timings (enabled by bench_render.py)
+profiler = FrameProfiler()
 
 
 def to_screen(x, y):
-    return int(x * scale_floor + pos_x), int(y * scale_floor + pos_y)
+    return floor_view.to_screen(x, y)
 
 
 def move_bingo_along_path():
-    global bingo_index, bingo_moving, bingo_pos
+    global bingo_index, bingo_moving, bingo_pos, bingo_turned_back
 
     if not bingo_moving or len(bingo_path) < 2:
         return
@@ -334,18 +458,20 @@ def move_bingo_along_path():
     dy = ty - by
     dist = math.hypot(dx, dy)
 
-    global checkpoint_popup
-    global checkpoint_timer
+    global checkpoint_pending
 
     if dist < bingo_speed:
         # snap to node
         bingo_pos = [tx, ty]
         bingo_index += 1
-        # Show checkpoint if available
+        bingo_turned_back = False
+        # Show checkpoint if available, once decoded (see show_checkpoint)
         node_key = bingo_path[bingo_index]
-        if node_key in checkpoint_images:
-            checkpoint_popup = checkpoint_images[node_key]
-            checkpoint_timer = checkpoint_duration
+        if node_key in checkpoints:
+            checkpoint_pending = node_key
+        checkpoints.prefetch(
+            bingo_path[bingo_index + 1 : bingo_index + 1 + CHECKPOINT_PREFETCH]
+        )
 
         if bingo_index >= len(bingo_path) - 1:
             bingo_moving = False
@@ -360,8 +486,9 @@ def set_room_node(coordinates, label="", color=(255, 80, 80), radius=10):
     """
     Draws a room node with glow and optional label.
     `coordinates` can be a single tuple (x, y) or a list of tuples [(x, y), ...].
+    Returns the screen area that was drawn (a Rect, or None).
     """
-    global scene, time_wave, manual_offset
+    global scene, time_wave
 
     # Ensure we have a list of coordinates
     if isinstance(coordinates, tuple):
@@ -369,8 +496,9 @@ def set_room_node(coordinates, label="", color=(255, 80, 80), radius=10):
     elif isinstance(coordinates, list):
         coords_list = coordinates
     else:
-        return
+        return None
 
+    drawn = []
     for coord in coords_list:
         if not isinstance(coord, tuple) or len(coord) != 2:
             continue
@@ -379,8 +507,7 @@ def set_room_node(coordinates, label="", color=(255, 80, 80), radius=10):
 
         # Apply offset
         if scene == "campus":
-            x = int(x + manual_offset[0])
-            y = int(y + manual_offset[1])
+            x, y = map(int, map_to_screen(x, y))
         else:
             x, y = int(x), int(y)
 
@@ -388,19 +515,15 @@ def set_room_node(coordinates, label="", color=(255, 80, 80), radius=10):
         # 1. Blinking Pulse (sin wave)
         # -----------------------------
         pulse = (math.sin(time_wave * 0.15) + 1) / 2  # 0 → 1
+        pulse = round(pulse * (GLOW_PHASES - 1)) / (GLOW_PHASES - 1)
         glow_radius = int(radius + 8 + pulse * 6)
         glow_alpha = int(80 + pulse * 100)
 
-        glow_surface = pygame.Surface(
-            (screen.get_width(), screen.get_height()), pygame.SRCALPHA
-        )
-        pygame.draw.circle(
-            glow_surface,
-            (color[0], color[1], color[2], glow_alpha),
-            (x, y),
-            glow_radius,
+        drawn.append(
+            stamps.blit_circle(
+                screen, (color[0], color[1], color[2], glow_alpha), (x, y), glow_radius
+            )
         )
-        screen.blit(glow_surface, (0, 0))
 
         # -----------------------------
         # 2. Solid dot
@@ -411,20 +534,14 @@ def set_room_node(coordinates, label="", color=(255, 80, 80), radius=10):
         # 3. Label (text above the node)
         # -----------------------------
         if label:
-            font = pygame.font.Font(None, 26)
-            text_surf = font.render(label, True, (255, 255, 255))
-            outline_surf = font.render(label, True, (0, 0, 0))
-
-            # Outline
-            screen.blit(
-                outline_surf, (x - outline_surf.get_width() // 2 + 1, y - 25 + 1)
-            )
-            screen.blit(
-                outline_surf, (x - outline_surf.get_width() // 2 - 1, y - 25 - 1)
+            # White text with a black outline, baked into one surface
+            text_surf = text_cache.render(
+                label, None, 26, (255, 255, 255), outline=(0, 0, 0)
             )
+            text_w = text_surf.get_width() - 2
+            drawn.append(screen.blit(text_surf, (x - text_w // 2 - 1, y - 25 - 1)))
 
-            # Text
-            screen.blit(text_surf, (x - text_surf.get_width() // 2, y - 25))
+    return drawn[0].unionall(drawn[1:]) if drawn else None
 
 
 # -----------------------------
@@ -446,17 +563,39 @@ def gps_to_pixel(lat, lon, scale, width, height):
     return int(width / 2 + dx), int(height / 2 + dy)
 
 
+# -----------------------------
+# Campus view transform (pan + zoom)
+# -----------------------------
+def map_to_screen(x, y):
+    return x * map_zoom + manual_offset[0], y * map_zoom + manual_offset[1]
+
+
+def screen_to_map(x, y):
+    return (x - manual_offset[0]) / map_zoom, (y - manual_offset[1]) / map_zoom
+
+
+def zoom_map(factor, anchor):
+    """Zoom the campus view, keeping the map point under `anchor` in place."""
+    global map_zoom, manual_offset
+    new_zoom = min(max(map_zoom * factor, MAP_ZOOM_MIN), MAP_ZOOM_MAX)
+    ax, ay = anchor
+    ratio = new_zoom / map_zoom
+    manual_offset = [
+        ax - (ax - manual_offset[0]) * ratio,
+        ay - (ay - manual_offset[1]) * ratio,
+    ]
+    map_zoom = new_zoom
+
+
 # -----------------------------
 # Visual Helpers
 # -----------------------------
 def apply_map_tint(screen, color, mode="add"):
-    surf = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
-    surf.fill(color)
     flag = pygame.BLEND_RGBA_ADD if mode == "add" else pygame.BLEND_RGBA_MULT
-    screen.blit(surf, (0, 0), special_flags=flag)
+    apply_tint(screen, color, flag)
 
 
-def dynamic_day_night_tint(screen, t):
+def day_night_color(t):
     morning, evening, night = (120, 0, 0), (120, 150, 40), (40, 80, 30)
     cycle = (math.sin(t * 1e-13) + 1) / 2
     if cycle < 0.5:
@@ -469,16 +608,21 @@ def dynamic_day_night_tint(screen, t):
         r = int(night[0] * (1 - mix) + morning[0] * mix)
         g = int(night[1] * (1 - mix) + morning[1] * mix)
         b = int(night[2] * (1 - mix) + morning[2] * mix)
-    apply_map_tint(screen, (r, g, b, 60))
+    return (r, g, b, 60)
+
+
+def dynamic_day_night_tint(screen, t):
+    apply_map_tint(screen, day_night_color(t))
 
 
 def draw_radar(screen, center, t):
+    drawn = []
     for i in range(3):
         r = 40 + i * 25 + (t % 50)
         a = max(0, 150 - (r - 40) * 3)
-        s = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
-        pygame.draw.circle(s, (0, 255, 200, a), center, r, 2)
-        screen.blit(s, (0, 0))
+        if a:
+            drawn.append(stamps.blit_circle(screen, (0, 255, 200, a), center, r, 2))
+    return drawn[0].unionall(drawn[1:]) if drawn else None
 
 
 # -----------------------------
@@ -522,7 +666,9 @@ time_wave = 0
 frame_idx = 0
 trail = []
 TRAIL_MAX = 250
-scale = 0.6
+scale = 0.6  # GPS registration of the map image (pixels per meter)
+map_zoom = 1.0  # campus view zoom (+ / - keys); 1.0 = map at native size
+MAP_ZOOM_MIN, MAP_ZOOM_MAX = 0.25, 4.0
 pixel_mode = False
 latest_lat, latest_lon = BASE_LAT, BASE_LON
 smooth_lat, smooth_lon = latest_lat, latest_lon
@@ -535,11 +681,13 @@ path_points = []
 path_editor = False
 last_route = "front"
 last_path = []  # <- store the most recent A* path for RLH
+last_stats = None  # SearchStats of the most recent A* query
 
 # For Bingo movement along A* path
 bingo_moving = False
 bingo_path = []
 bingo_index = 0
+bingo_turned_back = False  # walking the current segment in reverse after a closure
 # Center defaults if screen not available (headless)
 default_cx = 400
 default_cy = 300
@@ -547,359 +695,556 @@ bingo_pos = [
     locals().get("center_x", default_cx),
     locals().get("center_y", default_cy),
 ]  # x, y
-bingo_speed = 3  # pixels per frame (tune this)
+bingo_speed = 3  # pixels per simulation tick (tune this)
 
 # -----------------------------
 # Main Loop
 # -----------------------------
-if not HEADLESS:
-    running = True
-while not HEADLESS and running:
-    clock.tick(24)
-    time_wave += 2
-    e = pygame.event.poll()
+# Simulation runs at a fixed SIM_HZ (bingo_speed, time_wave and the GPS
+# smoothing are tuned per tick); rendering runs at up to RENDER_FPS and
+# interpolates between the last two simulation states.
+SIM_HZ = 24
+SIM_DT = 1.0 / SIM_HZ
+RENDER_FPS = 30
+MAX_FRAME_TIME = 0.25  # s; longer stalls are dropped instead of replayed
+running = True
+prev_bingo_pos = list(bingo_pos)
+prev_smooth = (smooth_lat, smooth_lon)
+pointer_pos = (0, 0)  # last mouse position seen in the event queue
+
+
+def place_bingo(pos):
+    """Teleport Bingo (no interpolation from the old position)."""
+    global bingo_pos, prev_bingo_pos, bingo_turned_back
+    bingo_pos = list(pos)
+    prev_bingo_pos = list(pos)
+    bingo_turned_back = False
+
+
+def hovered_building(mx, my):
+    """(Building, distance) for the outline near screen point (mx, my), or None."""
+    return building_index.nearest(*screen_to_map(mx, my))
+
+
+def enter_rlh_floor():
+    global scene, rlh_floor_img
+    scene = "rlh_floor"
+    rlh_floor_img = floor_view.load(buildings["RLH"].floors["ground"])
+    print("[SCENE] Switched to RLH Ground Floor view.")
+
+
+def handle_event(e):
+    global running, scene, USE_BIDIRECTIONAL, pointer_pos
+
+    if e.type in (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN):
+        pointer_pos = e.pos
+
     if e.type == pygame.QUIT or (e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE):
         if scene == "rlh_floor":
             scene = "campus"
             print("[SCENE] Returned to campus map.")
         else:
             running = False
+        return
 
     # Global hotkeys (apply in any scene)
     if e.type == pygame.KEYDOWN:
         if e.key == pygame.K_h:
-            USE_ALT = not USE_ALT
-            mode = "ALT" if USE_ALT else "Euclid"
+            mode = cycle_route_mode()
             print(f"[HEURISTIC] Switched to {mode}")
+        elif e.key == pygame.K_d:
+            USE_BIDIRECTIONAL = not USE_BIDIRECTIONAL
+            print(f"[SEARCH] Bidirectional {'ON' if USE_BIDIRECTIONAL else 'OFF'}")
 
-    # -----------------------------
-    # Campus Scene
-    # -----------------------------
     if scene == "campus":
-        if e.type == pygame.KEYDOWN:
-            if e.key == pygame.K_z:
-                pixel_mode = not pixel_mode
-
-            elif e.key in (pygame.K_PLUS, pygame.K_EQUALS):
-                scale *= 1.1
-
-            elif e.key in (pygame.K_MINUS, pygame.K_UNDERSCORE):
-                scale /= 1.1
-
-            elif e.key == pygame.K_b:
-                path_points = routes["RLH"]["back"]
-                last_route = "back"
-                print("[ROUTE] RLH back route loaded.")
-
-            elif e.key == pygame.K_f:
-                path_points = routes["RLH"]["front"]
-                last_route = "front"
-                print("[ROUTE] RLH front route loaded.")
-
-            elif e.key == pygame.K_n:
-                path_editor = not path_editor
-                print(f"[MODE] Path Editor {'ON' if path_editor else 'OFF'}")
-
-            elif e.key == pygame.K_s and path_editor:
-                with open("path_nodes.txt", "w") as f:
-                    for x, y in path_points:
-                        f.write(f"{x},{y}\n")
-
-                print("[INFO] Saved path_nodes.txt")
-
-        # Mouse drag for map
-        if e.type == pygame.MOUSEBUTTONDOWN and e.button == 1 and not path_editor:
-            dragging_map = True
-            map_drag_start = pygame.mouse.get_pos()
-            map_orig_offset = tuple(manual_offset)
-            follow_gps = False
-        elif e.type == pygame.MOUSEBUTTONUP and e.button == 1:
-            dragging_map = False
-        elif e.type == pygame.MOUSEMOTION and dragging_map:
-            mx, my = pygame.mouse.get_pos()
-            dx, dy = mx - map_drag_start[0], my - map_drag_start[1]
-            manual_offset = [map_orig_offset[0] + dx, map_orig_offset[1] + dy]
-
-        # Path Editor Mode
-        if e.type == pygame.MOUSEBUTTONDOWN and path_editor:
-            mx, my = pygame.mouse.get_pos()
-            map_x, map_y = mx - manual_offset[0], my - manual_offset[1]
-            if e.button == 1:
-                path_points.append((map_x, map_y))
+        handle_campus_event(e)
+    elif scene == "rlh_floor":
+        handle_floor_event(e)
+
+
+def handle_campus_event(e):
+    global pixel_mode, path_points, last_route, path_editor
+    global dragging_map, map_drag_start, map_orig_offset, follow_gps, manual_offset
+
+    if e.type == pygame.KEYDOWN:
+        if e.key == pygame.K_z:
+            pixel_mode = not pixel_mode
+
+        elif e.key in (pygame.K_PLUS, pygame.K_EQUALS):
+            zoom_map(1.1, screen.get_rect().center)
+
+        elif e.key in (pygame.K_MINUS, pygame.K_UNDERSCORE):
+            zoom_map(1 / 1.1, screen.get_rect().center)
+
+        elif e.key == pygame.K_b:
+            path_points = routes["RLH"]["back"]
+            last_route = "back"
+            print("[ROUTE] RLH back route loaded.")
+
+        elif e.key == pygame.K_f:
+            path_points = routes["RLH"]["front"]
+            last_route = "front"
+            print("[ROUTE] RLH front route loaded.")
+
+        elif e.key == pygame.K_n:
+            path_editor = not path_editor
+            print(f"[MODE] Path Editor {'ON' if path_editor else 'OFF'}")
+
+        elif e.key == pygame.K_s and path_editor:
+            with open("path_nodes.txt", "w") as f:
+                for x, y in path_points:
+                    f.write(f"{x},{y}\n")
+
+            print("[INFO] Saved path_nodes.txt")
+
+    # Mouse drag for map (every queued motion event is applied)
+    if e.type == pygame.MOUSEBUTTONDOWN and e.button == 1 and not path_editor:
+        dragging_map = True
+        map_drag_start = e.pos
+        map_orig_offset = tuple(manual_offset)
+        follow_gps = False
+    elif e.type == pygame.MOUSEBUTTONUP and e.button == 1:
+        dragging_map = False
+    elif e.type == pygame.MOUSEMOTION and dragging_map:
+        mx, my = e.pos
+        dx, dy = mx - map_drag_start[0], my - map_drag_start[1]
+        manual_offset = [map_orig_offset[0] + dx, map_orig_offset[1] + dy]
+
+    # Path Editor Mode
+    if e.type == pygame.MOUSEBUTTONDOWN and path_editor:
+        mx, my = e.pos
+        map_x, map_y = screen_to_map(mx, my)
+        if e.button == 1:
+            path_points.append((map_x, map_y))
+            print(
+                f"[NODE] Added MAP ({int(map_x)}, {int(map_y)}) [screen=({mx},{my}) offset={manual_offset}]"
+            )
+        elif e.button == 3 and path_points:
+            removed = path_points.pop()
+            print(f"[NODE] Removed {removed}")
+
+    if e.type == pygame.MOUSEBUTTONDOWN and e.button == 1 and not path_editor:
+        # Building click detection (inside an outline or within hover range)
+        hit = hovered_building(*e.pos)
+        if hit:
+            name = hit[0].name
+            print(f"[INFO] Clicked on {name}")
+            if name == "RLH":
+                enter_rlh_floor()
+
+
+def handle_floor_event(e):
+    global selected_room, last_stats, last_path
+    global bingo_path, bingo_index, bingo_moving, active_planner, planner_goal
+
+    # Clicks on rooms (coords are already in “final” space)
+    if e.type == pygame.MOUSEBUTTONDOWN and e.button == 1:
+        mx, my = e.pos
+        print(mx, my)
+        hit = room_index.nearest(mx, my, max_radius=ROOM_CLICK_RADIUS)
+        if hit:
+            room_name = hit[0]
+            selected_room = room_name
+            print(f"[ROOM] Selected: {room_name}")
+
+            # Route from the graph node nearest to Bingo to this room
+            start_node = nearest_route_node(*bingo_pos)
+            goal_node = room_name
+            path_nodes, last_stats = find_route(start_node, goal_node, with_stats=True)
+            print(
+                "[A*] mode=",
+                last_stats.mode,
+                "expansions=",
+                last_stats.expansions,
+                "pushes=",
+                last_stats.pushes,
+                f"time={last_stats.elapsed_ms:.3f}ms",
+                "cached=",
+                last_stats.cached,
+                f"(hits={route_cache.hits} misses={route_cache.misses})",
+            )
+            if last_stats.mode == "CH":
                 print(
-                    f"[NODE] Added MAP ({int(map_x)}, {int(map_y)}) [screen=({mx},{my}) offset={manual_offset}]"
+                    "[CH] preprocess=",
+                    f"{ch_index.preprocess_ms:.1f}ms",
+                    "shortcuts=",
+                    ch_index.shortcut_count,
                 )
-            elif e.button == 3 and path_points:
-                removed = path_points.pop()
-                print(f"[NODE] Removed {removed}")
-
-        # Building click detection
-        if e.type == pygame.MOUSEBUTTONDOWN and e.button == 1 and not path_editor:
-            map_x, map_y = mx - manual_offset[0], my - manual_offset[1]
-            for name, b in buildings.items():
-                bx, by = b["pos"]
-                if math.hypot(map_x - bx, map_y - by) < b["radius"]:
-                    print(f"[INFO] Clicked on {name}")
-                    if name == "RLH":
-                        scene = "rlh_floor"
-                        rlh_floor_img = pygame.image.load(b["image"])
-                        print("[SCENE] Switched to RLH Ground Floor view.")
-
-        # GPS simulation
-        try:
-            res = requests.get(GPS_SERVER_URL, timeout=1)
-            data = res.json()
-            lat, lon = data.get("lat"), data.get("lon")
-            if lat and lon:
-                latest_lat, latest_lon = float(lat), float(lon)
-        except Exception:
-            pass
+            print("[A* path]", path_nodes)
+
+            # store once, draw every frame
+            if path_nodes:
+                last_path = path_nodes
+                # Start bingo movement
+                bingo_path = path_nodes
+                bingo_index = 0
+                bingo_moving = True
+
+                # Set initial position to first node
+                place_bingo(graph_nodes[bingo_path[0]])
+                checkpoints.prefetch(bingo_path[1 : 1 + CHECKPOINT_PREFETCH])
+
+                # Replanned on closures; the planner is built on first need
+                active_planner = None
+                planner_goal = goal_node
+            else:
+                last_path = []
+                print("[ERROR] No route found.")
+
+    # T: tour every reachable room, starting next to Bingo
+    if e.type == pygame.KEYDOWN and e.key == pygame.K_t:
+        tour_rooms = [
+            name for name in rooms if name != "passages" and graph_edges.get(name)
+        ]
+        tour_order, tour_path = plan_tour(nearest_route_node(*bingo_pos), tour_rooms)
+        print("[TOUR] order:", tour_order)
+        if tour_path:
+            last_path = tour_path
+            bingo_path = tour_path
+            bingo_index = 0
+            bingo_moving = True
+            place_bingo(graph_nodes[tour_path[0]])
+            checkpoints.prefetch(tour_path[1 : 1 + CHECKPOINT_PREFETCH])
+            active_planner = planner_goal = None  # tours are not replanned
+        else:
+            print("[ERROR] Some tour stops are unreachable.")
+
+    # X: close the hallway segment ahead of Bingo, O: reopen all
+    if e.type == pygame.KEYDOWN and e.key == pygame.K_x and bingo_moving:
+        ahead = min(bingo_index + 1, len(bingo_path) - 2)
+        closed = (bingo_path[ahead], bingo_path[ahead + 1])
+        closed_hallways.append(closed)
+        print(f"[HALLWAY] Closed {closed[0]} <-> {closed[1]}")
+        close_hallway(*closed)
+    elif e.type == pygame.KEYDOWN and e.key == pygame.K_o and closed_hallways:
+        while closed_hallways:
+            reopen_hallway(*closed_hallways.pop())
+        print("[HALLWAY] All hallways reopened.")
+
+
+if GPS_REPLAY:
+    gps = TrackReplay(GPS_REPLAY, GPS_REPLAY_SPEED, GPS_REPLAY_DEVICE)
+    print(f"[REPLAY] {GPS_REPLAY} at {GPS_REPLAY_SPEED:g}x")
+else:
+    gps = GpsPoller(
+        GPS_SERVER_URL,
+        GPS_POLL_INTERVAL,
+        max_backoff=GPS_MAX_BACKOFF,
+        stream_url=GPS_STREAM_URL if GPS_USE_STREAM else None,
+    )
+
+
+def poll_gps():
+    """Take the newest fix from the background GPS thread (never blocks)."""
+    global latest_lat, latest_lon
+    fix = gps.latest
+    if fix:
+        latest_lat, latest_lon = fix.lat, fix.lon
+
+
+def show_checkpoint():
+    """Pop up the pending checkpoint photo once the store has it. The decode
+    runs on the store's thread, so a prefetch miss never stalls a tick."""
+    global checkpoint_popup, checkpoint_pending, checkpoint_timer
+    popup = checkpoints.ready(checkpoint_pending)
+    if popup is not None:
+        checkpoint_popup = popup
+        checkpoint_timer = checkpoint_duration
+        checkpoint_pending = None
+    elif checkpoint_pending in checkpoints.failed:
+        checkpoint_pending = None  # unreadable photo, already reported
+
+
+def update():
+    """One fixed simulation tick (SIM_DT seconds)."""
+    global time_wave, frame_idx, smooth_lat, smooth_lon, prev_smooth
+    global prev_bingo_pos, checkpoint_timer
 
+    time_wave += 2
+    frame_idx += 1
+    if scene == "campus":
+        prev_smooth = (smooth_lat, smooth_lon)
         smooth_lat = 0.9 * smooth_lat + 0.1 * latest_lat
         smooth_lon = 0.9 * smooth_lon + 0.1 * latest_lon
-        target_x, target_y = gps_to_pixel(smooth_lat, smooth_lon, scale, W, H)
-        offset_x, offset_y = manual_offset
-        bingo_x, bingo_y = target_x + offset_x, target_y + offset_y
-
-        # Draw campus map
-        # Draw campus map
-        map_to_draw = map_img
-        if pixel_mode:
-            small = pygame.transform.scale(map_img, (W // 6, H // 6))
-            map_to_draw = pygame.transform.scale(small, (W, H))
-        screen.blit(map_to_draw, (offset_x, offset_y))
-        dynamic_day_night_tint(screen, time_wave)
+    elif scene == "rlh_floor":
+        prev_bingo_pos = list(bingo_pos)
+        move_bingo_along_path()
+        if checkpoint_pending is not None:
+            show_checkpoint()
+        if checkpoint_timer > 0 and checkpoint_popup:
+            checkpoint_timer -= 1
 
-        # -----------------------------
-        # RLH Hover Highlight (Breathing Polygon Glow)
-        # -----------------------------
-        mx, my = pygame.mouse.get_pos()
-        map_x, map_y = mx - manual_offset[0], my - manual_offset[1]
-        hover_distance = min(math.hypot(map_x - x, map_y - y) for x, y in RLH_POLYGON)
 
-        if hover_distance < 80:  # hover range
-            proximity_factor = max(0.1, 1 - hover_distance / 80)
+def advance(lag, frame_time):
+    """Add one rendered frame's wall time and run the simulation ticks it
+    covers. Returns the leftover time (< SIM_DT) for interpolation."""
+    lag += min(frame_time, MAX_FRAME_TIME)
+    while lag >= SIM_DT:
+        update()
+        lag -= SIM_DT
+    return lag
+
+
+def render(alpha):
+    """Draw the current scene; `alpha` in [0, 1) is the progress to the next tick."""
+    # Animation clock between the previous tick and this one
+    t = int(time_wave - 2 * (1 - alpha))
+    if scene == "campus":
+        render_campus(alpha, t)
+    elif scene == "rlh_floor":
+        render_floor(alpha, t)
+
+
+def render_campus(alpha, t):
+    lat = prev_smooth[0] + (smooth_lat - prev_smooth[0]) * alpha
+    lon = prev_smooth[1] + (smooth_lon - prev_smooth[1]) * alpha
+    target_x, target_y = gps_to_pixel(lat, lon, scale, W, H)
+    bingo_x, bingo_y = map_to_screen(target_x, target_y)
+
+    # Draw campus map + tint + edited path (the static layer)
+    campus_key = (
+        "campus",
+        screen.get_size(),
+        tuple(manual_offset),
+        map_zoom,
+        pixel_mode,
+        tuple(path_points),
+        day_night_color(time_wave),
+    )
+    if dirty.begin(screen, campus_key):
+        with profiler.stage("map"):
+            screen.fill((0, 0, 0))
+            map_tiles.draw(
+                screen, map_zoom, manual_offset, "pixel" if pixel_mode else "map"
+            )
+        with profiler.stage("tint"):
+            dynamic_day_night_tint(screen, time_wave)
+
+        # Path visualization
+        with profiler.stage("path"):
+            if path_points:
+                points = [map_to_screen(x, y) for x, y in path_points]
+                for i, (sx, sy) in enumerate(points):
+                    pygame.draw.circle(screen, (0, 255, 0), (int(sx), int(sy)), 6)
+                    if i > 0:
+                        px, py = points[i - 1]
+                        pygame.draw.line(
+                            screen,
+                            (255, 255, 0),
+                            (int(px), int(py)),
+                            (int(sx), int(sy)),
+                            2,
+                        )
+        dirty.capture(screen)
+
+    # -----------------------------
+    # RLH Hover Highlight (Breathing Polygon Glow)
+    # -----------------------------
+    with profiler.stage("hover_glow"):
+        mx, my = pointer_pos
+        hover = hovered_building(mx, my)
+
+        if hover:
+            building, hover_distance = hover
+            proximity_factor = max(0.1, 1 - hover_distance / BUILDING_HOVER_RANGE)
             pulse = abs(math.sin(pygame.time.get_ticks() * 0.004))
             breathe = 1 + 0.04 * math.sin(pygame.time.get_ticks() * 0.003)
             glow_intensity = int(160 + 80 * pulse * proximity_factor)
             glow_color = (0, glow_intensity, 255)
 
             # Apply "breathing" scale to polygon
-            cx = sum(x for x, _ in RLH_POLYGON) / len(RLH_POLYGON)
-            cy = sum(y for _, y in RLH_POLYGON) / len(RLH_POLYGON)
+            cx, cy = building.center
             scaled_poly = [
-                (
-                    (x - cx) * breathe + cx + manual_offset[0],
-                    (y - cy) * breathe + cy + manual_offset[1],
-                )
-                for x, y in RLH_POLYGON
+                map_to_screen((x - cx) * breathe + cx, (y - cy) * breathe + cy)
+                for x, y in building.outline
             ]
 
             # Filled transparent glow
-            poly_surface = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
-            pygame.draw.polygon(
-                poly_surface, (*glow_color, int(90 * proximity_factor)), scaled_poly
+            dirty.add(
+                blit_alpha_polygon(
+                    screen, (*glow_color, int(90 * proximity_factor)), scaled_poly
+                )
             )
-            screen.blit(poly_surface, (0, 0))
 
             # Outline border
-            pygame.draw.polygon(screen, glow_color, scaled_poly, 3)
+            dirty.add(pygame.draw.polygon(screen, glow_color, scaled_poly, 3))
 
             # Floating label
-            font = pygame.font.SysFont("PressStart2P", 10)
-            text = font.render("RLH BUILDING", True, (0, 255, 255))
-            screen.blit(text, (map_x + 10, map_y - 25))
-
-            # Click interaction
-            if e.type == pygame.MOUSEBUTTONDOWN and e.button == 1:
-                print("[INFO] Clicked inside RLH polygon.")
-                scene = "rlh_floor"
-                rlh_floor_img = pygame.image.load(buildings["RLH"]["image"])
-                print("[SCENE] Switched to RLH Ground Floor view.")
-
-        # Path visualization
-        if path_points:
-            for i, (x, y) in enumerate(path_points):
-                sx, sy = int(x + offset_x), int(y + offset_y)
-                pygame.draw.circle(screen, (0, 255, 0), (sx, sy), 6)
-                if i > 0:
-                    px, py = path_points[i - 1]
-                    pygame.draw.line(
-                        screen,
-                        (255, 255, 0),
-                        (int(px + offset_x), int(py + offset_y)),
-                        (sx, sy),
-                        2,
-                    )
-
-        # Bingo + radar
-        draw_radar(screen, (int(bingo_x), int(bingo_y)), time_wave)
-        screen.blit(frames[frame_idx % len(frames)], (bingo_x - 20, bingo_y - 20))
-        set_cursor("grab" if (dragging_map or path_editor) else "arrow")
-
-        # HUD: heuristic mode
-        hud_font = pygame.font.Font(None, 24)
-        hud_text = hud_font.render(
-            f"Heuristic: {last_heuristic_mode}  (press H to toggle)",
-            True,
-            (255, 255, 255),
+            label = f"{building.name} BUILDING"
+            text = text_cache.render(label, PIXEL_FONT, 10, (0, 255, 255))
+            dirty.add(screen.blit(text, (mx + 10, my - 25)))
+
+    # Bingo + radar
+    with profiler.stage("radar"):
+        dirty.add(draw_radar(screen, (int(bingo_x), int(bingo_y)), t))
+        size = llama.nearest_size(50 * map_zoom)
+        sprite = llama.frames(size)[frame_idx % len(frames)]
+        anchor = size * 0.4  # 20px for the 50px sprite
+        dirty.add(screen.blit(sprite, (bingo_x - anchor, bingo_y - anchor)))
+    set_cursor("grab" if (dragging_map or path_editor) else "arrow")
+
+    # HUD: heuristic mode
+    with profiler.stage("hud"):
+        hud_text = text_cache.render(
+            f"Heuristic: {route_mode()}  (press H to cycle)", None, 24, (255, 255, 255)
         )
-        hud_bg = pygame.Surface(
-            (hud_text.get_width() + 12, hud_text.get_height() + 8), pygame.SRCALPHA
+        hud_bg = stamps.panel(
+            (hud_text.get_width() + 12, hud_text.get_height() + 8),
+            (0, 0, 0, 140),
+            border_radius=6,
         )
-        pygame.draw.rect(hud_bg, (0, 0, 0, 140), hud_bg.get_rect(), border_radius=6)
-        screen.blit(hud_bg, (12, 12))
+        dirty.add(screen.blit(hud_bg, (12, 12)))
         screen.blit(hud_text, (18, 16))
 
-    # -----------------------------
-    # RLH Floor Plan Scene (Fit-to-Screen + Fixed Bingo)
-    # -----------------------------
-    # -----------------------------
-    # RLH Floor Plan Scene
-    # -----------------------------
-    elif scene == "rlh_floor":
-        win_w, win_h = screen.get_size()
-        orig_w, orig_h = rlh_floor_img.get_size()
-        scale_floor = max(win_w / orig_w, win_h / orig_h)
-        scaled_floor = pygame.transform.smoothscale(
-            rlh_floor_img, (int(orig_w * scale_floor), int(orig_h * scale_floor))
-        )
-        pos_x = (win_w - scaled_floor.get_width()) // 2
-        pos_y = (win_h - scaled_floor.get_height()) // 2
-
-        mx, my = pygame.mouse.get_pos()
-
-        # 1) draw floor first
-        screen.fill((245, 245, 245))
-        screen.blit(scaled_floor, (pos_x, pos_y))
-
-        # 2) handle clicks on rooms (coords are already in “final” space)
-        if e.type == pygame.MOUSEBUTTONDOWN and e.button == 1:
-            print(mx, my)
-            for room_name, data in rooms.items():
-                if room_name == "passages":
-                    continue
-                rx, ry = data["pos"][0]  # you measured these by clicking already
-                radius = 10
-
-                if math.hypot(mx - rx, my - ry) <= radius:
-                    selected_room = room_name
-                    print(f"[ROOM] Selected: {room_name}")
-
-                    # A* from entrance node H1 to this room
-                    start_node = "H1"
-                    goal_node = room_name
-                    path_nodes = a_star(start_node, goal_node)
-                    print(
-                        "[A*] mode=",
-                        last_heuristic_mode,
-                        "expansions=",
-                        last_astar_expansions,
-                    )
-                    print("[A* path]", path_nodes)
-
-                    # store once, draw every frame
-                    if path_nodes:
-                        last_path = path_nodes
-                        # Start bingo movement
-                        bingo_path = path_nodes
-                        bingo_index = 0
-                        bingo_moving = True
-
-                        # Set initial position to first node
-                        start_x, start_y = graph_nodes[bingo_path[0]]
-                        bingo_pos = [start_x, start_y]
-                    else:
-                        last_path = []
-                        print("[ERROR] No route found.")
-
-        # 3) draw passages (your green hallway dots)
-        for px, py in passages:
-            pygame.draw.circle(screen, (0, 150, 200), (int(px), int(py)), 5)
-
-        # 4) draw room nodes (labels + glow)
+
+def render_floor(alpha, t):
+    win_w, win_h = screen.get_size()
+    scaled_floor = floor_view.fit(rlh_floor_img, (win_w, win_h))
+    scale_floor = floor_view.scale
+    pos_x, pos_y = floor_view.offset
+
+    # 1) static layer: floor, passages, stored A* path, closed hallways
+    floor_key = (
+        "rlh_floor",
+        (win_w, win_h),
+        id(rlh_floor_img),
+        tuple(last_path),
+        tuple(closed_hallways),
+    )
+    if dirty.begin(screen, floor_key):
+        with profiler.stage("map"):
+            screen.fill((245, 245, 245))
+            screen.blit(scaled_floor, (pos_x, pos_y))
+
+            # passages (your green hallway dots)
+            for px, py in passages:
+                pygame.draw.circle(screen, (0, 150, 200), (int(px), int(py)), 5)
+
+            # the A* path using stored last_path
+            if last_path:
+                for i in range(len(last_path) - 1):
+                    p1 = graph_nodes[last_path[i]]
+                    p2 = graph_nodes[last_path[i + 1]]
+
+                    # graph_nodes already in the same space as your nodes
+                    x1, y1 = int(p1[0]), int(p1[1])
+                    x2, y2 = int(p2[0]), int(p2[1])
+
+                    pygame.draw.line(screen, (255, 240, 0), (x1, y1), (x2, y2), 4)
+                    pygame.draw.circle(screen, (255, 200, 0), (x1, y1), 6)
+                    pygame.draw.circle(screen, (255, 200, 0), (x2, y2), 6)
+
+            # closed hallways
+            for u_node, v_node in closed_hallways:
+                x1, y1 = map(int, graph_nodes[u_node])
+                x2, y2 = map(int, graph_nodes[v_node])
+                pygame.draw.line(screen, (220, 30, 30), (x1, y1), (x2, y2), 6)
+        dirty.capture(screen)
+
+    # 2) draw room nodes (labels + glow)
+    with profiler.stage("labels"):
         for room_name, data in rooms.items():
             if room_name == "passages":
                 continue
 
             rx, ry = data["pos"][0]
             if room_name == selected_room:
-                set_room_node(
-                    (rx, ry), label=room_name, color=(255, 230, 50), radius=10
+                dirty.add(
+                    set_room_node(
+                        (rx, ry), label=room_name, color=(255, 230, 50), radius=10
+                    )
                 )
             else:
-                set_room_node((rx, ry), label=room_name, color=(0, 200, 130), radius=7)
-
-        # 5) draw the A* path using stored last_path
-        if last_path:
-            for i in range(len(last_path) - 1):
-                p1 = graph_nodes[last_path[i]]
-                p2 = graph_nodes[last_path[i + 1]]
-
-                # graph_nodes already in the same coordinate space as your nodes
-                x1, y1 = int(p1[0]), int(p1[1])
-                x2, y2 = int(p2[0]), int(p2[1])
-
-                pygame.draw.line(screen, (255, 240, 0), (x1, y1), (x2, y2), 4)
-                pygame.draw.circle(screen, (255, 200, 0), (x1, y1), 6)
-                pygame.draw.circle(screen, (255, 200, 0), (x2, y2), 6)
-
-        # 6) draw Bingo (you can set this to H1 or your own coords)
-
-        # MOVE BINGO IF PATH EXISTS
-        move_bingo_along_path()
+                dirty.add(
+                    set_room_node(
+                        (rx, ry), label=room_name, color=(0, 200, 130), radius=7
+                    )
+                )
 
-        # Draw animated Bingo
-        bx, by = int(bingo_pos[0]), int(bingo_pos[1])
-        draw_radar(screen, (bx, by), time_wave)
-        screen.blit(frames[frame_idx % len(frames)], (bx - 20, by - 30))
+    # 3) draw animated Bingo, interpolated between simulation ticks
+    bx = int(prev_bingo_pos[0] + (bingo_pos[0] - prev_bingo_pos[0]) * alpha)
+    by = int(prev_bingo_pos[1] + (bingo_pos[1] - prev_bingo_pos[1]) * alpha)
+    with profiler.stage("radar"):
+        dirty.add(draw_radar(screen, (bx, by), t))
+        dirty.add(screen.blit(frames[frame_idx % len(frames)], (bx - 20, by - 30)))
 
-        # Checkpoint popup display
+    # Checkpoint popup display
+    with profiler.stage("popup"):
         if checkpoint_timer > 0 and checkpoint_popup:
-            popup = pygame.transform.scale(checkpoint_popup, (300, 200))
+            popup = checkpoint_popup  # already scaled by the store
 
             # bottom-left or bottom-center position
             px = 20
             py = screen_h - 220
 
             # popup frame
-            bg = pygame.Surface((320, 220), pygame.SRCALPHA)
-            pygame.draw.rect(bg, (0, 0, 0, 180), (0, 0, 320, 220), border_radius=12)
-            screen.blit(bg, (px - 10, py - 10))
+            bg = stamps.panel((320, 220), (0, 0, 0, 180), border_radius=12)
+            dirty.add(screen.blit(bg, (px - 10, py - 10)))
 
             screen.blit(popup, (px, py))
 
-            checkpoint_timer -= 1
-
-        # 7) UI
-        font = pygame.font.SysFont("PressStart2P", 12)
-        screen.blit(font.render("← BACK TO CAMPUS (ESC)", True, (0, 0, 0)), (20, 20))
-        screen.blit(
-            font.render(f"RLH Scale Fit: {scale_floor:.2f}", True, (80, 80, 80)),
-            (20, 45),
+    # 4) UI
+    with profiler.stage("hud"):
+        dirty.add(
+            screen.blit(
+                text_cache.render("← BACK TO CAMPUS (ESC)", PIXEL_FONT, 12, (0, 0, 0)),
+                (20, 20),
+            )
+        )
+        dirty.add(
+            screen.blit(
+                text_cache.render(
+                    f"RLH Scale Fit: {scale_floor:.2f}", PIXEL_FONT, 12, (80, 80, 80)
+                ),
+                (20, 45),
+            )
         )
 
         # HUD: heuristic + last stats
-        hud_font = pygame.font.Font(None, 24)
-        line1 = f"Heuristic: {last_heuristic_mode}  (H to toggle)"
+        line1 = f"Heuristic: {route_mode()}  (H to cycle)"
         line2 = (
-            f"Last A*: {last_astar_expansions} expansions"
-            if last_astar_expansions
+            f"Last {last_stats.mode}: {last_stats.expansions} expansions"
+            f" ({last_stats.elapsed_ms:.2f} ms)"
+            if last_stats
             else ""
         )
-        l1 = hud_font.render(line1, True, (0, 0, 0))
-        l2 = hud_font.render(line2, True, (0, 0, 0)) if line2 else None
+        l1 = text_cache.render(line1, None, 24, (0, 0, 0))
+        l2 = text_cache.render(line2, None, 24, (0, 0, 0)) if line2 else None
         pad_w = max(l1.get_width(), (l2.get_width() if l2 else 0)) + 20
         pad_h = l1.get_height() + (l2.get_height() if l2 else 0) + 16
-        panel = pygame.Surface((pad_w, pad_h), pygame.SRCALPHA)
-        pygame.draw.rect(panel, (255, 255, 255, 200), panel.get_rect(), border_radius=8)
-        screen.blit(panel, (win_w - pad_w - 20, 20))
+        panel = stamps.panel((pad_w, pad_h), (255, 255, 255, 200), border_radius=8)
+        dirty.add(screen.blit(panel, (win_w - pad_w - 20, 20)))
         screen.blit(l1, (win_w - pad_w - 20 + 10, 20 + 8))
         if l2:
             screen.blit(l2, (win_w - pad_w - 20 + 10, 20 + 8 + l1.get_height()))
 
-    pygame.display.flip()
-    frame_idx += 1
 
-if not HEADLESS:
+def main():
+    lag = 0.0
+    gps.start()
+    while running:
+        frame_time = clock.tick(RENDER_FPS) / 1000.0
+
+        # Drain every queued event so input never lags behind
+        with profiler.stage("events"):
+            for e in pygame.event.get():
+                handle_event(e)
+        if not running:
+            break
+
+        if scene == "campus":
+            poll_gps()
+        with profiler.stage("update"):
+            lag = advance(lag, frame_time)
+
+        render(lag / SIM_DT)
+        with profiler.stage("flip"):
+            dirty.present()
+        profiler.end_frame()
+
+    gps.stop()
     pygame.quit()
+
+
+if __name__ == "__main__" and not HEADLESS:
+    main()